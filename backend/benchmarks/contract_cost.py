@@ -0,0 +1,589 @@
+# backend/benchmarks/contract_cost.py
+"""
+Static cost and footprint profile of every escrow contract variant.
+
+Each variant's PyTeal is compiled offline (constants assembled, as goal
+would) and then measured without algod:
+
+  - program size: exact assembled byte count of the approval/clear TEAL,
+    and the extra program pages that implies
+  - per-method opcode cost: the approval program is walked along every
+    branch for each entry point (create, each OnCompletion, and each NoOp
+    method selector found in the dispatch). Values that depend on the
+    calling transaction or on state are symbolic; a branch on them follows
+    both sides, and asserts on them are assumed to pass. Cost is the
+    min/max over the paths that approve.
+  - footprint: global/local schema, the minimum balance the creator locks
+    per deployed app, what one order locks under that deployment model
+    (and what stays locked once it is settled), and the transaction fees
+    of one completed order, inner transactions included
+
+    python -m backend.benchmarks.contract_cost
+    python -m backend.benchmarks.contract_cost --out contract_cost.json --baseline main.json --max-increase 5
+
+With --baseline, a variant whose program size, per-order minimum balance
+or any method's max cost grew by more than --max-increase percent fails
+the run (exit code 1).
+"""
+import argparse
+import importlib
+import importlib.util
+import json
+import os
+import sys
+
+from pyteal import compileTeal, Mode
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+OPCODE_BUDGET = 700       # per app call (pooled across a group)
+MIN_FEE = 1_000           # per transaction, inner transactions included
+MAX_PAGE_BYTES = 2048     # approval + clear per page
+# minimum balance (microAlgos), see the Algorand protocol parameters
+MBR_APP_PAGE = 100_000
+MBR_GLOBAL_UINT = 28_500
+MBR_GLOBAL_BYTES = 50_000
+
+ON_COMPLETION = {"noop": 0, "optin": 1, "closeout": 2, "update": 4, "delete": 5}
+
+
+# ==========================================================
+# 📋 Variants
+# ==========================================================
+# schemas are the ones the matching deploy code requests;
+# deployment: "per_order" (one app per order), "per_listing" (re-armed app
+# per product) or "shared" (one app, one box per order);
+# flow: the calls of one completed order as (method, other txns in its
+# group), method None for a plain payment; fees count inner txns too
+VARIANTS = {
+    "escrow_approval": {
+        "source": "backend/smartcontracts/escrow_approval.py",
+        "module": "backend.smartcontracts.escrow_approval",
+        "approval": "approval_program", "clear": "clear_state_program", "version": 8,
+        "global_schema": (2, 1), "local_schema": (0, 0), "deployment": "per_order",
+        "flow": [("create", 0), ("fund", 1), ("release", 0)],
+    },
+    "escrow_v2": {
+        "source": "backend/smartcontracts/escrow_v2.py",
+        "module": "backend.smartcontracts.escrow_v2",
+        "approval": "approval_program", "clear": "clear_program", "version": 8,
+        # not deployed by the backend; schema from its keys (amount, status / admin, seller, buyer)
+        "global_schema": (2, 3), "local_schema": (0, 0), "deployment": "per_order",
+        "flow": [("create", 0), ("fund", 1), ("release", 0)],
+    },
+    "deploy_inline": {
+        "source": "backend/smartcontracts/deploy.py",
+        "module": "backend.smartcontracts.deploy",
+        "approval": "approval_program", "clear": "clear_program", "version": 7,
+        "global_schema": (1, 2), "local_schema": (0, 0), "deployment": "per_order",
+        "flow": [("create", 0), (None, 0), ("noop", 0)],
+    },
+    "frontend_escrow": {
+        "source": "src/lib/algorand/contracts/escrow.py",
+        "path": "src/lib/algorand/contracts/escrow.py",
+        "approval": "approval_program", "clear": "clear_state_program", "version": 8,
+        # ESCROW_CONTRACT_CONFIG in deploy.ts
+        "global_schema": (3, 4), "local_schema": (0, 0), "deployment": "per_order",
+        # deploy.ts also tops up the app account before the "create" call
+        "flow": [("create", 0), (None, 0), ("create", 0), ("fund", 1), ("mark_delivered", 0),
+                 ("confirm_delivery", 0)],
+    },
+    "escrow_reusable": {
+        "source": "backend/smartcontracts/escrow_reusable.py",
+        "module": "backend.smartcontracts.escrow_reusable",
+        "approval": "approval_program", "clear": "clear_state_program", "version": 8,
+        "global_schema": (2, 2), "local_schema": (0, 0), "deployment": "per_listing",
+        # repeat orders of a listing: re-arm instead of create
+        "flow": [("arm", 0), ("fund", 1), ("release", 0)],
+    },
+    "escrow_boxes": {
+        "source": "backend/smartcontracts/escrow_boxes.py",
+        "module": "backend.smartcontracts.escrow_boxes",
+        "approval": "approval_program", "clear": "clear_program", "version": 8,
+        "global_schema": (0, 0), "local_schema": (0, 0), "deployment": "shared",
+        "box_mbr": "BOX_MBR",
+        # open pays the box MBR in its group, close hands it back
+        "flow": [("open", 1), ("fund", 1), ("release", 0), ("close", 0)],
+    },
+    "escrow_compact": {
+        "source": "backend/smartcontracts/escrow_compact.py",
+        "module": "backend.smartcontracts.escrow_compact",
+        "approval": "approval_program", "clear": "clear_program", "version": 8,
+        "global_schema": (0, 1), "local_schema": (0, 0), "deployment": "per_order",
+        # release closes the app account, delete hands the app MBR back
+        "flow": [("create", 0), ("fund", 1), ("release", 0), ("delete", 0)],
+    },
+}
+
+
+def _load(spec):
+    if "path" in spec:
+        path = os.path.join(REPO_ROOT, spec["path"])
+        module_spec = importlib.util.spec_from_file_location(f"_contract_{os.path.basename(path)[:-3]}", path)
+        module = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(module)
+        return module
+    return importlib.import_module(spec["module"])
+
+
+def compile_variant(spec):
+    module = _load(spec)
+    teal = {}
+    for part in ("approval", "clear"):
+        builder = getattr(module, spec[part])
+        teal[part] = compileTeal(builder(), mode=Mode.Application, version=spec["version"], assembleConstants=True)
+    return module, teal
+
+
+# ==========================================================
+# 🧮 Assembled size
+# ==========================================================
+# opcodes by number of immediate bytes they carry (anything else has none)
+_IMM1 = {"intc", "bytec", "load", "store", "txn", "global", "gtxns", "itxn", "itxn_field", "arg", "dig", "bury",
+         "cover", "uncover", "dupn", "popn", "frame_dig", "frame_bury", "txnas", "gtxnsas", "itxnas", "gloads",
+         "asset_holding_get", "asset_params_get", "app_params_get", "acct_params_get", "ecdsa_verify",
+         "ecdsa_pk_decompress", "ecdsa_pk_recover", "json_ref", "base64_decode", "vrf_verify", "block", "gitxn_field"}
+_IMM2 = {"txna", "gtxn", "gtxnsa", "itxna", "substring", "extract", "proto", "gtxnas", "gload", "gitxn"}
+_IMM3 = {"gtxna", "gitxna"}
+_BRANCHES = {"b", "bz", "bnz", "callsub"}
+
+
+def _varuint(n):
+    size = 1
+    while n >= 0x80:
+        n >>= 7
+        size += 1
+    return size
+
+
+def _parse_bytes(token):
+    if token.startswith("0x"):
+        return bytes.fromhex(token[2:])
+    if token.startswith('"') and token.endswith('"'):
+        return token[1:-1].encode().decode("unicode_escape").encode("latin-1")
+    raise ValueError(f"unsupported byte constant {token}")
+
+
+def _tokens(line):
+    # constants are assembled, so byte values are hex and "//" only starts comments
+    return line.split("//", 1)[0].split()
+
+
+def parse(teal):
+    """TEAL source -> list of (op, args) with labels as ("label", [name])."""
+    program = []
+    for raw in teal.splitlines():
+        tokens = _tokens(raw.strip())
+        if not tokens:
+            continue
+        if tokens[0].endswith(":") and len(tokens) == 1:
+            program.append(("label", [tokens[0][:-1]]))
+        else:
+            program.append((tokens[0], tokens[1:]))
+    return program
+
+
+def op_size(op, args):
+    if op == "label":
+        return 0
+    if op == "#pragma":
+        return 1
+    if op == "intcblock":
+        return 1 + _varuint(len(args)) + sum(_varuint(int(a)) for a in args)
+    if op == "bytecblock":
+        values = [_parse_bytes(a) for a in args]
+        return 1 + _varuint(len(values)) + sum(_varuint(len(v)) + len(v) for v in values)
+    if op == "pushint":
+        return 1 + _varuint(int(args[0]))
+    if op == "pushbytes":
+        value = _parse_bytes(args[0])
+        return 1 + _varuint(len(value)) + len(value)
+    if op in ("switch", "match"):
+        return 2 + 2 * len(args)
+    if op in _BRANCHES:
+        return 3
+    if op in _IMM3:
+        return 4
+    if op in _IMM2:
+        return 3
+    if op in _IMM1:
+        return 2
+    return 1
+
+
+def program_size(teal):
+    return sum(op_size(op, args) for op, args in parse(teal))
+
+
+# ==========================================================
+# 🔀 Path walker
+# ==========================================================
+# opcode costs that differ from 1
+OP_COST = {
+    "sha256": 35, "keccak256": 130, "sha512_256": 45, "sha3_256": 130, "ed25519verify": 1900,
+    "ed25519verify_bare": 1900, "ecdsa_verify": 1700, "ecdsa_pk_decompress": 650, "ecdsa_pk_recover": 2000,
+    "divmodw": 20, "sqrt": 4, "bsqrt": 40, "b+": 10, "b-": 10, "b*": 20, "b/": 20, "b%": 20,
+    "b|": 6, "b&": 6, "b^": 6, "b~": 4, "vrf_verify": 5700,
+}
+MAX_PATHS = 10_000
+MAX_STEPS = 20_000
+
+
+class Sym:
+    """A value the static walk cannot know (transaction fields, state, ...)."""
+
+    def __init__(self, source=None):
+        self.source = source
+
+
+# (pops, pushes) for opcodes whose result is always symbolic here
+_OPAQUE = {
+    "app_global_get": (1, 1), "app_global_put": (2, 0), "app_global_del": (1, 0), "app_global_get_ex": (2, 2),
+    "app_local_get": (2, 1), "app_local_put": (3, 0), "app_local_del": (2, 0), "app_local_get_ex": (3, 2),
+    "box_create": (2, 1), "box_extract": (3, 1), "box_replace": (3, 0), "box_del": (1, 1), "box_len": (1, 2),
+    "box_get": (1, 2), "box_put": (2, 0), "balance": (1, 1), "min_balance": (1, 1), "log": (1, 0),
+    "sha256": (1, 1), "keccak256": (1, 1), "sha512_256": (1, 1), "gtxns": (1, 1), "gtxnsa": (1, 1),
+    "app_params_get": (1, 2), "asset_params_get": (1, 2), "acct_params_get": (1, 2), "asset_holding_get": (2, 2),
+    "getbyte": (2, 1), "setbyte": (3, 1), "extract3": (3, 1), "substring3": (3, 1), "extract_uint64": (2, 1),
+    "extract_uint32": (2, 1), "extract_uint16": (2, 1), "replace2": (2, 1), "replace3": (3, 1), "itxn": (0, 1),
+    "ed25519verify": (3, 1), "addw": (2, 2), "mulw": (2, 2), "exp": (2, 1), "shl": (2, 1), "shr": (2, 1),
+    "bitlen": (1, 1), "getbit": (2, 1), "setbit": (3, 1), "bzero": (1, 1), "b==": (2, 1), "b<": (2, 1),
+    "b>": (2, 1), "b+": (2, 1), "b-": (2, 1), "b*": (2, 1), "b/": (2, 1), "b%": (2, 1),
+}
+
+_BINARY = {
+    "==": lambda a, b: int(a == b), "!=": lambda a, b: int(a != b), "<": lambda a, b: int(a < b),
+    ">": lambda a, b: int(a > b), "<=": lambda a, b: int(a <= b), ">=": lambda a, b: int(a >= b),
+    "&&": lambda a, b: int(bool(a) and bool(b)), "||": lambda a, b: int(bool(a) or bool(b)),
+    "+": lambda a, b: a + b, "-": lambda a, b: a - b, "*": lambda a, b: a * b,
+    "/": lambda a, b: a // b, "%": lambda a, b: a % b, "&": lambda a, b: a & b, "|": lambda a, b: a | b,
+    "^": lambda a, b: a ^ b, "concat": lambda a, b: a + b,
+}
+
+
+class Scenario:
+    def __init__(self, app_id, on_completion, selector=None):
+        self.app_id = app_id
+        self.on_completion = on_completion
+        self.selector = selector   # known ApplicationArgs[0], or None
+        self.selectors = []        # byte constants ApplicationArgs[0] was compared with
+
+
+def _txn_field(scenario, field, index=None):
+    if field == "ApplicationID":
+        return scenario.app_id
+    if field == "OnCompletion":
+        return scenario.on_completion
+    if field == "ApplicationArgs" and index == 0:
+        return scenario.selector if scenario.selector is not None else Sym("arg0")
+    return Sym(field)
+
+
+def walk(program, scenario):
+    """Returns (approving paths, rejected path count) as [(cost, inner txns)]."""
+    labels = {args[0]: i for i, (op, args) in enumerate(program) if op == "label"}
+    ints, byts = [], []
+    approved, rejected = [], 0
+    # path state: pc, stack, scratch, call frames, cost, inner txns, steps
+    todo = [(0, [], {}, [], 0, 0, 0)]
+    while todo:
+        if len(approved) + rejected > MAX_PATHS:
+            raise RuntimeError("too many paths, is there a data-dependent loop?")
+        pc, stack, scratch, frames, cost, inner, steps = todo.pop()
+        outcome = None
+        while outcome is None:
+            if pc >= len(program):
+                outcome = "approve" if stack and not (isinstance(stack[-1], int) and stack[-1] == 0) else "reject"
+                break
+            steps += 1
+            if steps > MAX_STEPS:
+                raise RuntimeError("path too long, is there a data-dependent loop?")
+            op, args = program[pc]
+            pc += 1
+            if op in ("label", "#pragma"):
+                continue
+            cost += OP_COST.get(op, 1)
+
+            if op == "intcblock":
+                ints = [int(a) for a in args]
+            elif op == "bytecblock":
+                byts = [_parse_bytes(a) for a in args]
+            elif op.startswith("intc"):
+                stack.append(ints[int(args[0]) if args else int(op[5:])])
+            elif op.startswith("bytec"):
+                stack.append(byts[int(args[0]) if args else int(op[6:])])
+            elif op == "pushint":
+                stack.append(int(args[0]))
+            elif op == "pushbytes":
+                stack.append(_parse_bytes(args[0]))
+            elif op == "txn":
+                stack.append(_txn_field(scenario, args[0]))
+            elif op == "txna":
+                stack.append(_txn_field(scenario, args[0], int(args[1])))
+            elif op in ("gtxn", "gtxna", "global"):
+                stack.append(Sym(op))
+            elif op in _BINARY:
+                b, a = stack.pop(), stack.pop()
+                if op == "==" and isinstance(b, bytes) and isinstance(a, Sym) and a.source == "arg0":
+                    scenario.selectors.append(b)
+                elif op == "==" and isinstance(a, bytes) and isinstance(b, Sym) and b.source == "arg0":
+                    scenario.selectors.append(a)
+                if isinstance(a, Sym) or isinstance(b, Sym):
+                    if op == "&&" and 0 in (a, b):
+                        stack.append(0)
+                    elif op == "||" and any(isinstance(v, int) and v for v in (a, b)):
+                        stack.append(1)
+                    else:
+                        stack.append(Sym())
+                else:
+                    stack.append(_BINARY[op](a, b))
+            elif op == "!":
+                a = stack.pop()
+                stack.append(Sym() if isinstance(a, Sym) else int(not a))
+            elif op == "btoi":
+                a = stack.pop()
+                stack.append(int.from_bytes(a, "big") if isinstance(a, bytes) else Sym())
+            elif op == "itob":
+                a = stack.pop()
+                stack.append(a.to_bytes(8, "big") if isinstance(a, int) else Sym())
+            elif op == "len":
+                a = stack.pop()
+                stack.append(len(a) if isinstance(a, bytes) else Sym())
+            elif op in ("extract", "substring"):
+                a = stack.pop()
+                start, second = int(args[0]), int(args[1])
+                end = start + second if op == "extract" else second
+                stack.append(a[start:end] if isinstance(a, bytes) else Sym())
+            elif op in _OPAQUE:
+                pops, pushes = _OPAQUE[op]
+                del stack[len(stack) - pops:]
+                stack.extend(Sym() for _ in range(pushes))
+            elif op in ("itxn_begin", "itxn_next"):
+                inner += 1
+            elif op == "itxn_field":
+                stack.pop()
+            elif op == "itxn_submit":
+                pass
+            elif op == "load":
+                stack.append(scratch.get(int(args[0]), 0))
+            elif op == "store":
+                scratch[int(args[0])] = stack.pop()
+            elif op == "pop":
+                stack.pop()
+            elif op == "dup":
+                stack.append(stack[-1])
+            elif op == "dup2":
+                stack.extend(stack[-2:])
+            elif op == "swap":
+                stack[-1], stack[-2] = stack[-2], stack[-1]
+            elif op == "dig":
+                stack.append(stack[-1 - int(args[0])])
+            elif op == "cover":
+                stack.insert(len(stack) - 1 - int(args[0]), stack.pop())
+            elif op == "uncover":
+                stack.append(stack.pop(-1 - int(args[0])))
+            elif op == "select":
+                cond, b, a = stack.pop(), stack.pop(), stack.pop()
+                stack.append(Sym() if isinstance(cond, Sym) else (b if cond else a))
+            elif op == "assert":
+                cond = stack.pop()
+                if isinstance(cond, int) and cond == 0:
+                    outcome = "reject"
+            elif op == "err":
+                outcome = "reject"
+            elif op == "return":
+                value = stack.pop()
+                outcome = "reject" if isinstance(value, int) and value == 0 else "approve"
+            elif op == "b":
+                pc = labels[args[0]]
+            elif op in ("bz", "bnz"):
+                cond = stack.pop()
+                target = labels[args[0]]
+                if isinstance(cond, Sym):
+                    # follow the jump later, the fall-through now
+                    todo.append((target, list(stack), dict(scratch), [list(f) for f in frames], cost, inner, steps))
+                elif bool(cond) == (op == "bnz"):
+                    pc = target
+            elif op == "callsub":
+                frames.append([pc, None, 0])
+                pc = labels[args[0]]
+            elif op == "proto":
+                frames[-1][1] = len(stack) - int(args[0])
+                frames[-1][2] = int(args[1])
+            elif op == "frame_dig":
+                stack.append(stack[frames[-1][1] + int(args[0])])
+            elif op == "frame_bury":
+                stack[frames[-1][1] + int(args[0])] = stack.pop()
+            elif op == "retsub":
+                ret_pc, base, returns = frames.pop()
+                if base is not None:
+                    results = stack[len(stack) - returns:] if returns else []
+                    del stack[base:]
+                    stack.extend(results)
+                pc = ret_pc
+            else:
+                raise ValueError(f"opcode '{op}' is not supported by the static walker")
+
+        if outcome == "approve":
+            approved.append((cost, inner))
+        else:
+            rejected += 1
+    return approved, rejected
+
+
+def _method_profile(program, scenario):
+    approved, rejected = walk(program, scenario)
+    if not approved:
+        return {"status": "reject", "paths": rejected}
+    costs = [c for c, _ in approved]
+    return {
+        "status": "approve",
+        "cost_min": min(costs),
+        "cost_max": max(costs),
+        "budget_pct": round(max(costs) / OPCODE_BUDGET * 100, 1),
+        "inner_txns": max(i for _, i in approved),
+        "paths": len(approved),
+        "rejected_paths": rejected,
+    }
+
+
+def profile_methods(teal):
+    program = parse(teal)
+    methods = {"create": _method_profile(program, Scenario(0, 0))}
+    for name, oc in ON_COMPLETION.items():
+        if name != "noop":
+            methods[name] = _method_profile(program, Scenario(1, oc))
+
+    # discover NoOp selectors from the dispatch, then profile each one
+    discovery = Scenario(1, ON_COMPLETION["noop"])
+    walk(program, discovery)
+    selectors = list(dict.fromkeys(discovery.selectors))
+    if not selectors:
+        methods["noop"] = _method_profile(program, Scenario(1, ON_COMPLETION["noop"]))
+    for selector in selectors:
+        name = selector.decode(errors="replace")
+        methods[name] = _method_profile(program, Scenario(1, ON_COMPLETION["noop"], selector))
+    return methods
+
+
+# ==========================================================
+# 💰 Footprint
+# ==========================================================
+def app_mbr(global_schema, extra_pages):
+    """Minimum balance the creator locks for one deployed app (local state is paid by opted-in accounts)."""
+    uints, byte_slices = global_schema
+    return MBR_APP_PAGE * (1 + extra_pages) + MBR_GLOBAL_UINT * uints + MBR_GLOBAL_BYTES * byte_slices
+
+
+def profile_variant(name, spec):
+    module, teal = compile_variant(spec)
+    approval_bytes, clear_bytes = program_size(teal["approval"]), program_size(teal["clear"])
+    extra_pages = max(0, -(-(approval_bytes + clear_bytes) // MAX_PAGE_BYTES) - 1)
+    mbr = app_mbr(spec["global_schema"], extra_pages)
+    if spec["deployment"] == "shared":
+        per_order = getattr(module, spec["box_mbr"])
+    else:
+        # per_listing apps are shared by a listing's orders: this is the upper bound
+        per_order = mbr
+    methods = profile_methods(teal["approval"])
+
+    fees = 0
+    for method, others in spec["flow"]:
+        profile = methods.get(method, {"status": "approve", "inner_txns": 0}) if method else None
+        if profile is not None and profile["status"] != "approve":
+            raise ValueError(f"{name}: flow method '{method}' is rejected by the program")
+        fees += (1 + others + (profile["inner_txns"] if profile else 0)) * MIN_FEE
+    # the order's MBR comes back when its flow ends by deleting the app / box
+    reclaimed = spec["flow"][-1][0] in ("delete", "close")
+    return {
+        "source": spec["source"],
+        "teal_version": spec["version"],
+        "approval_bytes": approval_bytes,
+        "clear_bytes": clear_bytes,
+        "extra_pages": extra_pages,
+        "global_schema": dict(zip(("uints", "byte_slices"), spec["global_schema"])),
+        "local_schema": dict(zip(("uints", "byte_slices"), spec["local_schema"])),
+        "deployment": spec["deployment"],
+        "app_mbr": mbr,
+        "per_order_mbr": per_order,
+        "mbr_locked_after_order": 0 if reclaimed else per_order,
+        "order_flow": [m or "payment" for m, _ in spec["flow"]],
+        "fees_per_order": fees,
+        "methods": methods,
+    }
+
+
+# ==========================================================
+# 📊 Report
+# ==========================================================
+def compare(results, baseline, max_increase):
+    regressions = []
+
+    def check(variant, metric, before, after):
+        if before and after is not None and (after - before) / before * 100 > max_increase:
+            regressions.append({"variant": variant, "metric": metric, "baseline": before, "current": after})
+
+    for name, current in results["variants"].items():
+        before = baseline.get("variants", {}).get(name)
+        if not before:
+            continue
+        for metric in ("approval_bytes", "per_order_mbr", "mbr_locked_after_order", "fees_per_order"):
+            check(name, metric, before.get(metric), current[metric])
+        for method, profile in current["methods"].items():
+            old = before.get("methods", {}).get(method, {})
+            check(name, f"{method}.cost_max", old.get("cost_max"), profile.get("cost_max"))
+    return regressions
+
+
+def print_tables(results):
+    variants = results["variants"]
+    print(f"{'variant':<18} {'deploy':<12} {'approval':>8} {'clear':>6} {'pages':>5} "
+          f"{'schema u/b':>10} {'app MBR':>9} {'order MBR':>10} {'locked':>8} {'fees':>6}")
+    for name, v in variants.items():
+        schema = f"{v['global_schema']['uints']}/{v['global_schema']['byte_slices']}"
+        print(f"{name:<18} {v['deployment']:<12} {v['approval_bytes']:>8} {v['clear_bytes']:>6} "
+              f"{1 + v['extra_pages']:>5} {schema:>10} {v['app_mbr']:>9} {v['per_order_mbr']:>10} "
+              f"{v['mbr_locked_after_order']:>8} {v['fees_per_order']:>6}")
+    print()
+    print(f"{'variant':<18} {'method':<18} {'cost min':>8} {'max':>5} {'budget':>7} {'inner':>5} {'paths':>5}")
+    for name, v in variants.items():
+        for method, m in v["methods"].items():
+            if m["status"] == "reject":
+                print(f"{name:<18} {method:<18} {'rejected':>8}")
+            else:
+                print(f"{name:<18} {method:<18} {m['cost_min']:>8} {m['cost_max']:>5} {m['budget_pct']:>6}% "
+                      f"{m['inner_txns']:>5} {m['paths']:>5}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANTS), default=list(VARIANTS))
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--baseline", help="previous JSON report to gate cost regressions against")
+    parser.add_argument("--max-increase", type=float, default=0.0, help="allowed growth per metric in percent")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of tables")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_ROOT)
+    results = {
+        "opcode_budget": OPCODE_BUDGET,
+        "variants": {name: profile_variant(name, VARIANTS[name]) for name in args.variants},
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            results["regressions"] = compare(results, json.load(f), args.max_increase)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_tables(results)
+    for r in results.get("regressions", []):
+        print(f"❌ {r['variant']} {r['metric']}: {r['baseline']} -> {r['current']}")
+    raise SystemExit(1 if results.get("regressions") else 0)
+
+
+if __name__ == "__main__":
+    main()
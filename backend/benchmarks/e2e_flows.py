@@ -0,0 +1,249 @@
+# backend/benchmarks/e2e_flows.py
+"""
+End-to-end load benchmark: the real FastAPI app against a fake algod.
+
+Starts backend.benchmarks.fake_algod on localhost, points the backend at it
+with a throwaway SQLite database and signing keys, runs the app's startup
+hooks (deploy queue workers, confirmation tracker, ...) and drives full
+order flows through the ASGI app at a fixed concurrency:
+
+    create -> (poll job until deployed) -> update_buyer -> prepare_fund
+           -> fund/verify -> admin/release
+
+Results (throughput, p50/p95/p99 per endpoint, algod request counts) are
+written as JSON. With --baseline, endpoints whose p95 got worse by more
+than --max-regression percent fail the run (exit code 1).
+
+    python -m backend.benchmarks.e2e_flows --flows 200 --concurrency 32
+    python -m backend.benchmarks.e2e_flows --round-time 0.25 --latency-ms 5 --out bench.json --baseline main.json
+
+Fully offline: no TestNet, no funded accounts.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from backend.benchmarks.fake_algod import FakeAlgod
+
+ADMIN_KEY = "bench-admin"
+JOB_POLL_INTERVAL = 0.05  # seconds between job status polls
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _summary(samples, elapsed):
+    ms = [s * 1000 for s in samples]
+    return {
+        "count": len(ms),
+        "throughput_rps": round(len(ms) / elapsed, 2),
+        "mean_ms": round(statistics.fmean(ms), 2),
+        "p50_ms": round(_percentile(ms, 50), 2),
+        "p95_ms": round(_percentile(ms, 95), 2),
+        "p99_ms": round(_percentile(ms, 99), 2),
+        "max_ms": round(max(ms), 2),
+    }
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = {}  # endpoint -> [seconds]
+        self.errors = {}   # endpoint -> [message]
+
+    async def call(self, client, method, endpoint, url, **kwargs):
+        """One request, timed under the endpoint's route template."""
+        t0 = time.perf_counter()
+        resp = await client.request(method, url, **kwargs)
+        self.samples.setdefault(endpoint, []).append(time.perf_counter() - t0)
+        if resp.status_code >= 400:
+            self.errors.setdefault(endpoint, []).append(f"{resp.status_code}: {resp.text[:200]}")
+            raise RuntimeError(f"{endpoint} -> {resp.status_code}")
+        return resp.json()
+
+    def phase(self, name, seconds):
+        self.samples.setdefault(name, []).append(seconds)
+
+
+def _new_address():
+    from algosdk import account
+    return account.generate_account()[1]
+
+
+async def _flow(client, rec, deploy_timeout):
+    seller, buyer = _new_address(), _new_address()
+    t_flow = time.perf_counter()
+
+    created = await rec.call(client, "POST", "POST /api/escrow/create", "/api/escrow/create",
+                             json={"seller": seller, "amount": 1_000_000, "product_name": "bench item"})
+    order_id, job_id = created["order"]["id"], created["job_id"]
+
+    # deployment happens in the background queue; poll like the frontend does
+    t_deploy = time.perf_counter()
+    while True:
+        job = await rec.call(client, "GET", "GET /api/escrow/jobs/{job_id}", f"/api/escrow/jobs/{job_id}")
+        if job["job"]["status"] == "DONE":
+            break
+        if job["job"]["status"] == "FAILED" or time.perf_counter() - t_deploy > deploy_timeout:
+            rec.errors.setdefault("deploy", []).append(f"job {job_id}: {job['job']}")
+            raise RuntimeError(f"deploy job {job_id} did not finish")
+        await asyncio.sleep(JOB_POLL_INTERVAL)
+    rec.phase("phase: deploy (create -> DONE)", time.perf_counter() - t_deploy)
+
+    await rec.call(client, "POST", "POST /api/escrow/update_buyer/{order_id}", f"/api/escrow/update_buyer/{order_id}",
+                   json={"buyer_wallet": buyer, "buyer_name": "Bench Buyer", "buyer_email": "bench@example.com",
+                         "buyer_address": "1 Benchmark Road"})
+    # the frontend asks for the server-built, unsigned fund group
+    await rec.call(client, "GET", "GET /api/escrow/prepare_fund/{order_id}",
+                   f"/api/escrow/prepare_fund/{order_id}?txns=1&buyer={buyer}")
+    await rec.call(client, "POST", "POST /api/escrow/fund/verify", "/api/escrow/fund/verify",
+                   json={"order_id": order_id, "tx_id": f"BENCHFUND{order_id}"})
+    await rec.call(client, "POST", "POST /api/escrow/admin/release", "/api/escrow/admin/release",
+                   json={"admin_key": ADMIN_KEY, "order_id": order_id})
+    rec.phase("flow: create -> released", time.perf_counter() - t_flow)
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(app):
+    """Run the app's startup/shutdown hooks (httpx's ASGI transport doesn't)."""
+    inbox, outbox = asyncio.Queue(), asyncio.Queue()
+    task = asyncio.create_task(app({"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}},
+                                   inbox.get, outbox.put))
+    await inbox.put({"type": "lifespan.startup"})
+    message = await outbox.get()
+    if message["type"] != "lifespan.startup.complete":
+        raise RuntimeError(f"app startup failed: {message.get('message')}")
+    try:
+        yield
+    finally:
+        await inbox.put({"type": "lifespan.shutdown"})
+        await outbox.get()
+        await task
+
+
+async def _run(app, args):
+    import httpx
+
+    rec = Recorder()
+    flows = iter(range(args.flows))
+    failed = 0
+
+    async def user(client):
+        nonlocal failed
+        for _ in flows:
+            try:
+                await _flow(client, rec, args.deploy_timeout)
+            except Exception as e:
+                failed += 1
+                if args.verbose:
+                    print(f"⚠️  flow failed: {e}", file=sys.stderr)
+
+    async with _lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            t0 = time.perf_counter()
+            await asyncio.gather(*(user(client) for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - t0
+    return rec, failed, elapsed
+
+
+def _compare(results, baseline, max_regression):
+    regressions = []
+    for endpoint, current in results["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(endpoint)
+        if not before or not before.get("p95_ms"):
+            continue
+        change = (current["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100
+        if change > max_regression:
+            regressions.append({"endpoint": endpoint, "baseline_p95_ms": before["p95_ms"],
+                                "p95_ms": current["p95_ms"], "change_pct": round(change, 1)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flows", type=int, default=100, help="total order flows to run")
+    parser.add_argument("--concurrency", type=int, default=16, help="flows in flight at once")
+    parser.add_argument("--round-time", type=float, default=1.0, help="fake algod seconds per round")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="added latency per algod request")
+    parser.add_argument("--escrow-mode", choices=("app", "compact"), default="app", help="ESCROW_MODE for new orders")
+    parser.add_argument("--deploy-workers", type=int, default=None, help="override DEPLOY_WORKERS")
+    parser.add_argument("--deploy-timeout", type=float, default=120.0, help="seconds before a deploy counts as failed")
+    parser.add_argument("--out", default="e2e_benchmark.json", help="where to write the JSON results")
+    parser.add_argument("--baseline", help="previous results file to compare p95 latencies against")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="allowed p95 increase in percent")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    from algosdk import account, mnemonic
+
+    with tempfile.TemporaryDirectory() as tmp, FakeAlgod(args.round_time, args.latency_ms) as algod:
+        # the backend reads its configuration at import time
+        key = account.generate_account()[0]
+        os.environ.update({
+            "ALGOD_ADDRESS": algod.address,
+            "ALGOD_TOKEN": "",
+            "CREATOR_MNEMONIC": mnemonic.from_private_key(key),
+            "ADMIN_MNEMONIC": mnemonic.from_private_key(key),
+            "ADMIN_SECRET_KEY": ADMIN_KEY,
+            "CHAIN_INDEXER": "0",  # fund/verify marks FUNDED directly; the fake has no block bodies
+            "APP_SWEEPER": "0",
+            "ESCROW_MODE": args.escrow_mode,
+            "TEAL_ARTIFACT_DIR": os.path.join(tmp, "teal"),  # never mix fake bytecode into real artifacts
+        })
+        if args.deploy_workers:
+            os.environ["DEPLOY_WORKERS"] = str(args.deploy_workers)
+
+        import backend.db as bdb
+        bdb.use_database(os.path.join(tmp, "bench.db"))
+        from backend.main import app
+
+        print(f"🏁 {args.flows} flows, concurrency {args.concurrency}, "
+              f"round time {args.round_time}s, algod latency {args.latency_ms}ms")
+        rec, failed, elapsed = asyncio.run(_run(app, args))
+        bdb.engine.dispose()
+        bdb.read_engine.dispose()
+
+    results = {
+        "config": {k: v for k, v in vars(args).items() if k not in ("out", "baseline", "verbose")},
+        "elapsed_s": round(elapsed, 3),
+        "flows_completed": args.flows - failed,
+        "flows_failed": failed,
+        "flows_per_s": round((args.flows - failed) / elapsed, 2),
+        "endpoints": {name: _summary(samples, elapsed) for name, samples in sorted(rec.samples.items())},
+        "errors": {name: {"count": len(msgs), "sample": msgs[:3]} for name, msgs in rec.errors.items()},
+        "algod_requests": dict(sorted(algod.requests.items())),
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            results["regressions"] = _compare(results, json.load(f), args.max_regression)
+        exit_code = 1 if results["regressions"] else 0
+
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(f"{'endpoint':<48} {'count':>6} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, s in results["endpoints"].items():
+        print(f"{name:<48} {s['count']:>6} {s['throughput_rps']:>8} "
+              f"{s['p50_ms']:>9} {s['p95_ms']:>9} {s['p99_ms']:>9}")
+    print(f"✅ {results['flows_completed']} flows in {results['elapsed_s']}s "
+          f"({results['flows_per_s']}/s), {failed} failed -> {args.out}")
+    for r in results.get("regressions", []):
+        print(f"❌ {r['endpoint']}: p95 {r['baseline_p95_ms']}ms -> {r['p95_ms']}ms (+{r['change_pct']}%)")
+    if failed:
+        exit_code = 1
+    raise SystemExit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# backend/benchmarks/fake_algod.py
+"""
+In-process algod stand-in for offline benchmarks.
+
+A threaded HTTP server that speaks the subset of the algod v2 API the
+backend uses: compile, transaction params, raw transaction submission,
+pending transaction info, status / wait-for-block-after and block txids.
+Rounds advance on a wall clock (round_time seconds each); a transaction
+submitted during round r confirms in round r + 1, and app creates are
+assigned consecutive app ids in submission order.
+
+    with FakeAlgod(round_time=0.5, latency_ms=2) as algod:
+        os.environ["ALGOD_ADDRESS"] = algod.address
+
+Nothing is validated (signatures, balances, programs): the point is to
+exercise the backend's own request path, not the ledger.
+"""
+import base64
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import msgpack
+from algosdk import transaction
+
+GENESIS_HASH = base64.b64encode(hashlib.sha256(b"fake-algod").digest()).decode()
+GENESIS_ID = "bench-v1"
+FIRST_ROUND = 1000
+FIRST_APP_ID = 1_000_000
+
+
+class FakeAlgod:
+    def __init__(self, round_time: float = 1.0, latency_ms: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.round_time = round_time
+        self.latency = latency_ms / 1000
+        self._lock = threading.Lock()
+        self._txns = {}      # txid -> {"round": confirmed round, "app-id": int | None}
+        self._blocks = {}    # round -> [txid]
+        self._next_app_id = FIRST_APP_ID
+        self._started = time.monotonic()
+        self.requests = {}   # "METHOD /path-template" -> count
+
+        fake = self
+
+        class Handler(_Handler):
+            algod = fake
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def address(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-algod", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ------------------------------------------------------
+    # ledger
+    # ------------------------------------------------------
+    def current_round(self) -> int:
+        return FIRST_ROUND + int((time.monotonic() - self._started) / self.round_time)
+
+    def wait_after(self, round_num: int, timeout: float = 60) -> int:
+        """Block until a round later than round_num exists (like algod, capped)."""
+        next_round_at = self._started + (round_num + 1 - FIRST_ROUND) * self.round_time
+        delay = min(next_round_at - time.monotonic(), timeout)
+        if delay > 0:
+            time.sleep(delay)
+        return self.current_round()
+
+    def submit(self, raw: bytes) -> str:
+        unpacker = msgpack.Unpacker(raw=False, strict_map_key=False)
+        unpacker.feed(raw)
+        signed = [transaction.SignedTransaction.undictify(d) for d in unpacker]
+        if not signed:
+            raise ValueError("empty transaction group")
+        with self._lock:
+            confirm_round = self.current_round() + 1
+            for stxn in signed:
+                txid = stxn.get_txid()
+                txn = stxn.transaction
+                app_id = None
+                if isinstance(txn, transaction.ApplicationCallTxn) and not txn.index:
+                    app_id = self._next_app_id
+                    self._next_app_id += 1
+                self._txns[txid] = {"round": confirm_round, "app-id": app_id}
+                self._blocks.setdefault(confirm_round, []).append(txid)
+        return signed[0].get_txid()
+
+    def pending_info(self, txid: str):
+        with self._lock:
+            entry = self._txns.get(txid)
+        if entry is None:
+            return None
+        if entry["round"] > self.current_round():
+            return {"confirmed-round": 0, "pool-error": "", "txn": {}}
+        info = {"confirmed-round": entry["round"], "pool-error": "", "txn": {}}
+        if entry["app-id"] is not None:
+            info["application-index"] = entry["app-id"]
+        return info
+
+    def status(self, round_num=None):
+        return {
+            "last-round": self.current_round() if round_num is None else round_num,
+            "last-version": "future",
+            "next-version": "future",
+            "next-version-round": 0,
+            "next-version-supported": True,
+            "time-since-last-round": 0,
+            "catchup-time": 0,
+            "stopped-at-unsupported-round": False,
+        }
+
+    def params(self):
+        return {
+            "consensus-version": "future",
+            "fee": 0,
+            "genesis-hash": GENESIS_HASH,
+            "genesis-id": GENESIS_ID,
+            "last-round": self.current_round(),
+            "min-fee": 1000,
+        }
+
+
+# route regex -> (template used for request counts, method name)
+_ROUTES = [
+    ("GET", re.compile(r"^/v2/transactions/params$"), "GET /v2/transactions/params", "_params"),
+    ("POST", re.compile(r"^/v2/teal/compile$"), "POST /v2/teal/compile", "_compile"),
+    ("POST", re.compile(r"^/v2/transactions$"), "POST /v2/transactions", "_send"),
+    ("GET", re.compile(r"^/v2/transactions/pending/(\w+)$"), "GET /v2/transactions/pending/{txid}", "_pending"),
+    ("GET", re.compile(r"^/v2/status$"), "GET /v2/status", "_status"),
+    ("GET", re.compile(r"^/v2/status/wait-for-block-after/(\d+)$"), "GET /v2/status/wait-for-block-after/{round}", "_wait"),
+    ("GET", re.compile(r"^/v2/blocks/(\d+)/txids$"), "GET /v2/blocks/{round}/txids", "_block_txids"),
+    ("GET", re.compile(r"^/health$"), "GET /health", "_health"),
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    algod = None  # set on the subclass created by FakeAlgod
+    protocol_version = "HTTP/1.1"  # keep-alive, like algod
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, code, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, method):
+        path = self.path.split("?", 1)[0]
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        for route_method, pattern, template, handler in _ROUTES:
+            match = pattern.match(path)
+            if route_method == method and match:
+                with self.algod._lock:
+                    self.algod.requests[template] = self.algod.requests.get(template, 0) + 1
+                if self.algod.latency:
+                    time.sleep(self.algod.latency)
+                try:
+                    code, payload = getattr(self, handler)(body, *match.groups())
+                except Exception as e:
+                    code, payload = 400, {"message": str(e)}
+                return self._reply(code, payload)
+        self._reply(404, {"message": f"fake algod: no route for {method} {path}"})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    # ------------------------------------------------------
+    # endpoints
+    # ------------------------------------------------------
+    def _params(self, body):
+        return 200, self.algod.params()
+
+    def _compile(self, body):
+        # stable fake bytecode per source; the backend only stores and signs it
+        digest = hashlib.sha256(body).digest()
+        program = b"\x08" + digest
+        return 200, {"hash": base64.b32encode(digest).decode().rstrip("="), "result": base64.b64encode(program).decode()}
+
+    def _send(self, body):
+        return 200, {"txId": self.algod.submit(body)}
+
+    def _pending(self, body, txid):
+        info = self.algod.pending_info(txid)
+        if info is None:
+            return 404, {"message": "txn does not exist"}
+        return 200, info
+
+    def _status(self, body):
+        return 200, self.algod.status()
+
+    def _wait(self, body, round_num):
+        return 200, self.algod.status(self.algod.wait_after(int(round_num)))
+
+    def _block_txids(self, body, round_num):
+        round_num = int(round_num)
+        if round_num > self.algod.current_round():
+            return 404, {"message": "block not available yet"}
+        with self.algod._lock:
+            return 200, {"blockTxids": list(self.algod._blocks.get(round_num, []))}
+
+    def _health(self, body):
+        return 200, {}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the fake algod on its own (e.g. for the dev server).")
+    parser.add_argument("--port", type=int, default=4001)
+    parser.add_argument("--round-time", type=float, default=1.0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    algod = FakeAlgod(args.round_time, args.latency_ms, port=args.port).start()
+    print(f"🧪 Fake algod at {algod.address} (round time {args.round_time}s)")
+    try:
+        algod._thread.join()
+    except KeyboardInterrupt:
+        algod.stop()
@@ -0,0 +1,113 @@
+# backend/benchmarks/serialization.py
+"""
+Per-row cost of building a list response, before and after projection.
+
+  legacy:    full ORM rows -> __dict__ copy -> jsonable_encoder -> json.dumps
+  projected: summary columns only -> row dicts -> orjson
+
+Both produce a page body for /api/escrow/status and /api/products/list from
+the same seeded temp database; times cover query + serialization.
+
+    python -m backend.benchmarks.serialization --rows 200 --repeat 200
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+import backend.db as bdb
+from backend import schemas
+
+TEXT = "lorem ipsum dolor sit amet " * 9  # ~250 chars, like real descriptions
+
+
+def _seed(n):
+    db = bdb.SessionLocal()
+    now = datetime.utcnow()
+    db.add_all([
+        bdb.Order(seller=f"SELLER{i}", buyer=f"BUYER{i}", product_name=f"item {i}", product_description=TEXT,
+                  buyer_name="Jane Doe", buyer_email="jane@example.com", buyer_address=TEXT * 2,
+                  image_url="https://example.com/i.png", amount=1_000_000, status="FUNDED", app_id=i,
+                  escrow_address="A" * 58, tx_id="T" * 52, created_at=now, updated_at=now)
+        for i in range(n)
+    ])
+    db.add_all([
+        bdb.Product(name=f"item {i}", description=TEXT * 4, price=1.5, seller=f"SELLER{i}",
+                    image="https://example.com/i.png", created_at=now)
+        for i in range(n)
+    ])
+    db.commit()
+    db.close()
+
+
+def _legacy(model, key, limit):
+    db = bdb.ReadSessionLocal()
+    rows = db.query(model).order_by(model.created_at.desc(), model.id.desc()).limit(limit).all()
+    out = []
+    for r in rows:
+        data = r.__dict__.copy()
+        data.pop("_sa_instance_state", None)
+        out.append(data)
+    body = json.dumps(jsonable_encoder({key: out, "next_cursor": None})).encode()
+    db.close()
+    return body
+
+
+def _projected(model, key, fields, limit):
+    db = bdb.ReadSessionLocal()
+    rows = (db.query(*schemas.columns(model, fields))
+            .order_by(model.created_at.desc(), model.id.desc()).limit(limit).all())
+    body = orjson.dumps({key: schemas.row_dicts(rows), "next_cursor": None})
+    db.close()
+    return body
+
+
+def _time(fn, repeat, rows):
+    fn()  # warm up
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        body = fn()
+    per_row_us = (time.perf_counter() - t0) / repeat / rows * 1e6
+    return round(per_row_us, 2), len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200, help="rows per page")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bdb.use_database(os.path.join(tmp, "bench.db"))
+        bdb.Base.metadata.create_all(bind=bdb.engine)
+        _seed(args.rows)
+
+        cases = {
+            "orders": (bdb.Order, "orders", schemas.ORDER_SUMMARY_FIELDS),
+            "products": (bdb.Product, "products", schemas.PRODUCT_SUMMARY_FIELDS),
+        }
+        results = []
+        for name, (model, key, fields) in cases.items():
+            before_us, before_bytes = _time(lambda: _legacy(model, key, args.rows), args.repeat, args.rows)
+            after_us, after_bytes = _time(lambda: _projected(model, key, fields, args.rows), args.repeat, args.rows)
+            results.append({
+                "endpoint": name,
+                "rows": args.rows,
+                "legacy_us_per_row": before_us,
+                "projected_us_per_row": after_us,
+                "speedup": round(before_us / after_us, 2),
+                "legacy_bytes": before_bytes,
+                "projected_bytes": after_bytes,
+            })
+        bdb.engine.dispose()
+        bdb.read_engine.dispose()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# backend/benchmarks/sqlite_concurrency.py
+"""
+Read throughput under sustained writes, per SQLite profile.
+
+Each profile gets a fresh temporary database seeded with orders. Writer
+threads then insert and update orders continuously while reader threads
+page through /api/escrow/status-style keyset queries, for a fixed duration.
+
+    python -m backend.benchmarks.sqlite_concurrency
+    python -m backend.benchmarks.sqlite_concurrency --profiles default wal --seconds 20 --readers 8 --writers 4
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeout
+
+import backend.db as bdb
+
+
+def _seed(rows):
+    db = bdb.SessionLocal()
+    try:
+        now = datetime.utcnow()
+        db.add_all([
+            bdb.Order(seller=f"SELLER{i % 50}", buyer=f"BUYER{i % 200}", product_name=f"item {i}",
+                      amount=1_000_000, status=random.choice(("INIT", "FUNDED", "RELEASED")),
+                      created_at=now, updated_at=now)
+            for i in range(rows)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def _writer(stop, stats):
+    while not stop.is_set():
+        db = bdb.SessionLocal()
+        t0 = time.perf_counter()
+        try:
+            db.add(bdb.Order(seller=f"SELLER{random.randrange(50)}", product_name="bench", amount=1, status="INIT"))
+            order = db.query(bdb.Order).filter(bdb.Order.id == random.randrange(1, 1000)).first()
+            if order is not None:
+                order.status = random.choice(("INIT", "FUNDED"))
+            db.commit()
+            stats["write_ms"].append((time.perf_counter() - t0) * 1000)
+        except (OperationalError, PoolTimeout) as e:
+            db.rollback()
+            stats["write_errors"].append(str(e).split("\n")[0])
+        finally:
+            db.close()
+
+
+def _reader(stop, stats):
+    while not stop.is_set():
+        db = bdb.ReadSessionLocal()
+        t0 = time.perf_counter()
+        try:
+            query = db.query(bdb.Order)
+            if random.random() < 0.5:
+                query = query.filter(bdb.Order.status == "FUNDED")
+            query.order_by(bdb.Order.created_at.desc(), bdb.Order.id.desc()).limit(50).all()
+            stats["read_ms"].append((time.perf_counter() - t0) * 1000)
+        except OperationalError as e:
+            stats["read_errors"].append(str(e).split("\n")[0])
+        finally:
+            db.close()
+
+
+def _pct(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * p / 100))], 3)
+
+
+def run_profile(profile, seconds, readers, writers, seed_rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        bdb.use_database(os.path.join(tmp, "bench.db"), profile)
+        bdb.Base.metadata.create_all(bind=bdb.engine)
+        bdb._add_missing_columns()
+        _seed(seed_rows)
+
+        stats = {"read_ms": [], "write_ms": [], "read_errors": [], "write_errors": []}
+        stop = threading.Event()
+        threads = [threading.Thread(target=_writer, args=(stop, stats)) for _ in range(writers)]
+        threads += [threading.Thread(target=_reader, args=(stop, stats)) for _ in range(readers)]
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        bdb.engine.dispose()
+        bdb.read_engine.dispose()
+
+    return {
+        "profile": profile,
+        "reads_per_s": round(len(stats["read_ms"]) / seconds, 1),
+        "writes_per_s": round(len(stats["write_ms"]) / seconds, 1),
+        "read_p50_ms": _pct(stats["read_ms"], 50),
+        "read_p99_ms": _pct(stats["read_ms"], 99),
+        "write_p50_ms": _pct(stats["write_ms"], 50),
+        "write_p99_ms": _pct(stats["write_ms"], 99),
+        "read_errors": len(stats["read_errors"]),
+        "write_errors": len(stats["write_errors"]),
+        "sample_error": (stats["write_errors"] + stats["read_errors"] or [None])[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", nargs="+", default=["default", "wal"])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seed-rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    results = []
+    for profile in args.profiles:
+        print(f"⏱️  {profile}: {args.readers} readers / {args.writers} writers for {args.seconds}s")
+        results.append(run_profile(profile, args.seconds, args.readers, args.writers, args.seed_rows))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
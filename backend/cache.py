@@ -0,0 +1,188 @@
+# backend/cache.py
+"""
+Read-through response cache for the hot listing endpoints.
+
+    @router.get("/list")
+    def list_products(request: Request, ...):
+        return cache.respond(request, "products", lambda: {...})
+
+- Entries are keyed by (namespace, namespace version, path + sorted query).
+  Committing a session that wrote to a namespace's tables bumps its version,
+  so every write path (routes, workers, chain indexer) invalidates without
+  having to remember to. CACHE_TTL bounds staleness for anything else.
+- Concurrent misses on the same key are coalesced: one caller computes,
+  the others wait for its result (singleflight).
+- Responses carry a strong ETag; a matching If-None-Match gets a 304.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import orjson
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+
+from backend.db import RoutingSession
+
+CACHE_ENABLED = os.getenv("RESPONSE_CACHE", "1") == "1"
+CACHE_TTL = float(os.getenv("CACHE_TTL", "30"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+
+# table name -> cache namespace it invalidates
+NAMESPACES = {
+    "orders": "orders",
+    "products": "products",
+}
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # key -> (etag, body, expires_at)
+_inflight = {}            # key -> _Flight
+_versions = {ns: 0 for ns in set(NAMESPACES.values())}
+_stats = {ns: {"hits": 0, "misses": 0, "coalesced": 0, "not_modified": 0, "invalidations": 0}
+          for ns in _versions}
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+def _key(namespace, request):
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    return (namespace, _versions[namespace], request.url.path, query)
+
+
+def _render(payload):
+    try:
+        # list endpoints hand over plain dicts of column values; orjson encodes
+        # them (datetimes included) directly
+        body = orjson.dumps(payload)
+    except TypeError:
+        body = orjson.dumps(jsonable_encoder(payload))
+    etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+    return etag, body
+
+
+def _lookup(namespace, request, compute):
+    """Returns (etag, body, cache status)."""
+    with _lock:
+        key = _key(namespace, request)
+        entry = _entries.get(key)
+        if entry is not None and entry[2] > time.monotonic():
+            _entries.move_to_end(key)
+            _stats[namespace]["hits"] += 1
+            return entry[0], entry[1], "HIT"
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _inflight[key] = _Flight()
+            _stats[namespace]["misses"] += 1
+        else:
+            _stats[namespace]["coalesced"] += 1
+
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value[0], flight.value[1], "COALESCED"
+
+    try:
+        flight.value = _render(compute())
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+            if flight.error is None:
+                # stored under the version we read before computing: a write
+                # that landed meanwhile makes this entry unreachable
+                _entries[key] = (flight.value[0], flight.value[1], time.monotonic() + CACHE_TTL)
+                _entries.move_to_end(key)
+                while len(_entries) > CACHE_MAX_ENTRIES:
+                    _entries.popitem(last=False)
+        flight.done.set()
+    return flight.value[0], flight.value[1], "MISS"
+
+
+def respond(request, namespace, compute):
+    """Serve compute()'s JSON payload through the cache with ETag handling."""
+    if not CACHE_ENABLED:
+        etag, body = _render(compute())
+        status = "BYPASS"
+    else:
+        etag, body, status = _lookup(namespace, request, compute)
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Cache": status}
+    if etag in (request.headers.get("if-none-match") or "").replace(" ", "").split(","):
+        with _lock:
+            _stats[namespace]["not_modified"] += 1
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def invalidate(*namespaces):
+    with _lock:
+        for ns in namespaces:
+            _versions[ns] += 1
+            _stats[ns]["invalidations"] += 1
+        stale = [k for k in _entries if k[0] in namespaces]
+        for k in stale:
+            del _entries[k]
+
+
+def stats():
+    with _lock:
+        out = {ns: dict(s, version=_versions[ns]) for ns, s in _stats.items()}
+        out["entries"] = len(_entries)
+        return out
+
+
+# ==========================================================
+# 🔁 Invalidation from committed writes
+# ==========================================================
+def _touched(session):
+    return session.info.setdefault("cache_namespaces", set())
+
+
+def _after_flush(session, flush_context):
+    touched = _touched(session)
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        ns = NAMESPACES.get(getattr(obj, "__tablename__", None))
+        if ns:
+            touched.add(ns)
+
+
+def _on_orm_execute(state):
+    # bulk query.update()/delete() bypass the flush
+    if state.is_update or state.is_delete:
+        for mapper in state.all_mappers:
+            ns = NAMESPACES.get(mapper.local_table.name)
+            if ns:
+                _touched(state.session).add(ns)
+
+
+def _after_commit(session):
+    touched = session.info.pop("cache_namespaces", None)
+    if touched:
+        invalidate(*touched)
+
+
+def _after_rollback(session):
+    session.info.pop("cache_namespaces", None)
+
+
+def track_writes(session_factory):
+    event.listen(session_factory, "after_flush", _after_flush)
+    event.listen(session_factory, "do_orm_execute", _on_orm_execute)
+    event.listen(session_factory, "after_commit", _after_commit)
+    event.listen(session_factory, "after_rollback", _after_rollback)
+
+
+# covers SessionLocal and the sync half of AsyncSessionLocal
+track_writes(RoutingSession)
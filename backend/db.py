@@ -1,9 +1,18 @@
 # backend/db.py
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text
+from sqlalchemy import create_engine, event, inspect, text, Column, Integer, String, Float, DateTime, Text, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm.attributes import flag_dirty, set_committed_value
+from sqlalchemy import insert, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.util import await_only
 from datetime import datetime
+import anyio
 import os
+import threading
 
 # ==========================================================
 # ✅ Database Configuration
@@ -12,13 +21,203 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "algocart.db")
 DATABASE_URL = f"sqlite:///{DB_PATH}"
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},  # SQLite-specific
-    echo=False  # Turn to True for SQL debugging
-)
+# "wal" = production profile below, "default" = plain pysqlite settings
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "wal")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")     # NORMAL is durable per checkpoint under WAL
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_KB = int(os.getenv("SQLITE_CACHE_KB", "65536"))        # page cache per connection
+SQLITE_MMAP_MB = int(os.getenv("SQLITE_MMAP_MB", "256"))
+SQLITE_READ_POOL = int(os.getenv("SQLITE_READ_POOL", "8"))
+SQLITE_WRITE_WAIT = float(os.getenv("SQLITE_WRITE_WAIT", "30"))     # seconds to wait for the writer
+
+
+def _apply_pragmas(dbapi_conn, read_only):
+    cur = dbapi_conn.cursor()
+    if not read_only:
+        # persistent in the file; only the writer needs to set it
+        cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cur.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cur.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_KB}")
+    cur.execute(f"PRAGMA mmap_size={SQLITE_MMAP_MB * 1024 * 1024}")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    if read_only:
+        cur.execute("PRAGMA query_only=1")
+    cur.close()
+
+
+# The sync and the aiosqlite writer engines are two pools over the same file.
+# Each pool holds one connection, and they share this single slot, so only one
+# write transaction is open in the process at a time. The slot is taken when a
+# writer connection is checked out and given back when it is checked in.
+_writer_slot = threading.Lock()
+
+
+def _take_writer_slot(dbapi_conn, record, proxy):
+    if not _writer_slot.acquire(timeout=SQLITE_WRITE_WAIT):
+        raise PoolTimeout(f"SQLite writer busy for {SQLITE_WRITE_WAIT}s")
+    record.info["writer_slot"] = True
+
+
+def _take_writer_slot_async(dbapi_conn, record, proxy):
+    # runs inside AsyncSession's greenlet: wait for the slot off the event loop
+    if not _writer_slot.acquire(blocking=False):
+        if not await_only(anyio.to_thread.run_sync(_writer_slot.acquire, True, SQLITE_WRITE_WAIT)):
+            raise PoolTimeout(f"SQLite writer busy for {SQLITE_WRITE_WAIT}s")
+    record.info["writer_slot"] = True
+
+
+def _give_writer_slot(dbapi_conn, record):
+    if record.info.pop("writer_slot", False):
+        _writer_slot.release()
+
+
+def make_engines(db_path, profile=SQLITE_PROFILE):
+    """
+    (writer, reader) engines for a database file.
+
+    wal: one pooled writer connection, so writes are serialized in-process
+    instead of fighting over the file lock, plus a pool of query_only reader
+    connections that WAL lets run alongside the writer.
+    """
+    url = f"sqlite:///{db_path}"
+    args = {"check_same_thread": False}  # SQLite-specific
+    if profile != "wal":
+        plain = create_engine(url, connect_args=args, echo=False)
+        return plain, plain
+
+    writer = create_engine(url, connect_args=args, pool_size=1, max_overflow=0,
+                           pool_timeout=SQLITE_WRITE_WAIT, echo=False)
+    reader = create_engine(url, connect_args=args, pool_size=SQLITE_READ_POOL,
+                           max_overflow=SQLITE_READ_POOL, echo=False)
+    event.listen(writer, "connect", lambda conn, rec: _apply_pragmas(conn, read_only=False))
+    event.listen(reader, "connect", lambda conn, rec: _apply_pragmas(conn, read_only=True))
+    event.listen(writer, "checkout", _take_writer_slot)
+    event.listen(writer, "checkin", _give_writer_slot)
+    return writer, reader
+
+
+def make_async_engines(db_path, profile=SQLITE_PROFILE):
+    """
+    (writer, reader) aiosqlite engines with the same profile as make_engines.
+    The writer shares the sync writer's slot, so async and sync writes are
+    still serialized through one writer.
+    """
+    url = f"sqlite+aiosqlite:///{db_path}"
+    if profile != "wal":
+        plain = create_async_engine(url, echo=False)
+        return plain, plain
+
+    writer = create_async_engine(url, pool_size=1, max_overflow=0, pool_timeout=SQLITE_WRITE_WAIT, echo=False)
+    reader = create_async_engine(url, pool_size=SQLITE_READ_POOL, max_overflow=SQLITE_READ_POOL, echo=False)
+    event.listen(writer.sync_engine, "connect", lambda conn, rec: _apply_pragmas(conn, read_only=False))
+    event.listen(reader.sync_engine, "connect", lambda conn, rec: _apply_pragmas(conn, read_only=True))
+    event.listen(writer.sync_engine, "checkout", _take_writer_slot_async)
+    event.listen(writer.sync_engine, "checkin", _give_writer_slot)
+    return writer, reader
+
+
+engine, read_engine = make_engines(DB_PATH)
+# created on first use so sync-only entry points (workers, scripts) never load aiosqlite
+async_engine = async_read_engine = None
+
+
+def get_async_engines():
+    global async_engine, async_read_engine
+    if async_engine is None:
+        async_engine, async_read_engine = make_async_engines(DB_PATH)
+    return async_engine, async_read_engine
+
+
+async def dispose_async_engines():
+    global async_engine, async_read_engine
+    if async_engine is not None:
+        await async_engine.dispose()
+        if async_read_engine is not async_engine:
+            await async_read_engine.dispose()
+        async_engine = async_read_engine = None
+
+
+def use_database(db_path, profile=SQLITE_PROFILE):
+    """Point the app at another database file (tests, benchmarks)."""
+    global DB_PATH, DATABASE_URL, engine, read_engine, async_engine, async_read_engine
+    DB_PATH, DATABASE_URL = db_path, f"sqlite:///{db_path}"
+    engine, read_engine = make_engines(db_path, profile)
+    async_engine = async_read_engine = None
+
+
+def _is_write(clause):
+    if clause is None:
+        return False
+    if isinstance(clause, TextClause):
+        return not clause.text.lstrip().upper().startswith(("SELECT", "WITH", "PRAGMA"))
+    return getattr(clause, "is_dml", False)
+
+
+class RoutingSession(Session):
+    """
+    Reads go to the reader pool; the first flush or DML statement pins the
+    session to the writer until commit/rollback, so the writer connection is
+    held only for the span of an actual write transaction.
+    """
+
+    def engines(self):
+        return engine, read_engine
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        writer, reader = self.engines()
+        if self.info.get("writing") or self._flushing or _is_write(clause):
+            self.info["writing"] = True
+            return writer
+        return reader
+
+
+class ReadSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kw):
+        return read_engine
+
+
+class AsyncRoutingSession(RoutingSession):
+    """Sync half of AsyncSessionLocal: same routing over the aiosqlite engines."""
+
+    def engines(self):
+        writer, reader = get_async_engines()
+        return writer.sync_engine, reader.sync_engine
+
+
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
+ReadSessionLocal = sessionmaker(class_=ReadSession, autocommit=False, autoflush=False)
+# expire_on_commit=False: expired attributes can't lazy-load outside an await
+AsyncSessionLocal = async_sessionmaker(class_=AsyncSession, sync_session_class=AsyncRoutingSession,
+                                       autoflush=False, expire_on_commit=False)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+@event.listens_for(RoutingSession, "after_rollback")
+def _release_writer(session):
+    session.info.pop("writing", None)
+
+
+@event.listens_for(ReadSession, "before_flush")
+def _reject_read_session_writes(session, flush_context, instances):
+    raise RuntimeError("ReadSessionLocal is read-only; use SessionLocal for writes")
+
+
+async def get_async_db():
+    """FastAPI dependency for async routes: AsyncSession over aiosqlite."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_read_db():
+    """FastAPI dependency for GET endpoints: a session that never touches the writer."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 # ==========================================================
@@ -47,11 +246,22 @@ class Order(Base):
     escrow_address = Column(String(255), nullable=True)
     app_id = Column(Integer, nullable=True)
     tx_id = Column(String(255), nullable=True)
+    # "app" = one escrow app per order, "listing" = shared re-armable app (ListingApp)
+    escrow_kind = Column(String(16), nullable=True, default="app")
+    product_id = Column(Integer, nullable=True, index=True)
 
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # keyset pagination over (created_at, id), optionally narrowed by one filter
+    __table_args__ = (
+        Index("ix_orders_created_id", "created_at", "id"),
+        Index("ix_orders_status_created_id", "status", "created_at", "id"),
+        Index("ix_orders_seller_created_id", "seller", "created_at", "id"),
+        Index("ix_orders_buyer_created_id", "buyer", "created_at", "id"),
+    )
+
 # ... (keep your Product model)
 # ... (keep your init_db function)
 
@@ -66,6 +276,124 @@ class Product(Base):
     image = Column(String(512), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # catalogue pages: newest-first overall / per seller, and price-range scans
+    __table_args__ = (
+        Index("ix_products_created_id", "created_at", "id"),
+        Index("ix_products_seller_created_id", "seller", "created_at", "id"),
+        Index("ix_products_price", "price"),
+    )
+
+
+class ListingApp(Base):
+    """
+    Long-lived re-armable escrow app (escrow_reusable.py) for one listing.
+    order_id is the order currently holding the app; NULL means free.
+    """
+    __tablename__ = "listing_apps"
+
+    id = Column(Integer, primary_key=True, index=True)
+    product_id = Column(Integer, nullable=False, index=True)
+    seller = Column(String(128), nullable=False)
+    app_id = Column(Integer, nullable=False, unique=True)
+    escrow_address = Column(String(255), nullable=False)
+    amount = Column(Integer, nullable=False)  # amount the app is currently armed for
+    order_id = Column(Integer, nullable=True, index=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class DeployJob(Base):
+    """
+    Durable background chain job (see backend/workers/deploy_queue.py).
+    status: PENDING -> RUNNING -> DONE | FAILED
+    """
+    __tablename__ = "deploy_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    order_id = Column(Integer, nullable=False, index=True)
+    kind = Column(String(32), nullable=False, default="deploy_escrow")
+    status = Column(String(16), nullable=False, default="PENDING", index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, index=True)
+    tx_id = Column(String(64), nullable=True)  # set once submitted, used for crash recovery
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ChainCheckpoint(Base):
+    """Last fully processed round per block consumer (see workers/chain_indexer.py)."""
+    __tablename__ = "chain_checkpoints"
+
+    name = Column(String(64), primary_key=True)
+    round = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class OrderStat(Base):
+    """
+    Running order totals per (scope, status), maintained on every flush that
+    inserts, updates or deletes an Order (see "Order statistics" below).
+    scope is "global", "seller:<address>" or "buyer:<address>".
+    """
+    __tablename__ = "order_stats"
+
+    scope = Column(String(160), primary_key=True)
+    status = Column(String(32), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    amount = Column(Integer, nullable=False, default=0)  # microAlgos
+
+
+class OrderEvent(Base):
+    """
+    Append-only order history: one row per status transition or note,
+    written in the same transaction as the change (see "Order change
+    tracking" below). Orders keep only their latest txid.
+    """
+    __tablename__ = "order_events"
+
+    id = Column(Integer, primary_key=True)
+    order_id = Column(Integer, nullable=False)
+    kind = Column(String(32), nullable=False)        # created | status | tx | note
+    from_status = Column(String(32), nullable=True)
+    to_status = Column(String(32), nullable=True)
+    tx_id = Column(String(64), nullable=True)
+    round = Column(Integer, nullable=True)
+    actor = Column(String(128), nullable=True)       # "api", "admin", "chain", "deploy_queue", ...
+    note = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_order_events_order_id", "order_id", "id"),
+    )
+
+
+class AppSweep(Base):
+    """
+    One row per finished order whose escrow app / box the sweeper has tried
+    to delete (see backend/workers/app_sweeper.py).
+    status: DONE | PENDING (submitted, settled from the chain next pass)
+            | FAILED (retried until attempts reaches SWEEP_MAX_ATTEMPTS)
+    """
+    __tablename__ = "app_sweeps"
+
+    order_id = Column(Integer, primary_key=True)
+    app_id = Column(Integer, nullable=False)
+    escrow_kind = Column(String(16), nullable=False)
+    status = Column(String(16), nullable=False, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    tx_id = Column(String(64), nullable=True)
+    confirmed_round = Column(Integer, nullable=True)
+    reclaimed_micro = Column(Integer, nullable=False, default=0)  # min balance released
+    fee_micro = Column(Integer, nullable=False, default=0)        # this order's share of the group fee
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 
 # ==========================================================
 # ⚙️ Database Initialization
@@ -80,4 +408,267 @@ def init_db():
         print(f"✅ Using existing database: {DB_PATH}")
 
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    _create_product_search()
+    _seed_order_stats()
     print("🗄️  Database initialized successfully.")
+
+
+def _seed_order_stats():
+    """order_stats is new on databases that already have orders: fill it once."""
+    with engine.begin() as conn:
+        has_stats = conn.execute(text("SELECT 1 FROM order_stats LIMIT 1")).first()
+        has_orders = conn.execute(text("SELECT 1 FROM orders LIMIT 1")).first()
+    if has_orders and not has_stats:
+        db = SessionLocal()
+        try:
+            rebuild_order_stats(db)
+            db.commit()
+            print("📊 Built order statistics")
+        finally:
+            db.close()
+
+
+def _add_missing_columns():
+    """
+    create_all() never alters existing tables, so add any nullable columns
+    introduced since the database file was created.
+    """
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {col_type}'))
+                print(f"🔧 Added column {table.name}.{column.name}")
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+
+# ==========================================================
+# 🔎 Product full-text search (FTS5)
+# ==========================================================
+# External-content index over products.name/description, kept in sync by
+# triggers so every write path (ORM or raw SQL) is covered.
+PRODUCT_SEARCH_RANK = "bm25(10.0, 1.0)"
+
+PRODUCT_SEARCH_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        name, description,
+        content='products', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF name, description ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO products_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+]
+
+
+def _create_product_search():
+    with engine.begin() as conn:
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'"
+        )).first()
+        for ddl in PRODUCT_SEARCH_DDL:
+            conn.execute(text(ddl))
+        # default ranking: bm25 with name matches weighted over description
+        conn.execute(text(f"INSERT INTO products_fts(products_fts, rank) VALUES ('rank', '{PRODUCT_SEARCH_RANK}')"))
+        if not exists:
+            # index products that were written before the FTS table existed
+            conn.execute(text("INSERT INTO products_fts(products_fts) VALUES ('rebuild')"))
+            print("🔎 Built product search index")
+
+
+# ==========================================================
+# 📊 Order change tracking (statistics + event log)
+# ==========================================================
+# Runs inside the flush, i.e. in the same transaction as the order change,
+# for every write path (routes, bulk actions, deploy queue, chain indexer):
+#   before_flush: order_stats deltas, and the transitions to log
+#   after_flush:  order_events rows (new orders have ids by then), one
+#                 executemany per flush however many orders changed
+def annotate_order(session, order, **meta):
+    """
+    Attach actor / note / round / tx_id to the order's next logged event.
+    On an order whose status doesn't change it is logged as kind "note".
+    session.info["actor"] sets the default actor for a whole session.
+    """
+    session.info.setdefault("order_event_meta", {}).setdefault(order, {}).update(meta)
+    if order in session and order not in session.new:
+        # an order with no column changes still has to reach the next flush
+        flag_dirty(order)
+
+
+def claim_order_status(session, order, from_status, to_status) -> bool:
+    """
+    Move `order` from `from_status` to `to_status` only if its row still has
+    from_status, so callers racing for the same order can't both win. The
+    guarded UPDATE decides the race. The change is then made on the instance
+    as well, so the flush logs it in order_stats / order_events like any other
+    status change. The caller commits.
+    """
+    claimed = session.execute(
+        update(Order)
+        .where(Order.id == order.id, Order.status == from_status)
+        .values(status=to_status)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if claimed:
+        set_committed_value(order, "status", from_status)
+        order.status = to_status
+        order.updated_at = datetime.utcnow()
+    return bool(claimed)
+
+
+def _stat_key(order, attr_values):
+    status = attr_values["status"] or "INIT"  # column default, not yet applied before insert
+    return status, attr_values["amount"] or 0, attr_values["seller"], attr_values["buyer"]
+
+
+STAT_ATTRS = ("status", "amount", "seller", "buyer")
+
+
+def _order_values(order, old=False):
+    values = {}
+    state = inspect(order)
+    for name in STAT_ATTRS:
+        history = state.attrs[name].history
+        if old and history.has_changes():
+            # an empty deleted list means the previous value was None
+            values[name] = history.deleted[0] if history.deleted else None
+        else:
+            values[name] = getattr(order, name)
+    return values
+
+
+# load the previous value on assignment, so history is complete even when
+# the attribute was expired (e.g. set right after a commit)
+for _name in STAT_ATTRS:
+    event.listen(getattr(Order, _name), "set", lambda target, value, oldvalue, initiator: value,
+                 active_history=True, retval=True)
+
+
+def _scopes(seller, buyer):
+    scopes = ["global"]
+    if seller:
+        scopes.append(f"seller:{seller}")
+    if buyer:
+        scopes.append(f"buyer:{buyer}")
+    return scopes
+
+
+def _add_delta(deltas, key, sign):
+    status, amount, seller, buyer = key
+    for scope in _scopes(seller, buyer):
+        count, total = deltas.get((scope, status), (0, 0))
+        deltas[(scope, status)] = (count + sign, total + sign * amount)
+
+
+def _apply_stat_deltas(session, deltas):
+    for (scope, status), (count, amount) in deltas.items():
+        if count == 0 and amount == 0:
+            continue
+        stmt = sqlite_insert(OrderStat).values(scope=scope, status=status, count=count, amount=amount)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=[OrderStat.scope, OrderStat.status],
+            set_={"count": OrderStat.count + stmt.excluded.count,
+                  "amount": OrderStat.amount + stmt.excluded.amount},
+        ))
+
+
+def _new_tx_id(order):
+    added = inspect(order).attrs.tx_id.history.added
+    return added[0] if added else None
+
+
+@event.listens_for(RoutingSession, "before_flush")
+def _track_order_changes(session, flush_context, instances):
+    deltas = {}
+    meta = session.info.pop("order_event_meta", {})
+    pending = []  # (order, kind, from_status, to_status, tx_id)
+    for obj in session.new:
+        if isinstance(obj, Order):
+            key = _stat_key(obj, _order_values(obj))
+            _add_delta(deltas, key, +1)
+            pending.append((obj, "created", None, key[0], obj.tx_id))
+    for obj in session.deleted:
+        if isinstance(obj, Order):
+            _add_delta(deltas, _stat_key(obj, _order_values(obj, old=True)), -1)
+    for obj in session.dirty:
+        if not isinstance(obj, Order) or not (session.is_modified(obj) or obj in meta):
+            continue
+        old, new = _stat_key(obj, _order_values(obj, old=True)), _stat_key(obj, _order_values(obj))
+        if old != new:
+            _add_delta(deltas, old, -1)
+            _add_delta(deltas, new, +1)
+        tx_id = _new_tx_id(obj)
+        if old[0] != new[0]:
+            pending.append((obj, "status", old[0], new[0], tx_id))
+        elif obj in meta:
+            pending.append((obj, "note", None, new[0], tx_id))
+        elif tx_id:
+            # e.g. a funding txid reported before the indexer confirms it
+            pending.append((obj, "tx", None, new[0], tx_id))
+    if deltas:
+        _apply_stat_deltas(session, deltas)
+    if pending:
+        session.info["order_events_pending"] = [
+            (order, kind, from_status, to_status, tx_id, meta.get(order, {}))
+            for order, kind, from_status, to_status, tx_id in pending
+        ]
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _write_order_events(session, flush_context):
+    pending = session.info.pop("order_events_pending", None)
+    if not pending:
+        return
+    now = datetime.utcnow()
+    default_actor = session.info.get("actor", "api")
+    rows = [{
+        "order_id": order.id,
+        "kind": kind,
+        "from_status": from_status,
+        "to_status": to_status,
+        "tx_id": m.get("tx_id", tx_id),
+        "round": m.get("round"),
+        "actor": m.get("actor", default_actor),
+        "note": m.get("note"),
+        "created_at": now,
+    } for order, kind, from_status, to_status, tx_id, m in pending]
+    session.execute(insert(OrderEvent), rows)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _drop_order_event_meta(session):
+    session.info.pop("order_event_meta", None)
+    session.info.pop("order_events_pending", None)
+
+
+def rebuild_order_stats(session):
+    """Recompute order_stats from the orders table (caller commits)."""
+    session.execute(text("DELETE FROM order_stats"))
+    for scope_sql, where in (
+        ("'global'", ""),
+        ("'seller:' || seller", "WHERE seller IS NOT NULL"),
+        ("'buyer:' || buyer", "WHERE buyer IS NOT NULL"),
+    ):
+        session.execute(text(f"""
+            INSERT INTO order_stats (scope, status, count, amount)
+            SELECT {scope_sql}, COALESCE(status, 'INIT'), COUNT(*), COALESCE(SUM(amount), 0)
+            FROM orders {where}
+            GROUP BY 1, 2
+        """))
@@ -0,0 +1,163 @@
+# backend/helpers/bulk_actions.py
+"""
+Bulk admin executor for release / refund / cancel.
+
+Chain actions become one admin app call per order, packed into atomic
+groups of up to 16. Groups are submitted in parallel and confirmed
+together. A group that algod rejects on submission is retried one txn at a
+time, so one bad order doesn't sink the other fifteen; a group that was
+accepted but not seen confirmed is never resent, its orders are reported
+as pending and left to the chain indexer. All confirmed Order rows are
+then updated in a single DB transaction, and every order gets its own result.
+
+  release: FUNDED / DELIVERED -> RELEASED  (app call "release")
+  refund:  FUNDED / DELIVERED -> REFUNDED  (app call "refund"; listing/box/compact contracts only)
+  cancel:  INIT               -> CANCELLED (DB only, nothing is locked on chain)
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from algosdk import transaction
+
+from backend.db import Order, annotate_order
+from backend.helpers import listing_apps
+from backend.smartcontracts.confirmations import wait_for_confirmation, confirmation_state
+
+MAX_GROUP_SIZE = 16
+PARALLEL_GROUPS = int(os.getenv("BULK_PARALLEL_GROUPS", "8"))
+
+ACTIONS = {
+    "release": {"from": ("FUNDED", "DELIVERED"), "to": "RELEASED"},
+    "refund": {"from": ("FUNDED", "DELIVERED"), "to": "REFUNDED"},
+    "cancel": {"from": ("INIT",), "to": "CANCELLED"},
+}
+
+# contracts that implement an on-chain refund
+REFUNDABLE_KINDS = ("listing", "box", "compact")
+
+
+def _build_call(order, action, params):
+    from backend.smartcontracts.deploy_escrow import creator_address
+    from backend.smartcontracts.deploy_boxes import build_admin_call
+
+    payee = order.seller if action == "release" else order.buyer
+    if order.escrow_kind == "box":
+        return build_admin_call(order.app_id, action, order.id, accounts=[payee], params=params)
+
+    # per-order and listing apps: outer fee also covers the inner payment
+    sp = params
+    sp.flat_fee = True
+    sp.fee = 2 * max(sp.min_fee or 1000, 1000)
+    return transaction.ApplicationNoOpTxn(
+        sender=creator_address,
+        sp=sp,
+        index=order.app_id,
+        app_args=[action.encode()],
+        accounts=[payee],
+    )
+
+
+def _send_and_confirm(algod_client, signed, wait_rounds=4):
+    """
+    Send a group (raises only if algod rejects the submission) and wait for
+    it. Returns (state, error) with state "confirmed", "failed" or "unknown".
+    A group that was accepted is never resent: after a failed wait its
+    outcome is looked up, and if it is still open the chain indexer decides.
+    """
+    algod_client.send_transactions(signed)
+    txid = signed[0].get_txid()
+    try:
+        # atomic group: one confirmed txid means all of them are in
+        wait_for_confirmation(algod_client, txid, wait_rounds)
+        return "confirmed", None
+    except Exception as wait_error:
+        state, info = confirmation_state(algod_client, txid)
+        if state == "confirmed":
+            return "confirmed", None
+        if state == "rejected":
+            return "failed", info["pool-error"]
+        return "unknown", f"Submitted but not confirmed yet ({wait_error})"
+
+
+def _run_group(algod_client, items):
+    """items: [(order_id, unsigned txn)]. Returns {order_id: (txid, state, error)}."""
+    from backend.smartcontracts.deploy_escrow import creator_private_key
+
+    txns = [t for _, t in items]
+    if len(txns) > 1:
+        transaction.assign_group_id(txns)
+    signed = [t.sign(creator_private_key) for t in txns]
+    try:
+        state, err = _send_and_confirm(algod_client, signed)
+        return {oid: (s.get_txid(), state, err) for (oid, _), s in zip(items, signed)}
+    except Exception as group_error:
+        if len(items) == 1:
+            return {items[0][0]: (None, "failed", str(group_error))}
+
+    # algod rejected the group: isolate the failing order(s) by sending each call on its own
+    results = {}
+    for oid, txn in items:
+        txn.group = None
+        single = txn.sign(creator_private_key)
+        try:
+            state, err = _send_and_confirm(algod_client, [single])
+            results[oid] = (single.get_txid(), state, err)
+        except Exception as e:
+            results[oid] = (None, "failed", str(e))
+    return results
+
+
+def run_bulk_action(db, algod_client, action: str, order_ids):
+    """Apply `action` to every order id. Returns a list of per-order results."""
+    from backend.smartcontracts.params import suggested_params
+
+    spec = ACTIONS[action]
+    orders = {o.id: o for o in db.query(Order).filter(Order.id.in_(order_ids)).all()}
+    results = {}
+    chain_items = []
+
+    for oid in order_ids:
+        order = orders.get(oid)
+        if order is None:
+            results[oid] = {"order_id": oid, "success": False, "error": "Order not found"}
+        elif order.status not in spec["from"]:
+            results[oid] = {"order_id": oid, "success": False, "error": f"Invalid status {order.status}"}
+        elif action == "cancel":
+            results[oid] = {"order_id": oid, "success": True, "tx_id": None}
+        elif not order.app_id:
+            results[oid] = {"order_id": oid, "success": False, "error": "Order has no escrow app"}
+        elif action == "refund" and (order.escrow_kind not in REFUNDABLE_KINDS or not order.buyer):
+            results[oid] = {"order_id": oid, "success": False,
+                            "error": "Escrow contract has no refund method" if order.buyer else "Order has no buyer"}
+        else:
+            chain_items.append((oid, _build_call(order, action, suggested_params(algod_client))))
+
+    groups = [chain_items[i:i + MAX_GROUP_SIZE] for i in range(0, len(chain_items), MAX_GROUP_SIZE)]
+    if groups:
+        with ThreadPoolExecutor(max_workers=min(PARALLEL_GROUPS, len(groups))) as pool:
+            for group_result in pool.map(lambda g: _run_group(algod_client, g), groups):
+                for oid, (txid, state, err) in group_result.items():
+                    results[oid] = {"order_id": oid, "success": state == "confirmed", "tx_id": txid}
+                    if state == "unknown":
+                        # left to the chain indexer; the DB status is not touched
+                        results[oid]["pending"] = True
+                    if err:
+                        results[oid]["error"] = err
+
+    # one DB transaction for every order that went through; their
+    # order_events rows go out as a single batched insert at flush
+    now = datetime.utcnow()
+    for oid, res in results.items():
+        if not res["success"]:
+            continue
+        order = orders[oid]
+        order.status = spec["to"]
+        order.updated_at = now
+        if res.get("tx_id"):
+            order.tx_id = res["tx_id"]
+        annotate_order(db, order, note=f"bulk {action}")
+        listing_apps.release_listing_app(db, order)
+    db.commit()
+
+    return [results[oid] for oid in order_ids]
@@ -0,0 +1,76 @@
+# backend/helpers/fund_groups.py
+"""
+Server-built, unsigned fund groups for prepare_fund.
+
+The browser used to fetch params from algod and assemble
+[payment -> escrow, app call "fund"] itself. Here the group is built once
+per (order, buyer) from the shared cached suggested params, encoded the way
+wallets expect it (base64 msgpack, group id set) and kept until its
+validity window is about to run out, so repeated prepare_fund calls for
+the same order hand out the same txns without touching algod.
+"""
+import base64
+import os
+import threading
+from collections import OrderedDict
+
+from algosdk import encoding
+
+from backend.smartcontracts.helper import build_unsigned_fund_group
+from backend.smartcontracts.params import suggested_params
+
+FUND_GROUP_CACHE_SIZE = int(os.getenv("FUND_GROUP_CACHE_SIZE", "2048"))
+# rebuild this many rounds before last_valid so the wallet still has time to sign and send
+FUND_GROUP_MARGIN_ROUNDS = int(os.getenv("FUND_GROUP_MARGIN_ROUNDS", "20"))
+
+_lock = threading.Lock()
+_groups = OrderedDict()  # (order_id, buyer, app_id, amount, kind) -> payload
+
+
+def _fund_call_args(order):
+    """(app_args, boxes) of the "fund" call for the order's escrow kind."""
+    if order.escrow_kind == "box":
+        from backend.smartcontracts.escrow_boxes import box_key
+        key = box_key(order.id)
+        return [b"fund", key], [(0, key)]
+    return [b"fund"], None
+
+
+def _build(client, order, buyer: str, params):
+    app_args, boxes = _fund_call_args(order)
+    txns = build_unsigned_fund_group(client, buyer, order.app_id, order.amount,
+                                     app_args=app_args, boxes=boxes, params=params)
+    return {
+        "signer": buyer,
+        "txns": [encoding.msgpack_encode(txn) for txn in txns],
+        "txids": [txn.get_txid() for txn in txns],
+        "group_id": base64.b64encode(txns[0].group).decode(),
+        "first_valid": params.first,
+        "last_valid": params.last,
+    }
+
+
+def fund_group(client, order, buyer: str) -> dict:
+    """Cached unsigned fund group for `order`, paid and signed by `buyer`."""
+    key = (order.id, buyer, order.app_id, order.amount, order.escrow_kind)
+    params = suggested_params(client)  # cached; params.first is the latest round we know of
+    with _lock:
+        payload = _groups.get(key)
+        if payload is not None and params.first + FUND_GROUP_MARGIN_ROUNDS < payload["last_valid"]:
+            _groups.move_to_end(key)
+            return payload
+
+    payload = _build(client, order, buyer, params)
+    with _lock:
+        _groups[key] = payload
+        _groups.move_to_end(key)
+        while len(_groups) > FUND_GROUP_CACHE_SIZE:
+            _groups.popitem(last=False)
+    return payload
+
+
+def forget(order_id: int):
+    """Drop every cached group of an order (e.g. once it is funded)."""
+    with _lock:
+        for key in [k for k in _groups if k[0] == order_id]:
+            del _groups[key]
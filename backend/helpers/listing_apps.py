@@ -0,0 +1,114 @@
+# backend/helpers/listing_apps.py
+"""
+Allocator for re-armable per-listing escrow apps (escrow_reusable.py).
+
+An order for a known Product takes a free ListingApp of that product:
+  - free app already armed for the same amount -> pure DB write
+  - free app armed for another amount          -> one `arm` app call (queued)
+  - no free app                                -> deploy a new listing app (queued)
+The app is handed back with release_listing_app() once the order's funds
+have left the contract (chain release/refund, or cancelled before funding).
+"""
+from datetime import datetime
+
+from backend.db import Order, ListingApp
+from backend.workers import deploy_queue
+from backend.workers.deploy_queue import job_handler, submit_and_confirm
+from algosdk.logic import get_application_address
+
+
+def _claim_free_app(db, product_id: int, seller: str, amount: int, order_id: int):
+    """Lease a free app of this listing, preferring one armed for `amount`."""
+    candidates = (
+        db.query(ListingApp)
+        .filter(ListingApp.product_id == product_id,
+                ListingApp.seller == seller,
+                ListingApp.order_id.is_(None))
+        .order_by((ListingApp.amount != amount), ListingApp.id)
+        .all()
+    )
+    for app in candidates:
+        claimed = (
+            db.query(ListingApp)
+            .filter(ListingApp.id == app.id, ListingApp.order_id.is_(None))
+            .update({"order_id": order_id, "updated_at": datetime.utcnow()}, synchronize_session=False)
+        )
+        if claimed:
+            db.refresh(app)
+            return app
+    return None
+
+
+def allocate(db, order: Order):
+    """
+    Attach a listing app to a flushed (has id) order in the caller's session.
+    Returns the queued DeployJob, or None when the order is ready right away.
+    The caller commits and calls deploy_queue.notify() if a job was returned.
+    """
+    order.escrow_kind = "listing"
+    app = _claim_free_app(db, order.product_id, order.seller, order.amount, order.id)
+    if app is None:
+        order.status = "DEPLOYING"
+        return deploy_queue.enqueue(db, order.id, kind="deploy_listing_app")
+
+    order.app_id = app.app_id
+    order.escrow_address = app.escrow_address
+    if app.amount == order.amount:
+        order.status = "INIT"
+        return None
+    order.status = "DEPLOYING"
+    return deploy_queue.enqueue(db, order.id, kind="arm_listing_app")
+
+
+def release_listing_app(db, order: Order):
+    """Free the order's listing app for the next buyer (caller commits)."""
+    if order.escrow_kind != "listing":
+        return
+    (
+        db.query(ListingApp)
+        .filter(ListingApp.order_id == order.id)
+        .update({"order_id": None, "updated_at": datetime.utcnow()}, synchronize_session=False)
+    )
+
+
+# ==========================================================
+# 🔧 Deploy queue handlers
+# ==========================================================
+def _on_listing_failure(db, job, order):
+    release_listing_app(db, order)
+
+
+@job_handler("deploy_listing_app")
+def _deploy_listing_app(db, job, order):
+    from backend.smartcontracts.deploy_reusable import submit_listing_app
+
+    confirmed = submit_and_confirm(db, job, lambda: submit_listing_app(order.seller, order.amount))
+    app_id = confirmed["application-index"]
+    escrow_address = get_application_address(app_id)
+
+    db.add(ListingApp(
+        product_id=order.product_id,
+        seller=order.seller,
+        app_id=app_id,
+        escrow_address=escrow_address,
+        amount=order.amount,
+        order_id=order.id,
+    ))
+    order.app_id = app_id
+    order.escrow_address = escrow_address
+    order.status = "INIT"
+    order.updated_at = datetime.utcnow()
+
+
+@job_handler("arm_listing_app", on_failure=_on_listing_failure)
+def _arm_listing_app(db, job, order):
+    from backend.smartcontracts.deploy_reusable import submit_arm
+
+    app = db.query(ListingApp).filter(ListingApp.order_id == order.id).first()
+    if app is None:
+        raise RuntimeError(f"No listing app leased to order {order.id}")
+
+    submit_and_confirm(db, job, lambda: submit_arm(app.app_id, order.amount))
+    app.amount = order.amount
+    order.status = "INIT"
+    order.updated_at = datetime.utcnow()
@@ -0,0 +1,66 @@
+# backend/helpers/order_stats.py
+"""
+Dashboard totals read from order_stats (kept current by db.py on every
+order flush), so a summary is a handful of primary-key rows regardless of
+how many orders exist.
+
+    python -m backend.helpers.order_stats rebuild
+"""
+import sys
+
+from backend.db import OrderStat, SessionLocal, rebuild_order_stats
+
+# money currently locked in escrow contracts
+HELD_STATUSES = ("FUNDED", "DELIVERED", "RELEASING")
+# money that reached the seller
+SETTLED_STATUSES = ("RELEASED", "COMPLETED")
+
+
+def _scope_rows(db, scope):
+    return db.query(OrderStat.status, OrderStat.count, OrderStat.amount).filter(OrderStat.scope == scope).all()
+
+
+def summarize(rows):
+    by_status = {status: {"count": count, "amount": amount} for status, count, amount in rows if count}
+    return {
+        "total_orders": sum(s["count"] for s in by_status.values()),
+        "total_amount": sum(s["amount"] for s in by_status.values()),
+        "held_in_escrow": sum(by_status.get(s, {}).get("amount", 0) for s in HELD_STATUSES),
+        "settled_volume": sum(by_status.get(s, {}).get("amount", 0) for s in SETTLED_STATUSES),
+        "by_status": by_status,
+    }
+
+
+def global_stats(db):
+    return summarize(_scope_rows(db, "global"))
+
+
+def seller_stats(db, address):
+    return summarize(_scope_rows(db, f"seller:{address}"))
+
+
+def wallet_stats(db, address):
+    """A wallet's orders as seller and as buyer."""
+    return {
+        "address": address,
+        "as_seller": seller_stats(db, address),
+        "as_buyer": summarize(_scope_rows(db, f"buyer:{address}")),
+    }
+
+
+def rebuild():
+    db = SessionLocal()
+    try:
+        rebuild_order_stats(db)
+        db.commit()
+        return global_stats(db)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["rebuild"]:
+        print("usage: python -m backend.helpers.order_stats rebuild")
+        raise SystemExit(1)
+    totals = rebuild()
+    print(f"✅ order_stats rebuilt: {totals['total_orders']} orders, {totals['held_in_escrow']} microAlgos held")
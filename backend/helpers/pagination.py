@@ -0,0 +1,42 @@
+# backend/helpers/pagination.py
+"""
+Opaque keyset cursors shared by the listing endpoints.
+
+A cursor is the sort key of the last row on a page, e.g. (created_at, id),
+urlsafe-base64 encoded so clients treat it as a token.
+"""
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+
+
+def encode_cursor(*key):
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in key]
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor, *types):
+    """Decode a cursor into a tuple, converting each value with `types`."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(values) != len(types):
+            raise ValueError("wrong cursor arity")
+        return tuple(
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for v, t in zip(values, types)
+        )
+    except Exception:
+        raise HTTPException(400, "Invalid cursor")
+
+
+def parse_date(value, name):
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        raise HTTPException(400, f"Invalid {name}, expected ISO-8601")
+
+
+def clamp_limit(limit, maximum):
+    return max(1, min(limit, maximum))
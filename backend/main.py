@@ -1,14 +1,45 @@
 from fastapi import FastAPI
-from backend.db import init_db
+from fastapi.responses import PlainTextResponse
+from backend import metrics, profiler
+from backend.db import init_db, dispose_async_engines
 from backend.routes import escrow_routes, admin_routes, product_routes
+from backend.smartcontracts.deploy_escrow import warm_programs
+from backend.workers import deploy_queue, chain_indexer, app_sweeper
+from backend.smartcontracts.algod_pool import get_algod_client, close_algod_client
+from backend.smartcontracts.confirmations import stop_trackers
 from fastapi.middleware.cors import CORSMiddleware
+from backend.schemas import OrjsonResponse
 
-app = FastAPI(title="Algo-E-Cart Backend (TestNet Live)", version="3.3")
+app = FastAPI(title="Algo-E-Cart Backend (TestNet Live)", version="3.3", default_response_class=OrjsonResponse)
 
 # ✅ Initialize DB
 @app.on_event("startup")
 def on_startup():
     init_db()
+    # ✅ Compile escrow programs once so the first order doesn't pay for it
+    try:
+        warmed = warm_programs()
+        print(f"🧩 TEAL programs ready: {', '.join(warmed)}")
+    except Exception as e:
+        print(f"⚠️  TEAL warm-up failed, programs will compile on first use: {e}")
+    # ✅ Background escrow deployments (recovers in-flight jobs first)
+    deploy_queue.start_workers()
+    # ✅ Order status follows the chain (fund/deliver/confirm/release/refund)
+    chain_indexer.start_indexer(get_algod_client())
+    # ✅ Delete the escrows of finished orders to reclaim their min balance
+    app_sweeper.start_sweeper()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    deploy_queue.stop_workers()
+    chain_indexer.stop_indexer()
+    app_sweeper.stop_sweeper()
+    stop_trackers()
+    close_algod_client()
+
+@app.on_event("shutdown")
+async def close_async_db():
+    await dispose_async_engines()
 
 # ✅ Enable CORS
 app.add_middleware(
@@ -19,6 +50,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ✅ Request latency per route / status (see backend/metrics.py)
+app.add_middleware(metrics.MetricsMiddleware)
+
+# ✅ Opt-in per-request profiles (PROFILER=1 + X-Profile: <PROFILE_TOKEN> header or PROFILE_SAMPLE_RATE)
+if profiler.PROFILER_ENABLED:
+    app.add_middleware(profiler.ProfilerMiddleware)
+    if not profiler.PROFILE_TOKEN:
+        print("⚠️  PROFILER=1 without PROFILE_TOKEN: X-Profile headers are ignored")
+
 # ✅ Register routers
 app.include_router(escrow_routes.router)
 app.include_router(admin_routes.router)
@@ -26,4 +66,9 @@ app.include_router(product_routes.router) # This is the correct, standard way
 
 @app.get("/")
 def root():
-    return {"message": "Algo-E-Cart Backend running successfully 🚀"}
\ No newline at end of file
+    return {"message": "Algo-E-Cart Backend running successfully 🚀"}
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Request and phase latency histograms in Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
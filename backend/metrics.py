@@ -0,0 +1,192 @@
+# backend/metrics.py
+"""
+Latency metrics in Prometheus text format, served at GET /metrics.
+
+    http_request_duration_seconds{method, route, status}   every HTTP request
+    algocart_phase_duration_seconds{phase, route}          named steps inside it
+    algocart_requests_in_progress
+
+Phases are timed with
+
+    with metrics.phase("sign"):
+        signed = txn.sign(key)
+
+and are labelled with the route template of the request they ran under
+(worker threads report route="background"). Every algod call
+(algod_pool), PyTeal compile, TEAL compile, signing, confirmation wait and
+DB commit is timed this way.
+
+Histograms use fixed buckets and live in memory, one lock for all of them.
+An observation is one bisect plus two additions, so the metrics can stay
+on in production (METRICS=0 turns them off).
+"""
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from backend.db import RoutingSession
+
+METRICS_ENABLED = os.getenv("METRICS", "1") == "1"
+
+# seconds; upper bounds, +Inf is implicit
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUEST_METRIC = "http_request_duration_seconds"
+PHASE_METRIC = "algocart_phase_duration_seconds"
+_HELP = {
+    REQUEST_METRIC: ("HTTP request latency by route template and status code.", ("method", "route", "status")),
+    PHASE_METRIC: ("Time spent in named phases (algod calls, compiles, signing, DB commits).", ("phase", "route")),
+}
+
+_lock = threading.Lock()
+_series = {}  # (metric, label values) -> [per-bucket counts..., +Inf count, sum]
+_in_progress = 0
+
+# the ASGI scope of the request being served (routing fills in scope["route"])
+_request_scope = ContextVar("metrics_request_scope", default=None)
+
+
+def observe(metric: str, labels: tuple, seconds: float):
+    index = bisect_left(BUCKETS, seconds)
+    with _lock:
+        series = _series.get((metric, labels))
+        if series is None:
+            series = _series[(metric, labels)] = [0] * (len(BUCKETS) + 2)
+        series[index] += 1
+        series[-1] += seconds
+
+
+def current_route() -> str:
+    scope = _request_scope.get()
+    if scope is None:
+        return "background"
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+@contextmanager
+def phase(name: str):
+    """Time the enclosed block as `name` under the current request's route."""
+    if not METRICS_ENABLED:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(PHASE_METRIC, (name, current_route()), time.perf_counter() - t0)
+
+
+# ==========================================================
+# 🌐 Request middleware
+# ==========================================================
+class MetricsMiddleware:
+    """Pure ASGI middleware: request latency by method, route template and status."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            return await self.app(scope, receive, send)
+
+        global _in_progress
+        status = 500  # if the app raises before starting a response
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = _request_scope.set(scope)
+        with _lock:
+            _in_progress += 1
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - t0
+            with _lock:
+                _in_progress -= 1
+            observe(REQUEST_METRIC, (scope["method"], current_route(), str(status)), elapsed)
+            _request_scope.reset(token)
+
+
+# ==========================================================
+# 🗄️ DB commits (every RoutingSession, sync and async)
+# ==========================================================
+@event.listens_for(RoutingSession, "before_commit")
+def _commit_started(session):
+    session.info["metrics_commit_t0"] = time.perf_counter()
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _commit_done(session):
+    t0 = session.info.pop("metrics_commit_t0", None)
+    if t0 is not None and METRICS_ENABLED:
+        observe(PHASE_METRIC, ("db_commit", current_route()), time.perf_counter() - t0)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _commit_failed(session):
+    session.info.pop("metrics_commit_t0", None)
+
+
+# ==========================================================
+# 📤 Exposition
+# ==========================================================
+_ID_SEGMENT = re.compile(r"/(?:\d+|[A-Z2-7]{52}|[A-Z2-7]{58})(?=/|$)")
+
+
+def algod_phase(method: str, path: str) -> str:
+    """Phase name for an algod request, with round numbers / txids / addresses collapsed."""
+    return f"algod {method.upper()} {_ID_SEGMENT.sub('/{id}', path)}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names, values, le=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def render() -> str:
+    with _lock:
+        snapshot = {key: list(series) for key, series in _series.items()}
+        in_progress = _in_progress
+
+    lines = []
+    for metric, (help_text, names) in _HELP.items():
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} histogram")
+        for (name, values), series in sorted(snapshot.items()):
+            if name != metric:
+                continue
+            cumulative = 0
+            for bound, count in zip(BUCKETS, series):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_labels(names, values, repr(bound))} {cumulative}")
+            cumulative += series[len(BUCKETS)]
+            lines.append(f"{metric}_bucket{_labels(names, values, '+Inf')} {cumulative}")
+            lines.append(f"{metric}_sum{_labels(names, values)} {series[-1]:.6f}")
+            lines.append(f"{metric}_count{_labels(names, values)} {cumulative}")
+    lines.append("# HELP algocart_requests_in_progress HTTP requests currently being served.")
+    lines.append("# TYPE algocart_requests_in_progress gauge")
+    lines.append(f"algocart_requests_in_progress {in_progress}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _series.clear()
@@ -0,0 +1,244 @@
+# backend/profiler.py
+"""
+On-demand sampling profiler for single requests.
+
+Off unless PROFILER=1. A request is then profiled when it carries
+"X-Profile: <PROFILE_TOKEN>" or is picked by PROFILE_SAMPLE_RATE (0..1).
+Without a PROFILE_TOKEN the header is ignored, so clients cannot make the
+server profile (and write files for) requests of their choosing.
+
+While a request runs, a sampler thread reads its Python stacks every
+PROFILE_INTERVAL_MS and counts them. Only samples that belong to the
+request are kept:
+
+  - the event loop thread, while the request's own task is the running one
+  - threadpool workers running a sync endpoint / dependency for it (anyio
+    runs those inside a copy of the request's context)
+
+Ticks where neither is running count as "[awaiting]" (algod calls, sleeps,
+async DB work on the aiosqlite thread, other requests on the loop), so the
+profile covers the whole wall time.
+
+Telling the two apart relies on private internals, checked against CPython
+3.11 and anyio 4.15.1:
+
+  - asyncio.tasks._current_tasks (loop -> running task). If it is missing,
+    loop-thread samples are dropped (with a warning) rather than charging
+    every request on the loop to the profiled one.
+  - the `context` local of anyio's WorkerThread.run
+    (anyio/_backends/_asyncio.py: `context, func, args, future, cancel_scope
+    = item`). If it is not a Context, worker samples are dropped, with a
+    warning.
+
+Profiles are written to PROFILE_DIR as folded stacks, one
+"frame;frame;frame count" line per distinct stack. flamegraph.pl,
+speedscope and inferno all read that format directly. File names carry
+the timestamp, method and route template. The response's X-Profile-Id
+header names the file, and /api/admin/profiles lists and serves them.
+"""
+import asyncio
+import contextvars
+import hmac
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+
+PROFILER_ENABLED = os.getenv("PROFILER", "0") == "1"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "algocart-profiles"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "200"))  # newest files kept in PROFILE_DIR
+PROFILE_EXT = ".folded"
+
+AWAITING = "[awaiting]"
+
+_active = ContextVar("profiler_session", default=None)
+_current_tasks = getattr(asyncio.tasks, "_current_tasks", None)  # loop -> running task (CPython)
+_ANYIO_WORKER_FILE = os.path.join("anyio", "_backends", "_asyncio.py")
+_warned = set()
+
+
+def _warn_once(key: str, message: str):
+    if key not in _warned:
+        _warned.add(key)
+        print(f"⚠️  Profiler: {message}")
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    if "site-packages" + os.sep in filename:
+        filename = filename.split("site-packages" + os.sep, 1)[1]
+    elif os.sep + "backend" + os.sep in filename:
+        filename = "backend" + os.sep + filename.split(os.sep + "backend" + os.sep, 1)[1]
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _folded(frame) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def _worker_context(frame):
+    """The contextvars.Context an anyio worker thread is running, if any."""
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name == "run" and code.co_filename.endswith(_ANYIO_WORKER_FILE):
+            context = frame.f_locals.get("context")
+            if isinstance(context, contextvars.Context):
+                return context
+            _warn_once("anyio", "anyio's WorkerThread.run has no `context` local; "
+                                "threadpool samples are not recorded")
+            return None
+        frame = frame.f_back
+    return None
+
+
+class _Session(threading.Thread):
+    """Samples the stacks serving one request until stop()."""
+
+    def __init__(self, loop, task):
+        super().__init__(name="request-profiler", daemon=True)
+        self.loop = loop
+        self.task = task
+        self.loop_thread = threading.get_ident()
+        self.samples = Counter()
+        self._done = threading.Event()
+
+    def _sample(self):
+        matched = False
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == self.ident:
+                continue
+            if thread_id == self.loop_thread:
+                if _current_tasks is None or _current_tasks.get(self.loop) is not self.task:
+                    continue
+            else:
+                context = _worker_context(frame)
+                if context is None or context.get(_active) is not self:
+                    continue
+            self.samples[_folded(frame)] += 1
+            matched = True
+        if not matched:
+            self.samples[AWAITING] += 1
+
+    def run(self):
+        while not self._done.wait(PROFILE_INTERVAL):
+            self._sample()
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def _wants_profile(scope) -> bool:
+    for name, value in scope.get("headers", ()):
+        if name == b"x-profile":
+            return bool(PROFILE_TOKEN) and hmac.compare_digest(value, PROFILE_TOKEN.encode())
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def _profile_name(scope, started: datetime) -> str:
+    route = getattr(scope.get("route"), "path", None) or "unmatched"
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+    return f"{started:%Y%m%dT%H%M%S}.{started.microsecond:06d}_{scope['method']}_{slug}{PROFILE_EXT}"
+
+
+def _write(name: str, samples: Counter):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    with open(os.path.join(PROFILE_DIR, name), "w") as f:
+        for stack, count in samples.most_common():
+            f.write(f"{stack} {count}\n")
+    # keep the directory bounded
+    names = sorted(n for n in os.listdir(PROFILE_DIR) if n.endswith(PROFILE_EXT))
+    for old in names[:-PROFILE_KEEP] if PROFILE_KEEP > 0 else ():
+        try:
+            os.remove(os.path.join(PROFILE_DIR, old))
+        except OSError:
+            pass
+
+
+class ProfilerMiddleware:
+    """Pure ASGI middleware; profiles the requests selected by _wants_profile."""
+
+    def __init__(self, app):
+        self.app = app
+        if _current_tasks is None:
+            _warn_once("tasks", "asyncio.tasks._current_tasks is missing; "
+                                "event loop samples are not recorded")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not PROFILER_ENABLED or not _wants_profile(scope):
+            return await self.app(scope, receive, send)
+
+        started = datetime.utcnow()
+        session = _Session(asyncio.get_running_loop(), asyncio.current_task())
+        name = None
+
+        async def send_wrapper(message):
+            nonlocal name
+            if message["type"] == "http.response.start":
+                # routing is done by now, so the name can carry the route template
+                name = _profile_name(scope, started)
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", name.encode())]
+            await send(message)
+
+        token = _active.set(session)
+        session.start()
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session.stop()
+            _active.reset(token)
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+            name = name or _profile_name(scope, started)
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, _write, name, session.samples)
+                print(f"🔬 Profiled {scope['method']} {scope['path']} ({elapsed_ms:.1f} ms, "
+                      f"{sum(session.samples.values())} samples) -> {name}")
+            except OSError as e:
+                print(f"⚠️  Could not write profile {name}: {e}")
+
+
+# ==========================================================
+# 📂 Stored profiles (admin endpoints)
+# ==========================================================
+def list_profiles(limit: int = 100):
+    """Newest first: [{name, bytes, created_at}]."""
+    try:
+        names = sorted((n for n in os.listdir(PROFILE_DIR) if n.endswith(PROFILE_EXT)), reverse=True)
+    except FileNotFoundError:
+        return []
+    profiles = []
+    for name in names[:limit]:
+        try:
+            stat = os.stat(os.path.join(PROFILE_DIR, name))
+        except OSError:
+            continue
+        profiles.append({
+            "name": name,
+            "bytes": stat.st_size,
+            "created_at": datetime.utcfromtimestamp(stat.st_mtime).isoformat() + "Z",
+        })
+    return profiles
+
+
+def profile_path(name: str):
+    """Path of a stored profile, or None for unknown / unsafe names."""
+    if os.path.basename(name) != name or not name.endswith(PROFILE_EXT):
+        return None
+    path = os.path.join(PROFILE_DIR, name)
+    return path if os.path.isfile(path) else None
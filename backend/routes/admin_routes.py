@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, Request
-from backend.db import SessionLocal, Order
+from backend.db import SessionLocal, ReadSessionLocal, AsyncSessionLocal, Order, annotate_order
+from backend.helpers import bulk_actions, order_stats
 from datetime import datetime
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
@@ -30,24 +31,22 @@ async def release_via_admin(request: Request):
     if not escrow_id:
         raise HTTPException(status_code=400, detail="Missing escrow_id")
 
-    db = SessionLocal()
-    try:
-        order = db.query(Order).filter(Order.id == int(escrow_id)).first()
-        if not order:
-            raise HTTPException(status_code=404, detail="Order not found")
-
-        order.status = "COMPLETED"
-        order.updated_at = datetime.utcnow()
-        note = data.get("note")
-        if note:
-            order.tx_id = (order.tx_id or "") + f" | admin_note:{note}"
-        db.commit()
-        return {"success": True, "message": "Released to seller", "order_id": order.id}
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close()
+    async with AsyncSessionLocal(info={"actor": "admin"}) as db:
+        try:
+            order = await db.get(Order, int(escrow_id))
+            if not order:
+                raise HTTPException(status_code=404, detail="Order not found")
+
+            order.status = "COMPLETED"
+            order.updated_at = datetime.utcnow()
+            note = data.get("note")
+            if note:
+                annotate_order(db.sync_session, order, note=note)
+            await db.commit()
+            return {"success": True, "message": "Released to seller", "order_id": order.id}
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/resolve-dispute")
 async def resolve_dispute(request: Request):
@@ -65,29 +64,157 @@ async def resolve_dispute(request: Request):
     if not escrow_id or not resolution:
         raise HTTPException(status_code=400, detail="Missing escrow_id or resolution")
 
-    db = SessionLocal()
+    async with AsyncSessionLocal(info={"actor": "admin"}) as db:
+        try:
+            order = await db.get(Order, int(escrow_id))
+            if not order:
+                raise HTTPException(status_code=404, detail="Order not found")
+
+            if resolution == "COMPLETED":
+                order.status = "COMPLETED"
+            elif resolution == "REFUND":
+                order.status = "REFUNDED"
+            else:
+                raise HTTPException(status_code=400, detail="Invalid resolution")
+
+            order.updated_at = datetime.utcnow()
+            note = data.get("note")
+            annotate_order(db.sync_session, order, note=note or f"dispute resolved: {resolution}")
+            await db.commit()
+            return {"success": True, "message": f"Dispute resolved: {resolution}", "order_id": order.id}
+        except HTTPException:
+            raise
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail=str(e))
+
+MAX_BULK_ORDERS = 5000
+
+@router.post("/bulk")
+def bulk_action(payload: dict):
+    """
+    Bulk settlement:
+    Body: { admin_key: "...", action: "release" | "refund" | "cancel", order_ids: [1, 2, ...] }
+    Chain calls go out in atomic groups of 16; returns one result per order.
+    """
+    if payload.get("admin_key") != ADMIN_SECRET:
+        raise HTTPException(status_code=401, detail="Invalid admin key")
+
+    action = payload.get("action")
+    if action not in bulk_actions.ACTIONS:
+        raise HTTPException(status_code=400, detail=f"Invalid action, expected one of {list(bulk_actions.ACTIONS)}")
     try:
-        order = db.query(Order).filter(Order.id == int(escrow_id)).first()
-        if not order:
-            raise HTTPException(status_code=404, detail="Order not found")
+        order_ids = list(dict.fromkeys(int(i) for i in payload.get("order_ids") or []))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="order_ids must be a list of integers")
+    if not order_ids:
+        raise HTTPException(status_code=400, detail="Missing order_ids")
+    if len(order_ids) > MAX_BULK_ORDERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ORDERS} orders per request")
 
-        if resolution == "COMPLETED":
-            order.status = "COMPLETED"
-        elif resolution == "REFUND":
-            order.status = "REFUNDED"
-        else:
-            raise HTTPException(status_code=400, detail="Invalid resolution")
-
-        order.updated_at = datetime.utcnow()
-        note = data.get("note")
-        if note:
-            order.tx_id = (order.tx_id or "") + f" | dispute_resolved_note:{note}"
-        db.commit()
-        return {"success": True, "message": f"Dispute resolved: {resolution}", "order_id": order.id}
-    except HTTPException:
-        raise
+    from backend.smartcontracts.algod_pool import get_algod_client
+
+    db = SessionLocal(info={"actor": "admin"})
+    try:
+        results = bulk_actions.run_bulk_action(db, get_algod_client(), action, order_ids)
+        succeeded = sum(1 for r in results if r["success"])
+        return {
+            "success": True,
+            "action": action,
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "results": results,
+        }
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         db.close()
+
+@router.post("/chain/backfill")
+def chain_backfill(payload: dict):
+    """
+    Replay a round range through the chain indexer (runs in the background).
+    Body: { admin_key: "...", from_round: 123, to_round: 456 }
+    """
+    if payload.get("admin_key") != ADMIN_SECRET:
+        raise HTTPException(status_code=401, detail="Invalid admin key")
+    try:
+        start, end = int(payload["from_round"]), int(payload["to_round"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="from_round and to_round must be integers")
+    if start < 1 or end < start:
+        raise HTTPException(status_code=400, detail="Invalid round range")
+
+    import threading
+    from backend.workers import chain_indexer
+    from backend.smartcontracts.algod_pool import get_algod_client
+
+    def run():
+        try:
+            n = chain_indexer.backfill(get_algod_client(), start, end)
+            print(f"✅ Backfill {start}-{end} done, {n} order(s) updated")
+        except Exception as e:
+            print(f"❌ Backfill {start}-{end} failed: {e}")
+
+    threading.Thread(target=run, name="chain-backfill", daemon=True).start()
+    return {"success": True, "message": "Backfill started", "from_round": start, "to_round": end}
+
+@router.get("/cache/stats")
+def cache_stats(admin_key: str):
+    """Response cache hit/miss/coalesced/304 counters per namespace."""
+    if admin_key != ADMIN_SECRET:
+        raise HTTPException(status_code=401, detail="Invalid admin key")
+    from backend import cache
+    return {"success": True, "cache": cache.stats()}
+
+@router.get("/stats")
+def admin_stats(admin_key: str):
+    """Dashboard totals: orders and microAlgos per status, held in escrow, settled volume."""
+    if admin_key != ADMIN_SECRET:
+        raise HTTPException(status_code=401, detail="Invalid admin key")
+    db = ReadSessionLocal()
+    try:
+        return {"success": True, "stats": order_stats.global_stats(db)}
+    finally:
+        db.close()
+
+@router.get("/sweeps/stats")
+def sweep_stats(admin_key: str):
+    """Escrows deleted by the app sweeper and the microAlgos they returned, per status."""
+    if admin_key != ADMIN_SECRET:
+        raise HTTPException(status_code=401, detail="Invalid admin key")
+    from backend.workers import app_sweeper
+    db = ReadSessionLocal()
+    try:
+        return {"success": True, "sweeps": app_sweeper.stats(db)}
+    finally:
+        db.close()
+
+@router.get("/profiles")
+def list_profiles(admin_key: str, limit: int = 100):
+    """Recent request profiles (PROFILER=1), newest first."""
+    if admin_key != ADMIN_SECRET:
+        raise HTTPException(status_code=401, detail="Invalid admin key")
+    from backend import profiler
+    return {"success": True, "enabled": profiler.PROFILER_ENABLED,
+            "profiles": profiler.list_profiles(max(1, min(limit, 1000)))}
+
+@router.get("/profiles/{name}")
+def download_profile(name: str, admin_key: str):
+    """One profile as folded stacks (flamegraph.pl / speedscope / inferno input)."""
+    if admin_key != ADMIN_SECRET:
+        raise HTTPException(status_code=401, detail="Invalid admin key")
+    from fastapi.responses import FileResponse
+    from backend import profiler
+    path = profiler.profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain; charset=utf-8", filename=name)
+
+@router.post("/stats/rebuild")
+def rebuild_stats(payload: dict):
+    """Recompute order_stats from the orders table. Body: { admin_key: "..." }"""
+    if payload.get("admin_key") != ADMIN_SECRET:
+        raise HTTPException(status_code=401, detail="Invalid admin key")
+    return {"success": True, "stats": order_stats.rebuild()}
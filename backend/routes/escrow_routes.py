@@ -1,11 +1,23 @@
 import os, traceback, base64
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Depends, Request
+from sqlalchemy import or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from backend.db import SessionLocal, Order
-from backend.smartcontracts.deploy_escrow import deploy_escrow_app
-from backend.smartcontracts.release import release_escrow_funds  # implement (see notes)
-from algosdk.v2client import algod
+from backend.db import (SessionLocal, Order, OrderEvent, DeployJob, Product, get_read_db, get_async_db,
+                        claim_order_status)
+from backend import cache
+from backend.schemas import (
+    OrderPage, OrderEventPage, ORDER_SUMMARY_FIELDS, ORDER_INCLUDES, ORDER_EVENT_FIELDS,
+    fields_for, columns, row_dicts, order_dict,
+)
+from backend.workers import deploy_queue, chain_indexer
+from backend.helpers import listing_apps, order_stats, fund_groups
+from backend.helpers.pagination import encode_cursor, decode_cursor, parse_date, clamp_limit
+from backend.smartcontracts.deploy_escrow import deploy_escrow_apps_batch, MAX_GROUP_SIZE
+from backend.smartcontracts.algod_pool import get_algod_client
+from backend.smartcontracts import algod_async
+from backend.smartcontracts.confirmations import confirmation_state
 from algosdk import logic as algo_logic
 from algosdk import encoding as algo_encoding
 from dotenv import load_dotenv
@@ -13,12 +25,13 @@ from dotenv import load_dotenv
 load_dotenv()
 router = APIRouter(prefix="/api/escrow", tags=["escrow"])
 
-ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS")
-ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
 ADMIN_MNEMONIC = os.getenv("ADMIN_MNEMONIC", "")
 ADMIN_SECRET_KEY = os.getenv("ADMIN_SECRET_KEY", "")
+# "app" = deploy one escrow app per order, "compact" = the same with escrow_compact.py
+# (one global slot, deletable once settled), "box" = one box per order in BOX_ESCROW_APP_ID
+ESCROW_MODE = os.getenv("ESCROW_MODE", "app").lower()
 
-algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
+algod_client = get_algod_client()
 
 def get_db():
     db = SessionLocal()
@@ -28,45 +41,275 @@ def get_db():
         db.close()
 
 def serialize_order(order):
-    data = order.__dict__.copy()
-    data.pop("_sa_instance_state", None)
-    return data
+    return order_dict(order)
 
-@router.get("/status")
-def get_all_orders(db: Session = Depends(get_db)):
-    orders = db.query(Order).order_by(Order.created_at.desc()).all()
-    return {"orders": [serialize_order(o) for o in orders]}
+async def _get_order(db: AsyncSession, order_id):
+    """Order for an id taken from a JSON body; None if missing or not a number."""
+    try:
+        return await db.get(Order, int(order_id))
+    except (TypeError, ValueError):
+        return None
+
+ORDER_PAGE_DEFAULT = 100
+ORDER_PAGE_MAX = int(os.getenv("ORDER_PAGE_MAX", "200"))
+
+@router.get("/status", response_model=OrderPage)
+def get_all_orders(
+    request: Request,
+    status: str = None,
+    seller: str = None,
+    buyer: str = None,
+    wallet: str = None,
+    order_id: int = None,
+    created_from: str = None,
+    created_to: str = None,
+    cursor: str = None,
+    limit: int = ORDER_PAGE_DEFAULT,
+    include: str = None,
+    db: Session = Depends(get_read_db),
+):
+    """
+    Newest-first order listing, keyset-paginated over (created_at, id).
+    status may be a comma-separated list; wallet matches seller or buyer.
+    Pass the returned next_cursor back as ?cursor= for the following page.
+    Large fields are left out unless asked for: include=description,buyer.
+    Served through the response cache (backend/cache.py).
+    """
+    return cache.respond(request, "orders", lambda: list_orders(
+        db, status, seller, buyer, wallet, order_id, created_from, created_to, cursor, limit, include))
+
+def list_orders(db, status, seller, buyer, wallet, order_id, created_from, created_to, cursor, limit, include=None):
+    limit = clamp_limit(limit, ORDER_PAGE_MAX)
+    fields = fields_for(ORDER_SUMMARY_FIELDS, ORDER_INCLUDES, include)
+    query = db.query(*columns(Order, fields))
+    if status:
+        statuses = [s.strip().upper() for s in status.split(",") if s.strip()]
+        query = query.filter(Order.status.in_(statuses))
+    if seller:
+        query = query.filter(Order.seller == seller)
+    if buyer:
+        query = query.filter(Order.buyer == buyer)
+    if wallet:
+        query = query.filter(or_(Order.seller == wallet, Order.buyer == wallet))
+    if order_id is not None:
+        query = query.filter(Order.id == order_id)
+    start, end = parse_date(created_from, "created_from"), parse_date(created_to, "created_to")
+    if start:
+        query = query.filter(Order.created_at >= start)
+    if end:
+        query = query.filter(Order.created_at < end)
+    if cursor:
+        query = query.filter(tuple_(Order.created_at, Order.id) < decode_cursor(cursor, datetime, int))
+
+    # one extra row tells us whether another page exists
+    orders = query.order_by(Order.created_at.desc(), Order.id.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(orders) > limit:
+        orders = orders[:limit]
+        next_cursor = encode_cursor(orders[-1].created_at, orders[-1].id)
+    return {"orders": row_dicts(orders), "next_cursor": next_cursor}
+
+@router.get("/stats/seller/{address}")
+def get_seller_stats(address: str, db: Session = Depends(get_read_db)):
+    """Per-seller totals from order_stats (constant time)."""
+    return {"address": address, "stats": order_stats.seller_stats(db, address)}
+
+@router.get("/stats/wallet/{address}")
+def get_wallet_stats(address: str, db: Session = Depends(get_read_db)):
+    """A wallet's totals as seller and as buyer."""
+    return order_stats.wallet_stats(db, address)
+
+EVENT_PAGE_DEFAULT = 50
+EVENT_PAGE_MAX = 200
+
+@router.get("/orders/{order_id}/events", response_model=OrderEventPage)
+def get_order_events(order_id: int, cursor: str = None, limit: int = EVENT_PAGE_DEFAULT,
+                     db: Session = Depends(get_read_db)):
+    """
+    An order's history, oldest first: creation, every status transition
+    (with txid / round / actor) and admin notes. Keyset-paginated on event id.
+    """
+    limit = clamp_limit(limit, EVENT_PAGE_MAX)
+    query = db.query(*columns(OrderEvent, ORDER_EVENT_FIELDS)).filter(OrderEvent.order_id == order_id)
+    if cursor:
+        (after,) = decode_cursor(cursor, int)
+        query = query.filter(OrderEvent.id > after)
+    events = query.order_by(OrderEvent.id).limit(limit + 1).all()
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        next_cursor = encode_cursor(events[-1].id)
+    return {"events": row_dicts(events), "next_cursor": next_cursor}
 
 @router.post("/create")
 def create_order(payload: dict, db: Session = Depends(get_db)):
     try:
         seller = payload["seller"]
         amount = int(payload["amount"])
-        deploy_res = deploy_escrow_app(seller, amount)
 
+        product_id = payload.get("product_id")
+        if product_id is not None:
+            product = db.query(Product).filter(Product.id == int(product_id)).first()
+            if not product:
+                raise HTTPException(404, "Product not found")
+            if product.seller != seller:
+                raise HTTPException(400, "Seller does not own this product")
+
+        # app deployment runs in the background deploy queue (backend/workers/deploy_queue.py)
         new_order = Order(
             seller=seller,
             product_name=payload.get("product_name"),
             product_description=payload.get("product_description"),
             image_url=payload.get("image_url"),
             amount=amount,
-            app_id=deploy_res["app_id"],
-            escrow_address=deploy_res["escrow_address"],
-            status="INIT",
+            product_id=int(product_id) if product_id is not None else None,
+            escrow_kind="app",
+            status="DEPLOYING",
             created_at=datetime.utcnow(),
             updated_at=datetime.utcnow(),
         )
         db.add(new_order)
+        db.flush()
+        if product_id is not None:
+            # listing orders reuse the product's escrow app when one is free
+            job = listing_apps.allocate(db, new_order)
+        elif ESCROW_MODE == "box":
+            # no deployment: one box-creating call on the shared box escrow app
+            from backend.smartcontracts.deploy_boxes import BOX_ESCROW_APP_ID
+            if not BOX_ESCROW_APP_ID:
+                raise HTTPException(500, "ESCROW_MODE=box requires BOX_ESCROW_APP_ID")
+            new_order.escrow_kind = "box"
+            new_order.app_id = BOX_ESCROW_APP_ID
+            new_order.escrow_address = algo_logic.get_application_address(BOX_ESCROW_APP_ID)
+            job = deploy_queue.enqueue(db, new_order.id, kind="open_box")
+        elif ESCROW_MODE == "compact":
+            new_order.escrow_kind = "compact"
+            job = deploy_queue.enqueue(db, new_order.id, kind="deploy_compact")
+        else:
+            job = deploy_queue.enqueue(db, new_order.id)
         db.commit()
+        if job is not None:
+            deploy_queue.notify()
+        else:
+            chain_indexer.index.mark_dirty()
         db.refresh(new_order)
-        return {"message": "created", "order": serialize_order(new_order)}
+        return {"message": "created", "order": serialize_order(new_order), "job_id": job.id if job else None}
+    except HTTPException:
+        raise
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(500, str(e))
+
+MAX_BATCH_ROWS = int(os.getenv("MAX_BATCH_ROWS", "1024"))
+
+@router.post("/create_batch")
+def create_order_batch(payload: dict, db: Session = Depends(get_db)):
+    """
+    Bulk listing: deploys one escrow app per row in atomic groups.
+    Body: { orders: [{seller, amount, product_name, product_description?, image_url?}, ...],
+            group_size?: 16, pipeline_depth?: 4 }
+    """
+    rows = payload.get("orders") or []
+    if not rows:
+        raise HTTPException(400, "No orders supplied")
+    if len(rows) > MAX_BATCH_ROWS:
+        raise HTTPException(400, f"At most {MAX_BATCH_ROWS} orders per batch")
+
+    results = [None] * len(rows)
+    valid = []
+    for i, row in enumerate(rows):
+        try:
+            seller = row["seller"]
+            amount = int(row["amount"])
+            if not row.get("product_name") or amount <= 0:
+                raise ValueError("product_name and a positive amount are required")
+            algo_encoding.decode_address(seller)
+            valid.append(i)
+        except Exception as e:
+            results[i] = {"index": i, "success": False, "error": f"Invalid row: {e}"}
+
+    try:
+        group_size = max(1, min(int(payload.get("group_size") or MAX_GROUP_SIZE), MAX_GROUP_SIZE))
+        pipeline_depth = max(1, int(payload.get("pipeline_depth") or 4))
+    except (TypeError, ValueError):
+        raise HTTPException(400, "group_size and pipeline_depth must be integers")
+
+    try:
+        deployed = deploy_escrow_apps_batch(
+            [(rows[i]["seller"], int(rows[i]["amount"])) for i in valid],
+            group_size=group_size,
+            pipeline_depth=pipeline_depth,
+        )
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(500, str(e))
 
+    now = datetime.utcnow()
+    new_orders = []
+    for i, res in zip(valid, deployed):
+        if "error" in res and not res.get("pending"):
+            results[i] = {"index": i, "success": False, "error": res["error"]}
+            continue
+        row = rows[i]
+        order = Order(
+            escrow_kind="app",
+            seller=row["seller"],
+            product_name=row.get("product_name"),
+            product_description=row.get("product_description"),
+            image_url=row.get("image_url"),
+            amount=int(row["amount"]),
+            app_id=res.get("app_id"),
+            escrow_address=res.get("escrow_address"),
+            # unconfirmed creates go to the deploy queue, which confirms the
+            # submitted txid (or redeploys if it was dropped)
+            status="DEPLOYING" if res.get("pending") else "INIT",
+            created_at=now,
+            updated_at=now,
+        )
+        new_orders.append((i, order, res))
+
+    # one multi-row INSERT for the whole batch
+    db.add_all([o for _, o, _ in new_orders])
+    jobs = {}
+    if any(res.get("pending") for _, _, res in new_orders):
+        db.flush()
+        for i, order, res in new_orders:
+            if res.get("pending"):
+                jobs[i] = deploy_queue.enqueue(db, order.id)
+                jobs[i].tx_id = res["tx_id"]
+    db.commit()
+    chain_indexer.index.mark_dirty()
+    if jobs:
+        deploy_queue.notify()
+    for i, order, res in new_orders:
+        results[i] = {"index": i, "success": True, "order_id": order.id,
+                      "app_id": order.app_id, "escrow_address": order.escrow_address}
+        if i in jobs:
+            results[i].update({"pending": True, "job_id": jobs[i].id, "tx_id": res["tx_id"]})
+
+    return {
+        "message": "batch processed",
+        "created": len(new_orders),
+        "failed": len(rows) - len(new_orders),
+        "results": results,
+    }
+
+@router.get("/jobs/{job_id}")
+def get_job_status(job_id: int, db: Session = Depends(get_read_db)):
+    job = db.query(DeployJob).filter(DeployJob.id == job_id).first()
+    if not job:
+        raise HTTPException(404, "Job not found")
+    order = db.query(Order).filter(Order.id == job.order_id).first()
+    return {
+        "job": deploy_queue.serialize_job(job),
+        "order_status": order.status if order else None,
+        "app_id": order.app_id if order else None,
+        "escrow_address": order.escrow_address if order else None,
+    }
+
 @router.post("/update_buyer/{order_id}")
-async def update_buyer(order_id: int, buyer: dict, db: Session = Depends(get_db)):
-    order = db.query(Order).filter(Order.id == order_id).first()
+async def update_buyer(order_id: int, buyer: dict, db: AsyncSession = Depends(get_async_db)):
+    order = await db.get(Order, order_id)
     if not order:
         raise HTTPException(404, "Order not found")
     if order.status != "INIT":
@@ -76,15 +319,28 @@ async def update_buyer(order_id: int, buyer: dict, db: Session = Depends(get_db)
     order.buyer_email = buyer.get("buyer_email")
     order.buyer_address = buyer.get("buyer_address")
     order.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(order)
+    await db.commit()
     return {"message": "buyer saved", "order": serialize_order(order)}
 
 @router.get("/prepare_fund/{order_id}")
-def prepare_fund(order_id: int, db: Session = Depends(get_db)):
+def prepare_fund(order_id: int, txns: bool = False, buyer: str = None, db: Session = Depends(get_read_db)):
+    """
+    Funding info for an order. With ?txns=1 the response also carries
+    "fund_group": the unsigned [payment, app call "fund"] group for `buyer`
+    (default: the order's buyer wallet), base64 msgpack with the group id
+    set, ready for the wallet to sign and /api/algod/broadcast to send.
+    """
     order = db.query(Order).filter(Order.id == order_id).first()
     if not order:
         raise HTTPException(404, "Order not found")
+    if not order.app_id:
+        raise HTTPException(409, f"Escrow not deployed yet (status {order.status})")
+    if txns:
+        buyer = buyer or order.buyer
+        if not buyer or not algo_encoding.is_valid_address(buyer):
+            raise HTTPException(400, "A valid buyer address is required to build the fund group")
+        if order.status != "INIT":
+            raise HTTPException(409, f"Order cannot be funded (status {order.status})")
 
     # validate stored address; if missing compute from app_id and persist
     try:
@@ -100,67 +356,154 @@ def prepare_fund(order_id: int, db: Session = Depends(get_db)):
                 except Exception:
                     valid = False
         if not valid:
+            # derived from app_id; persisted through a short write session
+            # (this route reads from the read-only session)
             escrow_addr = algo_logic.get_application_address(order.app_id)
-            order.escrow_address = escrow_addr
-            order.updated_at = datetime.utcnow()
-            db.commit(); db.refresh(order)
+            write_db = SessionLocal()
+            try:
+                write_db.query(Order).filter(Order.id == order.id, Order.app_id == order.app_id).update(
+                    {"escrow_address": escrow_addr, "updated_at": datetime.utcnow()}, synchronize_session=False
+                )
+                write_db.commit()
+            finally:
+                write_db.close()
 
-        return {
+        res = {
             "app_id": order.app_id,
             "escrow_address": escrow_addr,
             "amount_micro": order.amount,
         }
+        if order.escrow_kind == "box":
+            # box orders: fund call args are [b"fund", box_key] and must reference the box
+            from backend.smartcontracts.escrow_boxes import box_key
+            res["escrow_kind"] = "box"
+            res["box_key"] = base64.b64encode(box_key(order.id)).decode()
+        if txns:
+            res["fund_group"] = fund_groups.fund_group(algod_client, order, buyer)
+        return res
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(500, str(e))
 
 @router.post("/fund/verify")
-async def verify_funding(request: Request, db: Session = Depends(get_db)):
+async def verify_funding(request: Request, db: AsyncSession = Depends(get_async_db)):
     data = await request.json()
     order_id = data.get("order_id") or data.get("id")
     tx_id = data.get("tx_id")
     if not order_id or not tx_id:
         raise HTTPException(400, "Missing order id or tx_id")
-    order = db.query(Order).filter(Order.id == int(order_id)).first()
+    order = await _get_order(db, order_id)
     if not order:
         raise HTTPException(404, "Order not found")
+    if chain_indexer.CHAIN_INDEXER_ENABLED:
+        # status comes from the chain indexer once the fund call is in a block;
+        # the client-reported txid is only kept as a hint until then
+        if order.status == "FUNDED":
+            return {"message": "verified", "order": serialize_order(order)}
+        if order.status == "INIT":
+            order.tx_id = tx_id
+            order.updated_at = datetime.utcnow()
+            await db.commit()
+        return {"message": "pending", "detail": "Awaiting on-chain confirmation", "order": serialize_order(order)}
     order.tx_id = tx_id
     order.status = "FUNDED"
     order.updated_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
+    fund_groups.forget(order.id)
     return {"message": "verified", "order": serialize_order(order)}
 
 @router.post("/admin/release")
-async def admin_release(request: Request, db: Session = Depends(get_db)):
+async def admin_release(request: Request, db: AsyncSession = Depends(get_async_db)):
     data = await request.json()
     admin_key = data.get("admin_key")
     order_id = data.get("order_id")
     if admin_key != ADMIN_SECRET_KEY:
         raise HTTPException(401, "Invalid admin key")
-    order = db.query(Order).filter(Order.id == order_id).first()
+    order = await _get_order(db, order_id)
     if not order:
         raise HTTPException(404, "Order not found")
     if order.status != "FUNDED":
         raise HTTPException(400, "Order not funded")
+    # claim the order (FUNDED -> RELEASING) so concurrent releases can't both send;
+    # committing also ends the transaction, so no connection is held across the chain wait
+    claimed = await db.run_sync(lambda sync_db: claim_order_status(sync_db, order, "FUNDED", "RELEASING"))
+    await db.commit()
+    if not claimed:
+        raise HTTPException(409, "Order is already being released")
+
     try:
-        # you must implement release_escrow_funds to call app 'release'
-        txid = release_escrow_funds(algod_client, order.app_id, order.seller)
-        order.status = "RELEASED"
-        order.tx_id = txid
-        order.updated_at = datetime.utcnow()
-        db.commit()
-        return {"message": "released", "tx_id": txid}
+        # chain call runs off the event loop; the confirmation wait holds no thread
+        txid = await algod_async.submit_order_release(algod_client, order)
     except Exception as e:
+        # nothing was sent: hand the order back
         traceback.print_exc()
+        await _unclaim_release(db, order)
         raise HTTPException(500, str(e))
+    try:
+        await algod_async.wait_for_confirmation(algod_client, txid, 4)
+    except Exception as e:
+        state, info = await algod_async.run_chain(confirmation_state, algod_client, txid)
+        if state == "rejected":
+            await _unclaim_release(db, order)
+            raise HTTPException(500, f"Release rejected: {info['pool-error']}")
+        if state != "confirmed":
+            # may still land: stay RELEASING and never resend; the chain indexer
+            # or /admin/release/recheck finishes it
+            order.tx_id = txid
+            await db.commit()
+            return {"message": "pending", "detail": f"Release not confirmed yet: {e}", "tx_id": txid}
+    return await _finish_release(db, order, txid)
+
+
+@router.post("/admin/release/recheck")
+async def admin_release_recheck(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Settle an order left RELEASING by a release whose confirmation wait failed,
+    from what algod knows about its txid: confirmed -> RELEASED, rejected ->
+    FUNDED again, still in the pool -> unchanged. Nothing is resent.
+    """
+    data = await request.json()
+    if data.get("admin_key") != ADMIN_SECRET_KEY:
+        raise HTTPException(401, "Invalid admin key")
+    order = await _get_order(db, data.get("order_id"))
+    if not order:
+        raise HTTPException(404, "Order not found")
+    if order.status != "RELEASING" or not order.tx_id:
+        raise HTTPException(400, f"No release awaiting confirmation (status {order.status})")
+    txid = order.tx_id
+    state, info = await algod_async.run_chain(confirmation_state, algod_client, txid)
+    if state == "confirmed":
+        return await _finish_release(db, order, txid)
+    if state == "rejected":
+        await _unclaim_release(db, order)
+        return {"message": "rejected", "detail": info["pool-error"], "tx_id": txid}
+    if "error" in info:
+        # algod no longer knows the txid: it either expired or confirmed too long ago to tell
+        raise HTTPException(409, f"algod has no record of {txid}; replay the rounds since it was sent "
+                                 "with python -m backend.workers.chain_indexer backfill <from> <to>")
+    return {"message": "pending", "detail": "Release still in the transaction pool", "tx_id": txid}
+
+
+async def _finish_release(db: AsyncSession, order, txid: str):
+    order.status = "RELEASED"
+    order.tx_id = txid
+    order.updated_at = datetime.utcnow()
+    await db.run_sync(lambda sync_db: listing_apps.release_listing_app(sync_db, order))
+    await db.commit()
+    return {"message": "released", "tx_id": txid}
+
+
+async def _unclaim_release(db: AsyncSession, order):
+    await db.run_sync(lambda sync_db: claim_order_status(sync_db, order, "RELEASING", "FUNDED"))
+    await db.commit()
 
 @router.post("/cancel/{order_id}")
-async def cancel_order(order_id: int, request: Request, db: Session = Depends(get_db)):
+async def cancel_order(order_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     data = await request.json()
     admin_key = data.get("admin_key")
     if admin_key != ADMIN_SECRET_KEY:
         raise HTTPException(401, "Invalid admin key")
-    order = db.query(Order).filter(Order.id == order_id).first()
+    order = await db.get(Order, order_id)
     if not order:
         raise HTTPException(404, "Order not found")
     # buyer cancel allowed only before funding
@@ -168,5 +511,6 @@ async def cancel_order(order_id: int, request: Request, db: Session = Depends(ge
         raise HTTPException(400, "Cannot cancel, already funded or released")
     order.status = "CANCELLED"
     order.updated_at = datetime.utcnow()
-    db.commit()
+    await db.run_sync(lambda sync_db: listing_apps.release_listing_app(sync_db, order))
+    await db.commit()
     return {"message": "cancelled"}
@@ -1,8 +1,15 @@
 print("--- LOADING PRODUCT_ROUTES FILE (v2) ---")
 
-from fastapi import APIRouter, Depends, HTTPException
+import os
+import re
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import text, tuple_
 from sqlalchemy.orm import Session
-from backend.db import SessionLocal, Product
+from backend.db import SessionLocal, Product, get_read_db
+from backend import cache
+from backend.schemas import ProductPage, PRODUCT_SUMMARY_FIELDS, PRODUCT_INCLUDES, fields_for, columns, row_dicts, product_dict
+from backend.helpers.pagination import encode_cursor, decode_cursor, clamp_limit
 
 router = APIRouter(prefix="/api/products", tags=["Products"])
 
@@ -34,10 +41,120 @@ def create_product(
     db.add(new_product)
     db.commit()
     db.refresh(new_product)
-    return {"message": "✅ Product created successfully", "product": new_product}
+    return {"message": "✅ Product created successfully", "product": product_dict(new_product)}
 
-@router.get("/list")
-def list_products(db: Session = Depends(get_db)):
-    """Get all marketplace listings."""
-    products = db.query(Product).order_by(Product.created_at.desc()).all()
-    return {"products": products}
+PRODUCT_PAGE_DEFAULT = 50
+PRODUCT_PAGE_MAX = int(os.getenv("PRODUCT_PAGE_MAX", "200"))
+
+def filter_products(query, seller=None, min_price=None, max_price=None):
+    if seller:
+        query = query.filter(Product.seller == seller)
+    if min_price is not None:
+        query = query.filter(Product.price >= min_price)
+    if max_price is not None:
+        query = query.filter(Product.price <= max_price)
+    return query
+
+@router.get("/list", response_model=ProductPage)
+def list_products(
+    request: Request,
+    seller: str = None,
+    min_price: float = None,
+    max_price: float = None,
+    cursor: str = None,
+    limit: int = PRODUCT_PAGE_DEFAULT,
+    include: str = None,
+    db: Session = Depends(get_read_db),
+):
+    """
+    Newest-first marketplace listings, keyset-paginated over (created_at, id).
+    description is left out unless asked for with include=description.
+    """
+    return cache.respond(request, "products", lambda: product_page(
+        db, seller, min_price, max_price, cursor, limit, include))
+
+def product_page(db, seller, min_price, max_price, cursor, limit, include=None):
+    limit = clamp_limit(limit, PRODUCT_PAGE_MAX)
+    fields = fields_for(PRODUCT_SUMMARY_FIELDS, PRODUCT_INCLUDES, include)
+    query = filter_products(db.query(*columns(Product, fields)), seller, min_price, max_price)
+    if cursor:
+        query = query.filter(tuple_(Product.created_at, Product.id) < decode_cursor(cursor, datetime, int))
+    products = query.order_by(Product.created_at.desc(), Product.id.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(products) > limit:
+        products = products[:limit]
+        next_cursor = encode_cursor(products[-1].created_at, products[-1].id)
+    return {"products": row_dicts(products), "next_cursor": next_cursor}
+
+def fts_query(q):
+    """User text -> FTS5 query: every term must match, last one as a prefix."""
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return None
+    quoted = [f'"{t}"' for t in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+@router.get("/search", response_model=ProductPage)
+def search_products(
+    request: Request,
+    q: str,
+    seller: str = None,
+    min_price: float = None,
+    max_price: float = None,
+    cursor: str = None,
+    limit: int = PRODUCT_PAGE_DEFAULT,
+    include: str = None,
+    db: Session = Depends(get_read_db),
+):
+    """
+    Ranked full-text search over product name/description (products_fts).
+    Results are ordered by bm25 score; next_cursor continues from the last hit.
+    """
+    return cache.respond(request, "products", lambda: search_page(
+        db, q, seller, min_price, max_price, cursor, limit, include))
+
+def search_page(db, q, seller, min_price, max_price, cursor, limit, include=None):
+    match = fts_query(q)
+    if match is None:
+        raise HTTPException(400, "Empty search query")
+    limit = clamp_limit(limit, PRODUCT_PAGE_MAX)
+    fields = fields_for(PRODUCT_SUMMARY_FIELDS, PRODUCT_INCLUDES, include)
+
+    # rank/rowid of matching products, best first; filters run against products
+    where = ["products_fts MATCH :match"]
+    params = {"match": match, "limit": limit + 1}
+    if seller:
+        where.append("p.seller = :seller")
+        params["seller"] = seller
+    if min_price is not None:
+        where.append("p.price >= :min_price")
+        params["min_price"] = min_price
+    if max_price is not None:
+        where.append("p.price <= :max_price")
+        params["max_price"] = max_price
+    if cursor:
+        params["after_rank"], params["after_id"] = decode_cursor(cursor, float, int)
+        where.append("(products_fts.rank > :after_rank OR (products_fts.rank = :after_rank AND p.id > :after_id))")
+    # products_fts.rank is bm25 weighted towards name (see db.PRODUCT_SEARCH_RANK)
+    sql = f"""
+        SELECT p.id, products_fts.rank AS score
+        FROM products_fts JOIN products p ON p.id = products_fts.rowid
+        WHERE {" AND ".join(where)}
+        ORDER BY products_fts.rank, p.id
+        LIMIT :limit
+    """
+    hits = db.execute(text(sql), params).all()
+
+    next_cursor = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        next_cursor = encode_cursor(hits[-1].score, hits[-1].id)
+    rows = db.query(*columns(Product, fields)).filter(Product.id.in_([h.id for h in hits])).all()
+    by_id = {row.id: dict(row._mapping) for row in rows}
+    results = []
+    for hit in hits:
+        data = by_id[hit.id]
+        data["score"] = -hit.score  # bm25 is lower-is-better; expose higher-is-better
+        results.append(data)
+    return {"products": results, "next_cursor": next_cursor}
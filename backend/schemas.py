@@ -0,0 +1,148 @@
+# backend/schemas.py
+"""
+Response models for orders and products.
+
+List endpoints select only the *_SUMMARY columns and emit plain dicts
+straight from the result rows (no ORM objects, no __dict__ copies); the
+large text fields are opt-in with ?include=. The Pydantic models are the
+documented shapes (response_model); the field tuples below derive from them.
+"""
+from datetime import datetime
+from typing import List, Optional
+
+import orjson
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict
+
+
+class OrjsonResponse(JSONResponse):
+    """Default response class: orjson encoding, falling back for non-native types."""
+
+    def render(self, content) -> bytes:
+        try:
+            return orjson.dumps(content)
+        except TypeError:
+            return orjson.dumps(jsonable_encoder(content))
+
+
+# ==========================================================
+# 🧾 Orders
+# ==========================================================
+class OrderSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    seller: str
+    buyer: Optional[str] = None
+    product_name: str
+    image_url: Optional[str] = None
+    amount: int
+    status: Optional[str] = None
+    escrow_kind: Optional[str] = None
+    app_id: Optional[int] = None
+    escrow_address: Optional[str] = None
+    product_id: Optional[int] = None
+    tx_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    # deferred in lists, see ORDER_INCLUDES
+    product_description: Optional[str] = None
+    buyer_name: Optional[str] = None
+    buyer_email: Optional[str] = None
+    buyer_address: Optional[str] = None
+
+
+class OrderPage(BaseModel):
+    orders: List[OrderSummary]
+    next_cursor: Optional[str] = None
+
+
+ORDER_DETAIL_FIELDS = tuple(OrderSummary.model_fields)
+ORDER_INCLUDES = {
+    "description": ("product_description",),
+    "buyer": ("buyer_name", "buyer_email", "buyer_address"),
+}
+ORDER_SUMMARY_FIELDS = tuple(
+    f for f in ORDER_DETAIL_FIELDS if not any(f in group for group in ORDER_INCLUDES.values())
+)
+
+
+class OrderEventOut(BaseModel):
+    id: int
+    order_id: int
+    kind: str
+    from_status: Optional[str] = None
+    to_status: Optional[str] = None
+    tx_id: Optional[str] = None
+    round: Optional[int] = None
+    actor: Optional[str] = None
+    note: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class OrderEventPage(BaseModel):
+    events: List[OrderEventOut]
+    next_cursor: Optional[str] = None
+
+
+ORDER_EVENT_FIELDS = tuple(OrderEventOut.model_fields)
+
+
+# ==========================================================
+# 🛍️ Products
+# ==========================================================
+class ProductSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    price: float
+    seller: str
+    image: Optional[str] = None
+    created_at: Optional[datetime] = None
+    description: Optional[str] = None  # deferred in lists
+    score: Optional[float] = None      # search results only
+
+
+class ProductPage(BaseModel):
+    products: List[ProductSummary]
+    next_cursor: Optional[str] = None
+
+
+PRODUCT_DETAIL_FIELDS = ("id", "name", "description", "price", "seller", "image", "created_at")
+PRODUCT_INCLUDES = {"description": ("description",)}
+PRODUCT_SUMMARY_FIELDS = ("id", "name", "price", "seller", "image", "created_at")
+
+
+# ==========================================================
+# 🔧 Projection helpers
+# ==========================================================
+def fields_for(summary, includes, include: Optional[str]):
+    """Summary columns plus any ?include=a,b groups."""
+    fields = list(summary)
+    for name in filter(None, (include or "").split(",")):
+        group = includes.get(name.strip())
+        if group is None:
+            raise HTTPException(400, f"Unknown include '{name}', expected one of {sorted(includes)}")
+        fields.extend(f for f in group if f not in fields)
+    return fields
+
+
+def columns(model, fields):
+    return [getattr(model, f) for f in fields]
+
+
+def row_dicts(rows):
+    return [dict(row._mapping) for row in rows]
+
+
+def order_dict(order):
+    """Full order from an ORM instance, for single-order responses."""
+    return {f: getattr(order, f) for f in ORDER_DETAIL_FIELDS}
+
+
+def product_dict(product):
+    return {f: getattr(product, f) for f in PRODUCT_DETAIL_FIELDS}
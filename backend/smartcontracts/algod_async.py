@@ -0,0 +1,57 @@
+# backend/smartcontracts/algod_async.py
+"""
+Async chain operations for async routes.
+
+The short blocking parts (suggested params, signing, POSTing a txn) run on
+a dedicated worker-thread limiter (CHAIN_THREADS), separate from the pool
+FastAPI uses for sync routes, so a burst of chain calls can't starve reads.
+The long part, waiting for confirmation, holds no thread at all: it awaits
+the shared ConfirmationTracker's future for the txid.
+
+    txid = await algod_async.submit_order_release(client, order)
+    await algod_async.wait_for_confirmation(client, txid)
+"""
+import asyncio
+import functools
+import os
+
+import anyio
+
+from backend import metrics
+from backend.smartcontracts.confirmations import get_tracker, SECONDS_PER_ROUND_MAX
+
+CHAIN_THREADS = int(os.getenv("CHAIN_THREADS", "64"))
+
+_limiter = None
+
+
+def _get_limiter():
+    # created lazily: anyio limiters bind to the running event loop's backend
+    global _limiter
+    if _limiter is None:
+        _limiter = anyio.CapacityLimiter(CHAIN_THREADS)
+    return _limiter
+
+
+async def run_chain(fn, *args, **kwargs):
+    """Run a blocking algod/SDK call off the event loop."""
+    return await anyio.to_thread.run_sync(functools.partial(fn, *args, **kwargs), limiter=_get_limiter())
+
+
+async def wait_for_confirmation(client, txid: str, wait_rounds: int = 4):
+    """Async counterpart of confirmations.wait_for_confirmation."""
+    future = get_tracker(client).register(txid, wait_rounds)
+    with metrics.phase("wait_confirmation"):
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=(wait_rounds + 2) * SECONDS_PER_ROUND_MAX)
+
+
+async def submit_order_release(client, order) -> str:
+    """Send the admin "release" call for the order's escrow kind. Returns the txid without waiting."""
+    if order.escrow_kind == "box":
+        from backend.smartcontracts.deploy_boxes import submit_box_release
+        return await run_chain(submit_box_release, order.app_id, order.id, order.seller)
+    if order.escrow_kind == "compact":
+        from backend.smartcontracts.deploy_compact import submit_compact_release
+        return await run_chain(submit_compact_release, order.app_id, order.seller)
+    from backend.smartcontracts.release import submit_release
+    return await run_chain(submit_release, client, order.app_id, order.seller)
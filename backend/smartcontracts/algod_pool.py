@@ -0,0 +1,175 @@
+# backend/smartcontracts/algod_pool.py
+"""
+Single shared algod client for the whole backend.
+
+PooledAlgodClient is a drop-in AlgodClient whose requests go through one
+keep-alive httpx connection pool instead of a fresh urllib connection (and
+TLS handshake) per call. It adds:
+  - per-call timeouts (ALGOD_TIMEOUT, overridable with timeout=...)
+  - retries with full jitter on transient failures
+  - a cap on concurrent in-flight requests (ALGOD_MAX_IN_FLIGHT)
+
+Use get_algod_client() everywhere instead of constructing AlgodClient.
+"""
+import os
+import json
+import random
+import threading
+import time
+from urllib import parse
+
+import httpx
+from algosdk import constants, error
+from algosdk.v2client import algod
+from dotenv import load_dotenv
+
+from backend import metrics
+
+load_dotenv()
+
+ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS") or os.getenv("ALGOD_URL") or "https://testnet-api.algonode.cloud"
+ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
+ALGOD_TIMEOUT = float(os.getenv("ALGOD_TIMEOUT", "10"))           # seconds per request
+ALGOD_RETRIES = int(os.getenv("ALGOD_RETRIES", "3"))
+ALGOD_RETRY_BASE = float(os.getenv("ALGOD_RETRY_BASE", "0.2"))    # seconds
+ALGOD_POOL_SIZE = int(os.getenv("ALGOD_POOL_SIZE", "20"))
+ALGOD_MAX_IN_FLIGHT = int(os.getenv("ALGOD_MAX_IN_FLIGHT", "32"))
+
+# retried for any method: the request never reached algod
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# retried for reads only: a POST may already have been applied
+_READ_ERRORS = (httpx.ReadTimeout, httpx.ReadError, httpx.RemoteProtocolError, httpx.WriteError)
+_RETRY_STATUS = {429, 502, 503, 504}
+
+
+class PooledAlgodClient(algod.AlgodClient):
+    def __init__(
+        self,
+        algod_token: str,
+        algod_address: str,
+        headers=None,
+        timeout: float = ALGOD_TIMEOUT,
+        retries: int = ALGOD_RETRIES,
+        pool_size: int = ALGOD_POOL_SIZE,
+        max_in_flight: int = ALGOD_MAX_IN_FLIGHT,
+    ):
+        super().__init__(algod_token, algod_address, headers)
+        self.timeout = timeout
+        self.retries = retries
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._http = httpx.Client(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=60,
+            ),
+        )
+
+    def _sleep_before_retry(self, attempt: int):
+        # full jitter: uniform(0, base * 2^attempt)
+        time.sleep(random.uniform(0, ALGOD_RETRY_BASE * (2 ** attempt)))
+
+    def algod_request(
+        self,
+        method,
+        requrl,
+        params=None,
+        data=None,
+        headers=None,
+        response_format="json",
+        timeout=None,
+    ):
+        header = {"User-Agent": "py-algorand-sdk"}
+        if self.headers:
+            header.update(self.headers)
+        if headers:
+            header.update(headers)
+        if requrl not in constants.no_auth:
+            header.update({constants.algod_auth_header: self.algod_token})
+
+        if requrl not in constants.unversioned_paths:
+            requrl = algod.api_version_path_prefix + requrl
+        phase = metrics.algod_phase(method, requrl)
+        if params:
+            requrl = requrl + "?" + parse.urlencode(params)
+
+        with metrics.phase(phase):
+            return self._request_with_retries(method, requrl, header, data, response_format, timeout)
+
+    def _request_with_retries(self, method, requrl, header, data, response_format, timeout):
+        is_read = method.upper() == "GET"
+        attempt = 0
+        while True:
+            try:
+                with self._slots:
+                    resp = self._http.request(
+                        method,
+                        self.algod_address + requrl,
+                        headers=header,
+                        content=data,
+                        timeout=timeout or self.timeout,
+                    )
+            except _CONNECT_ERRORS as e:
+                if attempt >= self.retries:
+                    raise error.AlgodRequestError(f"algod unreachable: {e}") from e
+            except _READ_ERRORS as e:
+                if not is_read or attempt >= self.retries:
+                    raise error.AlgodRequestError(f"algod request failed: {e}") from e
+            else:
+                if resp.status_code in _RETRY_STATUS and attempt < self.retries and (is_read or resp.status_code == 429):
+                    pass  # fall through to retry
+                elif resp.status_code >= 400:
+                    self._raise_http_error(resp)
+                else:
+                    return self._parse(resp, response_format)
+            self._sleep_before_retry(attempt)
+            attempt += 1
+
+    @staticmethod
+    def _raise_http_error(resp):
+        message, data = resp.text, None
+        try:
+            body = resp.json()
+            message = body.get("message", message)
+            data = body.get("data")
+        except (ValueError, AttributeError):
+            pass
+        raise error.AlgodHTTPError(message, resp.status_code, data)
+
+    @staticmethod
+    def _parse(resp, response_format):
+        if response_format != "json":
+            return resp.content
+        if not resp.content:
+            # some algod endpoints answer 200 with an empty body
+            return {}
+        try:
+            return json.loads(resp.content)
+        except ValueError as e:
+            raise error.AlgodResponseError("Failed to parse JSON response from algod") from e
+
+    def close(self):
+        self._http.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_algod_client() -> PooledAlgodClient:
+    """Process-wide pooled algod client."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = PooledAlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
+    return _client
+
+
+def close_algod_client():
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
@@ -0,0 +1,204 @@
+# backend/smartcontracts/confirmations.py
+"""
+Shared confirmation tracker.
+
+transaction.wait_for_confirmation runs its own status/pending-info polling
+loop per txid, so N concurrent operations meant N loops against algod. Here
+a single background thread per algod node follows new rounds with
+status_after_block, fetches each block's txid list once and resolves the
+futures of every pending txid found in it. Algod load is proportional to
+rounds, not to transactions in flight.
+
+    from backend.smartcontracts.confirmations import wait_for_confirmation
+    info = wait_for_confirmation(algod_client, txid, 4)   # drop-in for algosdk's
+
+The thread is idle (no algod calls at all) while nothing is pending.
+"""
+import threading
+import traceback
+from concurrent.futures import Future
+
+from algosdk import error
+
+from backend import metrics
+from backend.smartcontracts import params as params_provider
+
+# wall-clock guard per round in case the follower thread stalls
+SECONDS_PER_ROUND_MAX = 15
+
+
+class ConfirmationTracker:
+    def __init__(self, client):
+        self.client = client
+        self._pending = {}  # txid -> [future, wait_rounds, deadline round (set once a round is known)]
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._block_txids_supported = True
+        self.last_round = None
+
+    # ------------------------------------------------------
+    # caller side
+    # ------------------------------------------------------
+    def register(self, txid: str, wait_rounds: int = 4) -> Future:
+        """Track a submitted txid. The future resolves to its pending-txn info."""
+        with self._lock:
+            entry = self._pending.get(txid)
+            if entry is None:
+                entry = [Future(), wait_rounds, None]
+                self._pending[txid] = entry
+            self._ensure_thread()
+        self._wake.set()
+        return entry[0]
+
+    def wait(self, txid: str, wait_rounds: int = 4):
+        future = self.register(txid, wait_rounds)
+        return future.result(timeout=(wait_rounds + 2) * SECONDS_PER_ROUND_MAX)
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    # ------------------------------------------------------
+    # follower thread
+    # ------------------------------------------------------
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="confirmation-tracker", daemon=True)
+            self._thread.start()
+
+    def _resolve(self, txid, info=None, exc=None):
+        with self._lock:
+            entry = self._pending.pop(txid, None)
+        if entry is None or entry[0].done():
+            return
+        if exc is not None:
+            entry[0].set_exception(exc)
+        else:
+            entry[0].set_result(info)
+
+    def _check_one(self, txid, final=False):
+        """Direct pending-info lookup, used for fallbacks and expired txids."""
+        try:
+            info = self.client.pending_transaction_info(txid)
+        except Exception as e:
+            if final:
+                self._resolve(txid, exc=e)
+            return
+        if info.get("confirmed-round", 0) > 0:
+            self._resolve(txid, info)
+        elif info.get("pool-error"):
+            self._resolve(txid, exc=error.AlgodHTTPError(f"Transaction rejected: {info['pool-error']}"))
+        elif final:
+            self._resolve(txid, exc=error.ConfirmationTimeoutError(
+                f"Transaction {txid} not confirmed by round {self.last_round}"))
+
+    def _block_txids(self, round_num):
+        if self._block_txids_supported:
+            try:
+                return set(self.client.get_block_txids(round_num).get("blockTxids") or [])
+            except error.AlgodHTTPError as e:
+                if getattr(e, "code", None) not in (404, 501):
+                    raise
+                # older algod without /v2/blocks/{round}/txids
+                self._block_txids_supported = False
+        return None
+
+    def _scan_round(self, round_num):
+        with self._lock:
+            pending = list(self._pending)
+        if not pending:
+            return
+        txids = self._block_txids(round_num)
+        for txid in pending:
+            if txids is None or txid in txids:
+                self._check_one(txid)
+
+    def _expire(self):
+        expired = []
+        with self._lock:
+            for txid, entry in self._pending.items():
+                if entry[2] is None:
+                    # deadline counts from the first round we saw the txid pending
+                    entry[2] = self.last_round + entry[1]
+                elif self.last_round >= entry[2]:
+                    expired.append(txid)
+        for txid in expired:
+            self._check_one(txid, final=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                # clear before checking so a concurrent register() can't be missed
+                self._wake.clear()
+                with self._lock:
+                    idle = not self._pending
+                if idle:
+                    self._wake.wait(30)
+                    self.last_round = None
+                    continue
+
+                if self.last_round is None:
+                    # (re)starting: also scan the current round in case a txid
+                    # confirmed between its submission and our first status call
+                    current = self.client.status()["last-round"]
+                    self.last_round = current - 1
+                    self._expire()
+
+                status = self.client.status_after_block(self.last_round)
+                new_round = status["last-round"]
+                params_provider.note_round(self.client, new_round)
+                for r in range(self.last_round + 1, new_round + 1):
+                    self._scan_round(r)
+                self.last_round = new_round
+                self._expire()
+            except Exception:
+                traceback.print_exc()
+                self.last_round = None
+                self._stop.wait(1)
+
+
+_trackers = {}
+_trackers_lock = threading.Lock()
+
+
+def get_tracker(client) -> ConfirmationTracker:
+    key = getattr(client, "algod_address", None) or id(client)
+    with _trackers_lock:
+        tracker = _trackers.get(key)
+        if tracker is None or tracker.client is not client:
+            tracker = ConfirmationTracker(client)
+            _trackers[key] = tracker
+        return tracker
+
+
+def wait_for_confirmation(client, txid: str, wait_rounds: int = 4):
+    """Drop-in replacement for algosdk.transaction.wait_for_confirmation."""
+    with metrics.phase("wait_confirmation"):
+        return get_tracker(client).wait(txid, wait_rounds)
+
+
+def confirmation_state(client, txid: str):
+    """
+    What became of a submitted txid after a failed wait, without resending it.
+    Returns (state, info): "confirmed", "rejected" (pool error) or "unknown"
+    (still pending, or algod no longer knows it).
+    """
+    try:
+        info = client.pending_transaction_info(txid)
+    except Exception as e:
+        return "unknown", {"error": str(e)}
+    if info.get("confirmed-round", 0) > 0:
+        return "confirmed", info
+    if info.get("pool-error"):
+        return "rejected", info
+    return "unknown", info
+
+
+def stop_trackers():
+    with _trackers_lock:
+        for tracker in _trackers.values():
+            tracker.stop()
+        _trackers.clear()
@@ -2,10 +2,12 @@ from algosdk import transaction, account, mnemonic
 from algosdk.v2client import algod
 from algosdk.transaction import AssetConfigTxn
 from datetime import datetime
+from backend.smartcontracts.params import suggested_params
+from backend.smartcontracts.confirmations import wait_for_confirmation
 
 def create_asa(algod_client, creator_sk, total, decimals, unit_name, asset_name, url=""):
     creator_addr = account.address_from_private_key(creator_sk)
-    params = algod_client.suggested_params()
+    params = suggested_params(algod_client)
 
     txn = AssetConfigTxn(
         sender=creator_addr,
@@ -24,7 +26,7 @@ def create_asa(algod_client, creator_sk, total, decimals, unit_name, asset_name,
 
     signed = txn.sign(creator_sk)
     txid = algod_client.send_transaction(signed)
-    transaction.wait_for_confirmation(algod_client, txid, 4)
+    wait_for_confirmation(algod_client, txid, 4)
     # fetch tx info for asset id
     ptx = algod_client.pending_transaction_info(txid)
     created_asset_id = ptx["asset-index"]
@@ -1,7 +1,9 @@
 from pyteal import *
 from algosdk import transaction, account
 from algosdk.v2client import algod
-import base64
+from backend.smartcontracts import program_registry
+from backend.smartcontracts.params import suggested_params
+from backend.smartcontracts.confirmations import wait_for_confirmation
 
 # =============================================================
 # ✅ Smart Contract Logic
@@ -51,10 +53,13 @@ def clear_program():
 # =============================================================
 # ✅ Helper to Compile PyTeal → TEAL → Binary
 # =============================================================
-def compile_program(client: algod.AlgodClient, source_code: Expr):
-    teal = compileTeal(source_code, mode=Mode.Application, version=7)
-    response = client.compile(teal)
-    return base64.b64decode(response["result"])
+TEAL_VERSION = 7
+program_registry.register("admin_escrow_approval", approval_program, TEAL_VERSION)
+program_registry.register("admin_escrow_clear", clear_program, TEAL_VERSION)
+
+def compile_program(client: algod.AlgodClient, builder):
+    """Compiled bytecode for a program builder, served from the program registry."""
+    return program_registry.get_program(client, builder, TEAL_VERSION)
 
 
 # =============================================================
@@ -69,13 +74,13 @@ def deploy_escrow_app(client, creator_private_key, seller_address, amount_micro)
 
     creator_address = account.address_from_private_key(creator_private_key)
 
-    approval_prog = compile_program(client, approval_program())
-    clear_prog = compile_program(client, clear_program())
+    approval_prog = compile_program(client, approval_program)
+    clear_prog = compile_program(client, clear_program)
 
     global_schema = StateSchema(num_uints=1, num_byte_slices=2)
     local_schema = StateSchema(num_uints=0, num_byte_slices=0)
 
-    params = client.suggested_params()
+    params = suggested_params(client)
     app_args = [
         creator_address.encode(),   # admin
         seller_address.encode(),    # seller
@@ -95,7 +100,7 @@ def deploy_escrow_app(client, creator_private_key, seller_address, amount_micro)
 
     signed_txn = txn.sign(creator_private_key)
     txid = client.send_transaction(signed_txn)
-    transaction.wait_for_confirmation(client, txid, 4)
+    wait_for_confirmation(client, txid, 4)
 
     pending = client.pending_transaction_info(txid)
     app_id = pending["application-index"]
@@ -0,0 +1,94 @@
+# backend/smartcontracts/deploy_boxes.py
+"""
+Chain helpers for the multiplexed box-storage escrow (escrow_boxes.py).
+
+One-time setup:
+    python -m backend.smartcontracts.deploy_boxes
+then set ESCROW_MODE=box and BOX_ESCROW_APP_ID=<printed app id> in .env.
+"""
+import os
+from algosdk import transaction
+from algosdk.encoding import decode_address
+from algosdk.logic import get_application_address
+
+from backend.smartcontracts import program_registry
+from backend.smartcontracts.deploy_escrow import algod_client, creator_address, creator_private_key, TEAL_VERSION
+from backend.smartcontracts.escrow_boxes import approval_program, clear_program, box_key, BOX_MBR
+from backend.smartcontracts.params import suggested_params
+from backend.smartcontracts.confirmations import wait_for_confirmation
+
+BOX_ESCROW_APP_ID = int(os.getenv("BOX_ESCROW_APP_ID", "0") or 0)
+
+program_registry.register("escrow_boxes_approval", approval_program, TEAL_VERSION)
+program_registry.register("escrow_boxes_clear", clear_program, TEAL_VERSION)
+
+APP_MIN_BALANCE = 100_000  # app account must exist before boxes can be created
+
+def deploy_box_app() -> int:
+    """Create the single box escrow app and fund its base min balance."""
+    params = suggested_params(algod_client)
+    create = transaction.ApplicationCreateTxn(
+        sender=creator_address,
+        sp=params,
+        on_complete=transaction.OnComplete.NoOpOC,
+        approval_program=program_registry.get_program(algod_client, approval_program, TEAL_VERSION),
+        clear_program=program_registry.get_program(algod_client, clear_program, TEAL_VERSION),
+        global_schema=transaction.StateSchema(num_uints=0, num_byte_slices=0),
+        local_schema=transaction.StateSchema(num_uints=0, num_byte_slices=0),
+    )
+    txid = algod_client.send_transaction(create.sign(creator_private_key))
+    app_id = wait_for_confirmation(algod_client, txid, 4)["application-index"]
+
+    fund = transaction.PaymentTxn(creator_address, params, get_application_address(app_id), APP_MIN_BALANCE)
+    txid = algod_client.send_transaction(fund.sign(creator_private_key))
+    wait_for_confirmation(algod_client, txid, 4)
+    return app_id
+
+def submit_open(app_id: int, order_id: int, seller_address: str, amount: int) -> str:
+    """Create the order's box, paying its MBR in the same group. Returns the app call tx id."""
+    params = suggested_params(algod_client)
+    mbr = transaction.PaymentTxn(creator_address, params, get_application_address(app_id), BOX_MBR)
+    call = transaction.ApplicationNoOpTxn(
+        sender=creator_address,
+        sp=params,
+        index=app_id,
+        app_args=[b"open", box_key(order_id), decode_address(seller_address), int(amount).to_bytes(8, "big")],
+        boxes=[(0, box_key(order_id))],
+    )
+    transaction.assign_group_id([mbr, call])
+    algod_client.send_transactions([mbr.sign(creator_private_key), call.sign(creator_private_key)])
+    return call.get_txid()
+
+def build_admin_call(app_id: int, method: str, order_id: int, accounts=None, params=None):
+    """Unsigned admin call (release / refund / close) on one order box."""
+    params = params or suggested_params(algod_client)
+    if method in ("release", "refund", "close"):
+        # outer fee covers the inner payment (fee pooling)
+        params.flat_fee = True
+        params.fee = 2 * max(params.min_fee or 1000, 1000)
+    return transaction.ApplicationNoOpTxn(
+        sender=creator_address,
+        sp=params,
+        index=app_id,
+        app_args=[method.encode(), box_key(order_id)],
+        accounts=accounts or None,
+        boxes=[(0, box_key(order_id))],
+    )
+
+def release_box_order(app_id: int, order_id: int, seller_address: str) -> str:
+    """Admin release for a box order; waits for confirmation like release_escrow_funds."""
+    txid = submit_box_release(app_id, order_id, seller_address)
+    wait_for_confirmation(algod_client, txid, 4)
+    return txid
+
+
+def submit_box_release(app_id: int, order_id: int, seller_address: str) -> str:
+    txn = build_admin_call(app_id, "release", order_id, accounts=[seller_address])
+    return algod_client.send_transaction(txn.sign(creator_private_key))
+
+
+if __name__ == "__main__":
+    new_app_id = deploy_box_app()
+    print(f"✅ Box escrow app deployed: {new_app_id}")
+    print(f"   App address: {get_application_address(new_app_id)}")
+    print(f"   Set BOX_ESCROW_APP_ID={new_app_id} and ESCROW_MODE=box in backend/.env")
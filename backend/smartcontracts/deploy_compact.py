@@ -0,0 +1,75 @@
+# backend/smartcontracts/deploy_compact.py
+"""
+Chain helpers for the compact per-order escrow (escrow_compact.py).
+Uses the same algod client and creator account as deploy_escrow.py.
+
+Compared with escrow_approval.py the app declares one global byteslice
+instead of two uints and a byteslice, pays out with fee pooling (the outer
+call carries the inner payment's fee, the escrow never pays fees out of
+the order amount) and closes its account on payout, so a settled app can
+be deleted to hand its minimum balance back to the creator.
+"""
+from algosdk import transaction
+from algosdk.encoding import decode_address
+
+from backend.smartcontracts import program_registry
+from backend.smartcontracts.deploy_escrow import algod_client, creator_address, creator_private_key, TEAL_VERSION
+from backend.smartcontracts.escrow_compact import approval_program, clear_program, GLOBAL_UINTS, GLOBAL_BYTE_SLICES
+from backend.smartcontracts.params import suggested_params
+
+program_registry.register("escrow_compact_approval", approval_program, TEAL_VERSION)
+program_registry.register("escrow_compact_clear", clear_program, TEAL_VERSION)
+
+GLOBAL_SCHEMA = transaction.StateSchema(num_uints=GLOBAL_UINTS, num_byte_slices=GLOBAL_BYTE_SLICES)
+LOCAL_SCHEMA = transaction.StateSchema(num_uints=0, num_byte_slices=0)
+
+# calls whose outer fee also covers one inner payment
+PAYING_METHODS = ("confirm", "release", "refund")
+
+def _pooled(params, inner_txns: int):
+    params.flat_fee = True
+    params.fee = (1 + inner_txns) * max(params.min_fee or 1000, 1000)
+    return params
+
+def build_compact_create(seller_address: str, amount: int, params=None):
+    """Unsigned ApplicationCreateTxn for one compact escrow app."""
+    return transaction.ApplicationCreateTxn(
+        sender=creator_address,
+        sp=params or suggested_params(algod_client),
+        on_complete=transaction.OnComplete.NoOpOC,
+        approval_program=program_registry.get_program(algod_client, approval_program, TEAL_VERSION),
+        clear_program=program_registry.get_program(algod_client, clear_program, TEAL_VERSION),
+        global_schema=GLOBAL_SCHEMA,
+        local_schema=LOCAL_SCHEMA,
+        app_args=[decode_address(seller_address), int(amount).to_bytes(8, "big")],
+    )
+
+def submit_compact_app(seller_address: str, amount: int) -> str:
+    """Sign and send the create txn without waiting. Returns the tx id."""
+    return algod_client.send_transaction(build_compact_create(seller_address, amount).sign(creator_private_key))
+
+def build_compact_call(app_id: int, method: str, payee: str = None, params=None):
+    """Unsigned admin call (release / refund). `payee` goes into the foreign accounts."""
+    params = params or suggested_params(algod_client)
+    if method in PAYING_METHODS:
+        params = _pooled(params, 1)
+    return transaction.ApplicationNoOpTxn(
+        sender=creator_address,
+        sp=params,
+        index=app_id,
+        app_args=[method.encode()],
+        accounts=[payee] if payee else None,
+    )
+
+def submit_compact_release(app_id: int, seller_address: str) -> str:
+    """Sign and send the admin 'release' call without waiting. Returns the tx id."""
+    txn = build_compact_call(app_id, "release", seller_address)
+    return algod_client.send_transaction(txn.sign(creator_private_key))
+
+def build_compact_delete(app_id: int, params=None):
+    """Unsigned delete of a settled (or never funded) compact app."""
+    return transaction.ApplicationDeleteTxn(
+        sender=creator_address,
+        sp=params or suggested_params(algod_client),
+        index=app_id,
+    )
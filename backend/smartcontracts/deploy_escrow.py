@@ -1,36 +1,41 @@
 import os
-import base64
-from algosdk.v2client import algod
-from algosdk import mnemonic, transaction, account
+from algosdk import mnemonic, transaction, account, error
 from algosdk.logic import get_application_address
 from algosdk.encoding import decode_address
-from pyteal import compileTeal, Mode
 from dotenv import load_dotenv
 
+from backend import metrics
+
 from backend.smartcontracts.escrow_approval import approval_program, clear_state_program
+from backend.smartcontracts import program_registry
+from backend.smartcontracts.params import suggested_params
+from backend.smartcontracts.algod_pool import get_algod_client
+from backend.smartcontracts.confirmations import wait_for_confirmation, confirmation_state
 
 load_dotenv()
 
-ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS")
-ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
 CREATOR_MNEMONIC = os.getenv("CREATOR_MNEMONIC")
 
-if not all([ALGOD_ADDRESS, CREATOR_MNEMONIC]):
-    raise ValueError("ALGOD_ADDRESS and CREATOR_MNEMONIC must be set in .env")
+if not CREATOR_MNEMONIC:
+    raise ValueError("CREATOR_MNEMONIC must be set in .env")
 
-algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
+algod_client = get_algod_client()
 creator_private_key = mnemonic.to_private_key(CREATOR_MNEMONIC)
 creator_address = account.address_from_private_key(creator_private_key)
 
-def deploy_escrow_app(seller_address: str, amount: int):
-    approval_teal = compileTeal(approval_program(), mode=Mode.Application, version=8)
-    clear_teal = compileTeal(clear_state_program(), mode=Mode.Application, version=8)
+TEAL_VERSION = 8
+program_registry.register("escrow_approval", approval_program, TEAL_VERSION)
+program_registry.register("escrow_clear", clear_state_program, TEAL_VERSION)
 
-    # compile to base64 -> decode to bytes
-    apc = algod_client.compile(approval_teal)
-    cpc = algod_client.compile(clear_teal)
-    approval_bytes = base64.b64decode(apc["result"])
-    clear_bytes = base64.b64decode(cpc["result"])
+def warm_programs():
+    """Compile the escrow programs ahead of the first order (called on startup)."""
+    return program_registry.warm(algod_client)
+
+def build_create_txn(seller_address: str, amount: int, params=None, note: bytes = None):
+    """Unsigned ApplicationCreateTxn for one escrow app."""
+    # bytecode comes from the registry; algod is only hit on a cold cache
+    approval_bytes = program_registry.get_program(algod_client, approval_program, TEAL_VERSION)
+    clear_bytes = program_registry.get_program(algod_client, clear_state_program, TEAL_VERSION)
 
     global_schema = transaction.StateSchema(num_uints=2, num_byte_slices=1)
     local_schema = transaction.StateSchema(num_uints=0, num_byte_slices=0)
@@ -42,8 +47,8 @@ def deploy_escrow_app(seller_address: str, amount: int):
         (int(amount)).to_bytes(8, "big")
     ]
 
-    params = algod_client.suggested_params()
-    create_txn = transaction.ApplicationCreateTxn(
+    params = params or suggested_params(algod_client)
+    return transaction.ApplicationCreateTxn(
         sender=creator_address,
         sp=params,
         on_complete=transaction.OnComplete.NoOpOC,
@@ -51,13 +56,114 @@ def deploy_escrow_app(seller_address: str, amount: int):
         clear_program=clear_bytes,
         global_schema=global_schema,
         local_schema=local_schema,
-        app_args=app_args
+        app_args=app_args,
+        note=note
     )
 
-    signed = create_txn.sign(creator_private_key)
-    tx_id = algod_client.send_transaction(signed)
-    confirmed = transaction.wait_for_confirmation(algod_client, tx_id, 4)
+def submit_escrow_app(seller_address: str, amount: int) -> str:
+    """Sign and send the create txn without waiting. Returns the tx id."""
+    txn = build_create_txn(seller_address, amount)
+    with metrics.phase("sign"):
+        signed = txn.sign(creator_private_key)
+    return algod_client.send_transaction(signed)
+
+def confirm_escrow_app(tx_id: str, wait_rounds: int = 4):
+    """Wait for a submitted create txn and return the new app id / address."""
+    confirmed = wait_for_confirmation(algod_client, tx_id, wait_rounds)
     app_id = confirmed["application-index"]
     escrow_address = get_application_address(app_id)
 
     return {"app_id": app_id, "escrow_address": escrow_address}
+
+def deploy_escrow_app(seller_address: str, amount: int):
+    tx_id = submit_escrow_app(seller_address, amount)
+    return confirm_escrow_app(tx_id)
+
+# ==========================================================
+# 📦 Batch deployment (atomic groups)
+# ==========================================================
+MAX_GROUP_SIZE = 16  # protocol limit for an atomic group
+
+def _group_app_ids(tx_ids):
+    """
+    App ids for a confirmed group of creates. Ids come from the block's txn
+    counter, so a group of plain creates gets consecutive ids; we read the
+    first and last txn and only fall back to per-txn lookups if they disagree.
+    """
+    first = algod_client.pending_transaction_info(tx_ids[0])["application-index"]
+    last = algod_client.pending_transaction_info(tx_ids[-1])["application-index"] if len(tx_ids) > 1 else first
+    if last - first == len(tx_ids) - 1:
+        return [first + i for i in range(len(tx_ids))]
+    return [algod_client.pending_transaction_info(t)["application-index"] for t in tx_ids]
+
+def _mark_pending(results, idx, tx_ids, exc):
+    for i, tx_id in zip(idx, tx_ids):
+        results[i] = {"pending": True, "tx_id": tx_id, "error": str(exc)}
+
+def deploy_escrow_apps_batch(rows, group_size: int = MAX_GROUP_SIZE, pipeline_depth: int = 4, wait_rounds: int = 4):
+    """
+    Deploy one escrow app per (seller_address, amount) row.
+
+    Creates are packed into atomic groups of up to `group_size`; up to
+    `pipeline_depth` groups are sent back to back and then confirmed
+    together. Returns a list aligned with `rows` holding one of
+      {"app_id", "escrow_address"}   confirmed
+      {"error"}                      rejected (a failed group fails all of its rows)
+      {"pending", "tx_id", "error"}  submitted but not seen confirmed; the
+                                     create may still land, so the caller
+                                     must keep tracking tx_id
+    """
+    group_size = max(1, min(group_size, MAX_GROUP_SIZE))
+    pipeline_depth = max(1, pipeline_depth)
+    results = [None] * len(rows)
+    params = suggested_params(algod_client)
+    nonce = os.urandom(8).hex()
+
+    groups = []
+    for start in range(0, len(rows), group_size):
+        idx = list(range(start, min(start + group_size, len(rows))))
+        # identical create txns would share a txid; the note keeps them distinct
+        txns = [
+            build_create_txn(rows[i][0], rows[i][1], params, note=f"algocart:batch:{nonce}:{i}".encode())
+            for i in idx
+        ]
+        transaction.assign_group_id(txns)
+        with metrics.phase("sign"):
+            groups.append((idx, [t.sign(creator_private_key) for t in txns]))
+
+    for w in range(0, len(groups), pipeline_depth):
+        window = groups[w:w + pipeline_depth]
+        in_flight = []
+        for idx, signed in window:
+            tx_ids = [s.get_txid() for s in signed]
+            try:
+                algod_client.send_transactions(signed)
+                in_flight.append((idx, tx_ids))
+            except error.AlgodHTTPError as e:
+                # algod answered: the group was not accepted
+                for i in idx:
+                    results[i] = {"error": str(e)}
+            except Exception as e:
+                # no answer: the group may have reached the pool anyway
+                _mark_pending(results, idx, tx_ids, e)
+
+        for idx, tx_ids in in_flight:
+            try:
+                # groups are atomic: one confirmed txid means the whole group is in
+                wait_for_confirmation(algod_client, tx_ids[0], wait_rounds)
+            except Exception as e:
+                state, info = confirmation_state(algod_client, tx_ids[0])
+                if state == "rejected":
+                    for i in idx:
+                        results[i] = {"error": info["pool-error"]}
+                    continue
+                if state != "confirmed":
+                    _mark_pending(results, idx, tx_ids, e)
+                    continue
+            try:
+                for i, app_id in zip(idx, _group_app_ids(tx_ids)):
+                    results[i] = {"app_id": app_id, "escrow_address": get_application_address(app_id)}
+            except Exception as e:
+                _mark_pending(results, idx, tx_ids, e)
+
+    return results
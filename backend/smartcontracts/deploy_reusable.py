@@ -0,0 +1,42 @@
+# backend/smartcontracts/deploy_reusable.py
+"""
+Chain helpers for the re-armable per-listing escrow (escrow_reusable.py).
+Uses the same algod client and creator account as deploy_escrow.py.
+"""
+from algosdk import transaction
+from algosdk.encoding import decode_address
+
+from backend.smartcontracts import program_registry
+from backend.smartcontracts.deploy_escrow import algod_client, creator_address, creator_private_key, TEAL_VERSION
+from backend.smartcontracts.escrow_reusable import approval_program, clear_state_program
+from backend.smartcontracts.params import suggested_params
+
+program_registry.register("escrow_reusable_approval", approval_program, TEAL_VERSION)
+program_registry.register("escrow_reusable_clear", clear_state_program, TEAL_VERSION)
+
+GLOBAL_SCHEMA = transaction.StateSchema(num_uints=2, num_byte_slices=2)
+LOCAL_SCHEMA = transaction.StateSchema(num_uints=0, num_byte_slices=0)
+
+def submit_listing_app(seller_address: str, amount: int) -> str:
+    """Create a long-lived listing escrow app. Returns the tx id."""
+    txn = transaction.ApplicationCreateTxn(
+        sender=creator_address,
+        sp=suggested_params(algod_client),
+        on_complete=transaction.OnComplete.NoOpOC,
+        approval_program=program_registry.get_program(algod_client, approval_program, TEAL_VERSION),
+        clear_program=program_registry.get_program(algod_client, clear_state_program, TEAL_VERSION),
+        global_schema=GLOBAL_SCHEMA,
+        local_schema=LOCAL_SCHEMA,
+        app_args=[decode_address(seller_address), int(amount).to_bytes(8, "big")],
+    )
+    return algod_client.send_transaction(txn.sign(creator_private_key))
+
+def submit_arm(app_id: int, amount: int) -> str:
+    """Re-arm a free listing app for a new order amount. Returns the tx id."""
+    txn = transaction.ApplicationNoOpTxn(
+        sender=creator_address,
+        sp=suggested_params(algod_client),
+        index=app_id,
+        app_args=[b"arm", int(amount).to_bytes(8, "big")],
+    )
+    return algod_client.send_transaction(txn.sign(creator_private_key))
@@ -0,0 +1,154 @@
+# backend/smartcontracts/escrow_boxes.py
+from pyteal import *
+
+# One application holds every order; each order lives in its own box.
+# box key   = itob(order_id)                       (8 bytes)
+# box value = seller(32) | buyer(32) | amount(8) | status(1)   (73 bytes)
+BOX_SIZE = 73
+OFF_SELLER = 0
+OFF_BUYER = 32
+OFF_AMOUNT = 64
+OFF_STATUS = 72
+
+# status constants (same numbering as escrow_v2.py, plus refunded)
+STATUS_INIT = 0
+STATUS_FUNDED = 1
+STATUS_DELIVERED = 2
+STATUS_COMPLETED = 3
+STATUS_REFUNDED = 4
+
+# box MBR = 2500 + 400 * (key + value) microAlgos
+BOX_MBR = 2500 + 400 * (8 + BOX_SIZE)
+
+def box_key(order_id: int) -> bytes:
+    return int(order_id).to_bytes(8, "big")
+
+def approval_program():
+    # every NoOp call carries [method, order_id(uint64)]
+    key = Txn.application_args[1]
+
+    def field(offset, length):
+        return App.box_extract(key, Int(offset), Int(length))
+
+    seller = field(OFF_SELLER, 32)
+    buyer = field(OFF_BUYER, 32)
+    amount = Btoi(field(OFF_AMOUNT, 8))
+    status = Btoi(field(OFF_STATUS, 1))
+
+    def set_status(value):
+        return App.box_replace(key, Int(OFF_STATUS), Extract(Itob(Int(value)), Int(7), Int(1)))
+
+    is_admin = Txn.sender() == Global.creator_address()
+
+    @Subroutine(TealType.none)
+    def do_inner_payment(receiver: Expr, amt: Expr):
+        return Seq(
+            InnerTxnBuilder.Begin(),
+            InnerTxnBuilder.SetFields({
+                TxnField.type_enum: TxnType.Payment,
+                TxnField.receiver: receiver,
+                TxnField.amount: amt,
+                TxnField.fee: Int(0)  # fee pooling; caller's outer txn covers it
+            }),
+            InnerTxnBuilder.Submit()
+        )
+
+    # open: admin creates the order box. args: [open, order_id, seller_addr, amount]
+    open_handler = Seq(
+        Assert(is_admin),
+        Assert(Txn.application_args.length() == Int(4)),
+        Assert(Len(Txn.application_args[2]) == Int(32)),
+        Assert(App.box_create(key, Int(BOX_SIZE))),
+        App.box_replace(key, Int(OFF_SELLER), Txn.application_args[2]),
+        App.box_replace(key, Int(OFF_AMOUNT), Itob(Btoi(Txn.application_args[3]))),
+        Approve()
+    )
+
+    # fund: previous txn in the group pays the order amount into the app
+    pay = Gtxn[Txn.group_index() - Int(1)]
+    fund_handler = Seq(
+        Assert(Txn.group_index() > Int(0)),
+        Assert(status == Int(STATUS_INIT)),
+        Assert(pay.type_enum() == TxnType.Payment),
+        Assert(pay.receiver() == Global.current_application_address()),
+        Assert(pay.sender() == Txn.sender()),
+        Assert(pay.amount() == amount),
+        App.box_replace(key, Int(OFF_BUYER), Txn.sender()),
+        set_status(STATUS_FUNDED),
+        Approve()
+    )
+
+    # deliver: only seller and only from FUNDED
+    deliver_handler = Seq(
+        Assert(Txn.sender() == seller),
+        Assert(status == Int(STATUS_FUNDED)),
+        set_status(STATUS_DELIVERED),
+        Approve()
+    )
+
+    # confirm: buyer confirms and app pays seller via inner tx
+    confirm_handler = Seq(
+        Assert(Txn.sender() == buyer),
+        Assert(status == Int(STATUS_DELIVERED)),
+        do_inner_payment(seller, amount),
+        set_status(STATUS_COMPLETED),
+        Approve()
+    )
+
+    # admin release: pay seller from FUNDED or DELIVERED
+    release_handler = Seq(
+        Assert(is_admin),
+        Assert(Or(status == Int(STATUS_FUNDED), status == Int(STATUS_DELIVERED))),
+        do_inner_payment(seller, amount),
+        set_status(STATUS_COMPLETED),
+        Approve()
+    )
+
+    # admin refund: return the payment to the buyer
+    refund_handler = Seq(
+        Assert(is_admin),
+        Assert(Or(status == Int(STATUS_FUNDED), status == Int(STATUS_DELIVERED))),
+        do_inner_payment(buyer, amount),
+        set_status(STATUS_REFUNDED),
+        Approve()
+    )
+
+    # admin close: delete a box that holds no funds and pay its MBR back to
+    # the creator (who paid it on open); deleting the box lowers the app's
+    # min balance by exactly BOX_MBR, so escrowed funds are never touched
+    close_handler = Seq(
+        Assert(is_admin),
+        Assert(Or(
+            status == Int(STATUS_INIT),
+            status == Int(STATUS_COMPLETED),
+            status == Int(STATUS_REFUNDED),
+        )),
+        Pop(App.box_delete(key)),
+        do_inner_payment(Global.creator_address(), Int(BOX_MBR)),
+        Approve()
+    )
+
+    program = Cond(
+        [Txn.application_id() == Int(0), Approve()],
+        [Txn.on_completion() == OnComplete.DeleteApplication, Return(is_admin)],
+        [Txn.on_completion() == OnComplete.UpdateApplication, Reject()],
+        [Txn.on_completion() == OnComplete.NoOp,
+            Seq(
+                Assert(Txn.application_args.length() >= Int(2)),
+                Cond(
+                    [Txn.application_args[0] == Bytes("open"), open_handler],
+                    [Txn.application_args[0] == Bytes("fund"), fund_handler],
+                    [Txn.application_args[0] == Bytes("deliver"), deliver_handler],
+                    [Txn.application_args[0] == Bytes("confirm"), confirm_handler],
+                    [Txn.application_args[0] == Bytes("release"), release_handler],
+                    [Txn.application_args[0] == Bytes("refund"), refund_handler],
+                    [Txn.application_args[0] == Bytes("close"), close_handler],
+                )
+            )
+        ],
+    )
+
+    return program
+
+def clear_program():
+    return Approve()
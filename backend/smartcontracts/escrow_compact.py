@@ -0,0 +1,140 @@
+# backend/smartcontracts/escrow_compact.py
+from pyteal import *
+
+# One app per order, with the whole order in a single global byteslice:
+# key "o" -> seller(32) | buyer(32) | amount(8) | status(1)   (73 bytes)
+# so the app needs StateSchema(num_uints=0, num_byte_slices=1).
+KEY_ORDER = Bytes("o")
+OFF_SELLER = 0
+OFF_BUYER = 32
+OFF_AMOUNT = 64
+OFF_STATUS = 72
+
+# status constants (same numbering as escrow_boxes.py)
+STATUS_INIT = 0
+STATUS_FUNDED = 1
+STATUS_DELIVERED = 2
+STATUS_COMPLETED = 3
+STATUS_REFUNDED = 4
+
+GLOBAL_UINTS = 0
+GLOBAL_BYTE_SLICES = 1
+
+def approval_program():
+    state = App.globalGet(KEY_ORDER)
+    seller = Extract(state, Int(OFF_SELLER), Int(32))
+    buyer = Extract(state, Int(OFF_BUYER), Int(32))
+    amount = ExtractUint64(state, Int(OFF_AMOUNT))
+    status = GetByte(state, Int(OFF_STATUS))
+
+    def set_status(value):
+        return App.globalPut(KEY_ORDER, SetByte(state, Int(OFF_STATUS), Int(value)))
+
+    is_admin = Txn.sender() == Global.creator_address()
+    is_open = Or(status == Int(STATUS_FUNDED), status == Int(STATUS_DELIVERED))
+
+    @Subroutine(TealType.none)
+    def pay_out(receiver: Expr):
+        # pays exactly the order amount and closes the app account to the
+        # creator, so nothing (not even its min balance) is left behind;
+        # fee 0: the outer call pays for both (fee pooling)
+        return Seq(
+            InnerTxnBuilder.Begin(),
+            InnerTxnBuilder.SetFields({
+                TxnField.type_enum: TxnType.Payment,
+                TxnField.receiver: receiver,
+                TxnField.amount: amount,
+                TxnField.close_remainder_to: Global.creator_address(),
+                TxnField.fee: Int(0)
+            }),
+            InnerTxnBuilder.Submit()
+        )
+
+    # on create: expect [seller_addr (32 bytes), amount (uint64, 8 bytes)]
+    on_create = Seq(
+        Assert(Txn.application_args.length() == Int(2)),
+        Assert(Len(Txn.application_args[0]) == Int(32)),
+        Assert(Len(Txn.application_args[1]) == Int(8)),
+        App.globalPut(KEY_ORDER, Concat(
+            Txn.application_args[0], BytesZero(Int(32)), Txn.application_args[1], Bytes("base16", "00")
+        )),
+        Approve()
+    )
+
+    # fund: grouped transaction where Gtxn[0] is payment to contract address
+    on_fund = Seq(
+        Assert(status == Int(STATUS_INIT)),
+        Assert(Gtxn[0].type_enum() == TxnType.Payment),
+        Assert(Gtxn[0].receiver() == Global.current_application_address()),
+        Assert(Gtxn[0].amount() == amount),
+        Assert(Gtxn[0].sender() == Txn.sender()),
+        App.globalPut(KEY_ORDER, SetByte(
+            Replace(state, Int(OFF_BUYER), Txn.sender()), Int(OFF_STATUS), Int(STATUS_FUNDED)
+        )),
+        Approve()
+    )
+
+    # deliver: only seller and only from FUNDED
+    on_deliver = Seq(
+        Assert(Txn.sender() == seller),
+        Assert(status == Int(STATUS_FUNDED)),
+        set_status(STATUS_DELIVERED),
+        Approve()
+    )
+
+    # confirm: buyer confirms and app pays seller (creator must be in accounts)
+    on_confirm = Seq(
+        Assert(Txn.sender() == buyer),
+        Assert(status == Int(STATUS_DELIVERED)),
+        pay_out(seller),
+        set_status(STATUS_COMPLETED),
+        Approve()
+    )
+
+    # admin release: pay seller from FUNDED or DELIVERED
+    on_release = Seq(
+        Assert(is_admin),
+        Assert(is_open),
+        pay_out(seller),
+        set_status(STATUS_COMPLETED),
+        Approve()
+    )
+
+    # admin refund: return the payment to the buyer
+    on_refund = Seq(
+        Assert(is_admin),
+        Assert(is_open),
+        pay_out(buyer),
+        set_status(STATUS_REFUNDED),
+        Approve()
+    )
+
+    # admin delete once the order is settled (or never funded): returns the
+    # app's min balance to the creator
+    on_delete = Seq(
+        Assert(is_admin),
+        Assert(Or(
+            status == Int(STATUS_COMPLETED),
+            status == Int(STATUS_REFUNDED),
+            Balance(Global.current_application_address()) == Int(0),
+        )),
+        Approve()
+    )
+
+    program = Cond(
+        [Txn.application_id() == Int(0), on_create],
+        [Txn.on_completion() == OnComplete.DeleteApplication, on_delete],
+        [Txn.on_completion() == OnComplete.NoOp,
+            Cond(
+                [Txn.application_args[0] == Bytes("fund"), on_fund],
+                [Txn.application_args[0] == Bytes("deliver"), on_deliver],
+                [Txn.application_args[0] == Bytes("confirm"), on_confirm],
+                [Txn.application_args[0] == Bytes("release"), on_release],
+                [Txn.application_args[0] == Bytes("refund"), on_refund],
+            )
+        ],
+    )
+    return program
+
+def clear_program():
+    return Approve()
@@ -0,0 +1,99 @@
+# backend/smartcontracts/escrow_reusable.py
+"""
+Re-armable escrow used as a long-lived app per marketplace listing.
+
+Same fund/release flow as escrow_approval.py, but after `release` (or
+`refund`) the app is back in the unfunded state and the creator can `arm`
+it with a new amount for the next buyer, so repeat purchases of a listing
+don't deploy a new application each time.
+"""
+from pyteal import *
+
+KEY_SELLER = Bytes("s")
+KEY_AMOUNT = Bytes("a")
+KEY_FUNDED = Bytes("f")  # 0 or 1
+KEY_BUYER = Bytes("b")   # sender of the funding payment
+
+def approval_program():
+    is_creator = Txn.sender() == Global.creator_address()
+
+    @Subroutine(TealType.none)
+    def pay_out(receiver: Expr):
+        return Seq(
+            InnerTxnBuilder.Begin(),
+            InnerTxnBuilder.SetFields({
+                TxnField.type_enum: TxnType.Payment,
+                TxnField.receiver: receiver,
+                TxnField.amount: App.globalGet(KEY_AMOUNT),
+                TxnField.fee: Int(0)
+            }),
+            InnerTxnBuilder.Submit(),
+            App.globalPut(KEY_FUNDED, Int(0)),
+            App.globalPut(KEY_BUYER, Bytes("")),
+        )
+
+    # on create: expect [seller_addr (bytes), amount (uint64)]
+    on_create = Seq(
+        Assert(Txn.application_args.length() == Int(2)),
+        App.globalPut(KEY_SELLER, Txn.application_args[0]),
+        App.globalPut(KEY_AMOUNT, Btoi(Txn.application_args[1])),
+        App.globalPut(KEY_FUNDED, Int(0)),
+        Approve()
+    )
+
+    # arm: creator sets the amount for the next order; only while unfunded
+    on_arm = Seq(
+        Assert(is_creator),
+        Assert(Txn.application_args.length() == Int(2)),
+        Assert(App.globalGet(KEY_FUNDED) == Int(0)),
+        App.globalPut(KEY_AMOUNT, Btoi(Txn.application_args[1])),
+        Approve()
+    )
+
+    # fund: grouped transaction where Gtxn[0] is payment to contract address
+    on_fund = Seq(
+        Assert(
+            And(
+                Gtxn[0].type_enum() == TxnType.Payment,
+                Gtxn[0].receiver() == Global.current_application_address(),
+                Gtxn[0].amount() == App.globalGet(KEY_AMOUNT),
+                Gtxn[0].sender() == Txn.sender(),
+                App.globalGet(KEY_FUNDED) == Int(0)
+            )
+        ),
+        App.globalPut(KEY_FUNDED, Int(1)),
+        App.globalPut(KEY_BUYER, Txn.sender()),
+        Approve()
+    )
+
+    # release: creator pays the seller and frees the app for the next order
+    on_release = Seq(
+        Assert(is_creator),
+        Assert(App.globalGet(KEY_FUNDED) == Int(1)),
+        pay_out(App.globalGet(KEY_SELLER)),
+        Approve()
+    )
+
+    # refund: creator returns the payment to the buyer and frees the app
+    on_refund = Seq(
+        Assert(is_creator),
+        Assert(App.globalGet(KEY_FUNDED) == Int(1)),
+        pay_out(App.globalGet(KEY_BUYER)),
+        Approve()
+    )
+
+    program = Cond(
+        [Txn.application_id() == Int(0), on_create],
+        [Txn.on_completion() == OnComplete.DeleteApplication, Reject()],
+        [Txn.on_completion() == OnComplete.UpdateApplication, Reject()],
+        [Txn.on_completion() == OnComplete.CloseOut, Reject()],
+        [Txn.on_completion() == OnComplete.OptIn, Reject()],
+        [Txn.application_args[0] == Bytes("arm"), on_arm],
+        [Txn.application_args[0] == Bytes("fund"), on_fund],
+        [Txn.application_args[0] == Bytes("release"), on_release],
+        [Txn.application_args[0] == Bytes("refund"), on_refund],
+    )
+    return program
+
+def clear_state_program():
+    return Approve()
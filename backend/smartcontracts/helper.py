@@ -4,27 +4,29 @@ from algosdk.v2client.algod import AlgodClient
 from algosdk import account, mnemonic
 from algosdk.transaction import PaymentTxn, ApplicationNoOpTxn, OnComplete, calculate_group_id
 from algosdk.transaction import LogicSig, LogicSigAccount
+from backend.smartcontracts.params import suggested_params
 
 MICRO = 1_000_000
 
-def build_fund_group(algod_client: AlgodClient, buyer_addr: str, buyer_pk: str, app_id: int, amount_micro: int):
-    # payment -> app account
+def build_unsigned_fund_group(algod_client: AlgodClient, buyer_addr: str, app_id: int, amount_micro: int,
+                              app_args=None, boxes=None, params=None):
+    """[payment -> app account, app call "fund"] with the group id set, unsigned."""
     app_address = transaction.logic.get_application_address(app_id)
-    params = algod_client.suggested_params()
+    params = params or suggested_params(algod_client)
     ptxn = PaymentTxn(buyer_addr, params, app_address, amount_micro)
-    # app call (no extra accounts)
-    call_txn = ApplicationNoOpTxn(buyer_addr, params, app_id, app_args=[b"fund"])
-    # group them
-    gid = calculate_group_id([ptxn, call_txn])
-    ptxn.group = gid
-    call_txn.group = gid
+    # app call (no extra accounts; box orders pass their box key and box ref)
+    call_txn = ApplicationNoOpTxn(buyer_addr, params, app_id, app_args=app_args or [b"fund"], boxes=boxes)
+    return transaction.assign_group_id([ptxn, call_txn])
+
+def build_fund_group(algod_client: AlgodClient, buyer_addr: str, buyer_pk: str, app_id: int, amount_micro: int):
+    ptxn, call_txn = build_unsigned_fund_group(algod_client, buyer_addr, app_id, amount_micro)
     # sign
     signed_pay = ptxn.sign(buyer_pk)
     signed_call = call_txn.sign(buyer_pk)
     return [signed_pay, signed_call]
 
 def build_release_tx(algod_client: AlgodClient, admin_addr: str, admin_pk: str, app_id: int):
-    params = algod_client.suggested_params()
+    params = suggested_params(algod_client)
     call_txn = ApplicationNoOpTxn(admin_addr, params, app_id, app_args=[b"release"])
     signed_call = call_txn.sign(admin_pk)
     return signed_call
@@ -0,0 +1,54 @@
+# backend/smartcontracts/params.py
+"""
+Shared suggested-params provider for every transaction builder.
+
+algod's suggested params only change when a new round is produced (~3s on
+TestNet), so we fetch them at most once per PARAMS_TTL per algod node and
+hand out copies. Each copy gets a fresh validity window starting at the
+cached round, so callers can mutate fee fields freely.
+"""
+import os
+import copy
+import threading
+import time
+
+PARAMS_TTL = float(os.getenv("PARAMS_TTL", "2.5"))           # seconds, below one round
+VALIDITY_WINDOW = int(os.getenv("PARAMS_VALIDITY_WINDOW", "1000"))  # rounds
+
+_lock = threading.Lock()
+_cache = {}  # algod address -> (fetched_at, SuggestedParams)
+
+
+def _key(client):
+    return getattr(client, "algod_address", None) or id(client)
+
+
+def suggested_params(client):
+    """Cached copy of client.suggested_params() with its validity window set."""
+    key = _key(client)
+    entry = _cache.get(key)
+    now = time.monotonic()
+    if entry is None or now - entry[0] > PARAMS_TTL:
+        with _lock:
+            entry = _cache.get(key)
+            if entry is None or now - entry[0] > PARAMS_TTL:
+                entry = (time.monotonic(), client.suggested_params())
+                _cache[key] = entry
+
+    params = copy.copy(entry[1])
+    params.last = params.first + VALIDITY_WINDOW
+    return params
+
+
+def note_round(client, round_num: int):
+    """Drop cached params older than `round_num` (called when a new block is seen)."""
+    entry = _cache.get(_key(client))
+    if entry is not None and entry[1].first < round_num:
+        _cache.pop(_key(client), None)
+
+
+def invalidate(client=None):
+    if client is None:
+        _cache.clear()
+    else:
+        _cache.pop(_key(client), None)
@@ -0,0 +1,123 @@
+# backend/smartcontracts/program_registry.py
+"""
+Compiled TEAL program registry.
+
+Deploy paths used to run compileTeal + algod `compile` for the approval and
+clear programs on every single deployment. The programs never change between
+calls, so we compile each one once and keep the bytecode:
+
+  1. in memory, keyed by sha256(teal version + TEAL source)
+  2. on disk under ARTIFACT_DIR (<hash>.teal / <hash>.bin), so a restarted
+     process does not need algod to compile again
+
+PyTeal builders are registered with `register()` and compiled ahead of time
+by `warm()` from main.on_startup.
+"""
+import os
+import base64
+import hashlib
+import threading
+from pyteal import compileTeal, Mode
+
+from backend import metrics
+
+ARTIFACT_DIR = os.getenv(
+    "TEAL_ARTIFACT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts"),
+)
+
+_lock = threading.Lock()
+_teal_sources = {}   # (builder id, version) -> TEAL source
+_bytecode = {}       # program hash -> compiled bytes
+_registered = {}     # name -> (builder, version)
+
+
+def _builder_id(builder):
+    return f"{builder.__module__}.{builder.__qualname__}"
+
+
+def program_hash(teal: str, version: int) -> str:
+    digest = hashlib.sha256()
+    digest.update(str(version).encode())
+    digest.update(b"\0")
+    digest.update(teal.encode())
+    return digest.hexdigest()
+
+
+def teal_for(builder, version: int) -> str:
+    """Return the TEAL source for a PyTeal builder, building the AST only once."""
+    key = (_builder_id(builder), version)
+    teal = _teal_sources.get(key)
+    if teal is None:
+        with metrics.phase("pyteal_compile"):
+            teal = compileTeal(builder(), mode=Mode.Application, version=version)
+        _teal_sources[key] = teal
+    return teal
+
+
+def _artifact_path(prog_hash: str, ext: str) -> str:
+    return os.path.join(ARTIFACT_DIR, f"{prog_hash}.{ext}")
+
+
+def _load_artifact(prog_hash: str):
+    try:
+        with open(_artifact_path(prog_hash, "bin"), "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _save_artifact(prog_hash: str, teal: str, program: bytes):
+    try:
+        os.makedirs(ARTIFACT_DIR, exist_ok=True)
+        for ext, data in (("teal", teal.encode()), ("bin", program)):
+            path = _artifact_path(prog_hash, ext)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+    except OSError as e:
+        # a read-only artifact dir only costs us a recompile after restart
+        print(f"⚠️  Could not persist TEAL artifact {prog_hash[:12]}: {e}")
+
+
+def compile_teal(client, teal: str, version: int) -> bytes:
+    """Compile TEAL source to bytecode, using the memory/disk cache first."""
+    prog_hash = program_hash(teal, version)
+    program = _bytecode.get(prog_hash)
+    if program is not None:
+        return program
+
+    with _lock:
+        program = _bytecode.get(prog_hash)
+        if program is not None:
+            return program
+
+        program = _load_artifact(prog_hash)
+        if program is None:
+            response = client.compile(teal)
+            program = base64.b64decode(response["result"])
+            _save_artifact(prog_hash, teal, program)
+
+        _bytecode[prog_hash] = program
+        return program
+
+
+def get_program(client, builder, version: int) -> bytes:
+    """Compiled bytecode for a PyTeal builder (e.g. approval_program)."""
+    return compile_teal(client, teal_for(builder, version), version)
+
+
+def register(name: str, builder, version: int):
+    """Register a program so `warm()` compiles it at startup."""
+    _registered[name] = (builder, version)
+
+
+def warm(client):
+    """Compile every registered program. Returns {name: program hash}."""
+    warmed = {}
+    for name, (builder, version) in list(_registered.items()):
+        teal = teal_for(builder, version)
+        compile_teal(client, teal, version)
+        warmed[name] = program_hash(teal, version)
+    return warmed
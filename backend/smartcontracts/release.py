@@ -2,21 +2,31 @@ import os
 from algosdk import transaction, account, mnemonic
 from algosdk.v2client import algod
 from algosdk.logic import get_application_address
+from backend import metrics
+from backend.smartcontracts.params import suggested_params
+from backend.smartcontracts.confirmations import wait_for_confirmation
 
 def release_escrow_funds(algod_client: algod.AlgodClient, app_id: int, seller_address: str):
-    params = algod_client.suggested_params()
+    txid = submit_release(algod_client, app_id, seller_address)
+    wait_for_confirmation(algod_client, txid, 4)
+    return txid
+
+def submit_release(algod_client: algod.AlgodClient, app_id: int, seller_address: str):
+    """Sign and send the 'release' app call without waiting for confirmation."""
+    params = suggested_params(algod_client)
+    # the contract's inner payment has fee 0: the outer call pays for it (fee pooling)
+    params.flat_fee = True
+    params.fee = 2 * max(params.min_fee or 1000, 1000)
     # admin/creator must call app; creator set in deploy_escrow_app
     # Build app call: send ['release'] and include seller in accounts
     from_addr = account.address_from_private_key(mnemonic.to_private_key(os.getenv("ADMIN_MNEMONIC")))
     tx = transaction.ApplicationNoOpTxn(
         sender=from_addr,
         index=app_id,
-        on_complete=transaction.OnComplete.NoOpOC,
         app_args=[b"release"],
         accounts=[seller_address],
         sp=params
     )
-    signed = tx.sign(mnemonic.to_private_key(os.getenv("ADMIN_MNEMONIC")))
-    txid = algod_client.send_transaction(signed)
-    transaction.wait_for_confirmation(algod_client, txid, 4)
-    return txid
+    with metrics.phase("sign"):
+        signed = tx.sign(mnemonic.to_private_key(os.getenv("ADMIN_MNEMONIC")))
+    return algod_client.send_transaction(signed)
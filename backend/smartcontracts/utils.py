@@ -1,10 +1,8 @@
 import os
-from algosdk.v2client import algod
 from algosdk.transaction import LogicSigAccount
+from backend.smartcontracts.algod_pool import get_algod_client
 
-ALGOD_URL = os.getenv("ALGOD_URL", "https://testnet-api.algonode.cloud")
-ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
-algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+algod_client = get_algod_client()
 
 def get_escrow_lsig(app_id: int):
     """
@@ -2,22 +2,20 @@
 import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from dotenv import load_dotenv
-from algosdk.v2client import algod
 from algosdk import mnemonic, account, transaction
 from backend.smartcontracts.deploy import deploy_escrow_app
+from backend.smartcontracts.algod_pool import get_algod_client
 
 # === Load environment variables ===
 load_dotenv()
 
-ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
-ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
 ADMIN_MNEMONIC = os.getenv("ADMIN_MNEMONIC")
 
 if not ADMIN_MNEMONIC:
     raise Exception("❌ ADMIN_MNEMONIC not found in .env file!")
 
 # === Setup algod client ===
-algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
+algod_client = get_algod_client()
 creator_private_key = mnemonic.to_private_key(ADMIN_MNEMONIC)
 creator_address = account.address_from_private_key(creator_private_key)
 
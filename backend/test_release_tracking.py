@@ -0,0 +1,146 @@
+# backend/test_release_tracking.py
+"""
+Offline check that admin_release keeps order_stats and the order event log
+in step with the orders table: after a release, after a failed send hands
+the claim back (RELEASING -> FUNDED), and after /admin/release/recheck
+settles a release whose confirmation wait timed out.
+
+    python -m backend.test_release_tracking      (or pytest backend/test_release_tracking.py)
+"""
+import asyncio
+import os
+import tempfile
+
+from algosdk import account, mnemonic
+
+from backend.benchmarks.fake_algod import FakeAlgod
+
+ADMIN_KEY = "test-admin"
+
+
+def _setup(fake):
+    key = account.generate_account()[0]
+    tmp = tempfile.mkdtemp()
+    os.environ.update(
+        ALGOD_ADDRESS=fake.address, ALGOD_TOKEN="", ADMIN_SECRET_KEY=ADMIN_KEY,
+        CREATOR_MNEMONIC=mnemonic.from_private_key(key), ADMIN_MNEMONIC=mnemonic.from_private_key(key),
+        TEAL_ARTIFACT_DIR=os.path.join(tmp, "teal"), CHAIN_INDEXER="0", APP_SWEEPER="0",
+    )
+    import backend.db as bdb
+    bdb.use_database(os.path.join(tmp, "orders.db"))
+    bdb.init_db()
+
+
+def _funded_orders(n):
+    from backend.db import SessionLocal, Order
+
+    db = SessionLocal()
+    try:
+        orders = [Order(seller=account.generate_account()[1], product_name="item", amount=1_000_000,
+                        status="INIT", escrow_kind="compact", app_id=5000 + i) for i in range(n)]
+        db.add_all(orders)
+        db.commit()
+        for order in orders:
+            order.status = "FUNDED"
+        db.commit()
+        return [order.id for order in orders]
+    finally:
+        db.close()
+
+
+def _stats_match_orders():
+    """order_stats as kept by the flush hooks == order_stats rebuilt from the orders table."""
+    from backend.db import SessionLocal, OrderStat, rebuild_order_stats
+
+    db = SessionLocal()
+    try:
+        def snapshot():
+            return {(s.scope, s.status): (s.count, s.amount)
+                    for s in db.query(OrderStat).filter(OrderStat.count != 0)}
+        kept = snapshot()
+        rebuild_order_stats(db)
+        rebuilt = snapshot()
+        db.rollback()
+        return kept, rebuilt
+    finally:
+        db.close()
+
+
+async def _run(client):
+    from backend.routes import escrow_routes
+    from backend.smartcontracts import algod_async
+
+    released, unclaimed, rechecked = _funded_orders(3), _funded_orders(1)[0], _funded_orders(1)[0]
+
+    for order_id in released:
+        r = await client.post("/api/escrow/admin/release", json={"admin_key": ADMIN_KEY, "order_id": order_id})
+        assert r.status_code == 200 and r.json()["message"] == "released", r.text
+
+    real_submit = algod_async.submit_order_release
+
+    async def failing_submit(*args, **kwargs):
+        raise RuntimeError("algod unreachable")
+
+    algod_async.submit_order_release = failing_submit
+    try:
+        r = await client.post("/api/escrow/admin/release", json={"admin_key": ADMIN_KEY, "order_id": unclaimed})
+        assert r.status_code == 500, r.text
+    finally:
+        algod_async.submit_order_release = real_submit
+
+    # confirmation wait times out: the order stays RELEASING until a recheck finds the txid confirmed
+    real_wait, real_state = algod_async.wait_for_confirmation, escrow_routes.confirmation_state
+
+    async def timed_out_wait(*args, **kwargs):
+        raise TimeoutError("no confirmation yet")
+
+    algod_async.wait_for_confirmation = timed_out_wait
+    escrow_routes.confirmation_state = lambda client, txid: ("unknown", {})
+    try:
+        r = await client.post("/api/escrow/admin/release", json={"admin_key": ADMIN_KEY, "order_id": rechecked})
+        assert r.status_code == 200 and r.json()["message"] == "pending", r.text
+        r = await client.post("/api/escrow/admin/release/recheck", json={"admin_key": ADMIN_KEY, "order_id": rechecked})
+        assert r.status_code == 200 and r.json()["message"] == "pending", r.text
+        escrow_routes.confirmation_state = lambda client, txid: ("confirmed", {"confirmed-round": 7})
+        r = await client.post("/api/escrow/admin/release/recheck", json={"admin_key": ADMIN_KEY, "order_id": rechecked})
+        assert r.status_code == 200 and r.json()["message"] == "released", r.text
+    finally:
+        algod_async.wait_for_confirmation, escrow_routes.confirmation_state = real_wait, real_state
+
+    stats = (await client.get("/api/admin/stats", params={"admin_key": "849969"})).json()["stats"]["by_status"]
+    assert stats.get("RELEASED", {}).get("count") == 4, stats
+    assert stats.get("FUNDED", {}).get("count") == 1, stats
+    assert "RELEASING" not in stats, stats
+    kept, rebuilt = _stats_match_orders()
+    assert kept == rebuilt, (kept, rebuilt)
+
+    def transitions(events):
+        return [(e["from_status"], e["to_status"]) for e in events if e["kind"] == "status"]
+
+    for order_id in released + [rechecked]:
+        events = (await client.get(f"/api/escrow/orders/{order_id}/events")).json()["events"]
+        assert transitions(events) == [("INIT", "FUNDED"), ("FUNDED", "RELEASING"), ("RELEASING", "RELEASED")], events
+    events = (await client.get(f"/api/escrow/orders/{unclaimed}/events")).json()["events"]
+    assert transitions(events) == [("INIT", "FUNDED"), ("FUNDED", "RELEASING"), ("RELEASING", "FUNDED")], events
+
+
+def test_release_keeps_stats_and_events():
+    fake = FakeAlgod(0.1).start()
+    try:
+        _setup(fake)
+        import httpx
+        from backend.main import app
+
+        async def main():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                await _run(client)
+
+        asyncio.run(main())
+    finally:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    test_release_keeps_stats_and_events()
+    print("✅ release stats / events consistent")
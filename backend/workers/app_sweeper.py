@@ -0,0 +1,335 @@
+# backend/workers/app_sweeper.py
+"""
+Background sweeper that reclaims the chain state of finished orders.
+
+Every settled order keeps its escrow on chain, and the creator's minimum
+balance pays for it. Every SWEEP_INTERVAL seconds this worker finds orders in
+a terminal status whose escrow can be removed and removes it:
+
+    compact  DeleteApplication on the order's app: the creator's app MBR is
+             freed (the app account was already closed to the creator on payout)
+    box      "close" on the shared box app: the box is deleted and its MBR
+             paid back to the creator
+
+Per-order "app" escrows (escrow_approval.py) reject DeleteApplication, and
+"listing" apps are re-armed for the next order, so neither kind is swept.
+
+The txns are batched into atomic groups of up to MAX_GROUP_SIZE. At most
+SWEEP_CONCURRENCY groups are in flight, and submissions are spaced to
+SWEEP_GROUPS_PER_SECOND. A group that algod rejects is retried one txn at
+a time, so one app that cannot be deleted does not hold back the others. A
+group that was accepted is never resent. If its confirmation wait fails,
+its orders are recorded as PENDING with the txid. The next pass settles
+them from the chain: the txid's confirmation, or else whether the app or
+box still exists. Outcomes go to app_sweeps (txid, reclaimed microAlgos,
+fee). Failed orders are retried on later passes up to SWEEP_MAX_ATTEMPTS.
+
+    python -m backend.workers.app_sweeper [--dry-run]
+"""
+import copy
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from algosdk import transaction
+from algosdk.error import AlgodHTTPError
+from sqlalchemy import and_, func, or_
+
+from backend.db import SessionLocal, Order, AppSweep
+
+SWEEPER_ENABLED = os.getenv("APP_SWEEPER", "1") == "1"
+SWEEP_INTERVAL = float(os.getenv("SWEEP_INTERVAL", "600"))            # seconds between passes
+SWEEP_BATCH = int(os.getenv("SWEEP_BATCH", "256"))                    # orders per pass
+SWEEP_CONCURRENCY = int(os.getenv("SWEEP_CONCURRENCY", "2"))          # groups in flight
+SWEEP_GROUPS_PER_SECOND = float(os.getenv("SWEEP_GROUPS_PER_SECOND", "1"))
+SWEEP_MAX_ATTEMPTS = int(os.getenv("SWEEP_MAX_ATTEMPTS", "3"))
+
+TERMINAL_STATUSES = ("COMPLETED", "RELEASED", "REFUNDED", "CANCELLED")
+SWEEPABLE_KINDS = ("compact", "box")
+
+
+def app_mbr(num_uints: int, num_byte_slices: int, extra_pages: int = 0) -> int:
+    """Creator min balance held for one created app."""
+    return 100_000 * (1 + extra_pages) + 28_500 * num_uints + 50_000 * num_byte_slices
+
+
+def reclaimable(kind: str) -> int:
+    """microAlgos of min balance released by sweeping one order of this kind."""
+    if kind == "compact":
+        from backend.smartcontracts.escrow_compact import GLOBAL_UINTS, GLOBAL_BYTE_SLICES
+        return app_mbr(GLOBAL_UINTS, GLOBAL_BYTE_SLICES)
+    from backend.smartcontracts.escrow_boxes import BOX_MBR
+    return BOX_MBR
+
+
+def candidates(db, limit: int = SWEEP_BATCH):
+    """(order id, app id, kind) of finished orders not swept yet or due for a retry."""
+    return (
+        db.query(Order.id, Order.app_id, Order.escrow_kind)
+        .outerjoin(AppSweep, AppSweep.order_id == Order.id)
+        .filter(
+            Order.status.in_(TERMINAL_STATUSES),
+            Order.escrow_kind.in_(SWEEPABLE_KINDS),
+            Order.app_id.isnot(None),
+            or_(
+                AppSweep.order_id.is_(None),
+                and_(AppSweep.status == "FAILED", AppSweep.attempts < SWEEP_MAX_ATTEMPTS),
+            ),
+        )
+        .order_by(Order.id)
+        .limit(limit)
+        .all()
+    )
+
+
+# ==========================================================
+# ⛓️ Chain side
+# ==========================================================
+class _RateLimiter:
+    """Spaces calls to wait() at least 1 / per_second apart, across threads."""
+
+    def __init__(self, per_second: float):
+        self.interval = 1 / per_second if per_second > 0 else 0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next)
+            self._next = at + self.interval
+        if at > now:
+            _stop.wait(at - now)
+
+
+_limiter = _RateLimiter(SWEEP_GROUPS_PER_SECOND)
+
+
+def _build(item, params):
+    order_id, app_id, kind = item
+    if kind == "compact":
+        from backend.smartcontracts.deploy_compact import build_compact_delete
+        return build_compact_delete(app_id, params)
+    from backend.smartcontracts.deploy_boxes import build_admin_call
+    # close pays the box MBR back with an inner payment; build_admin_call
+    # raises the fee for that, so keep it off the params the group shares
+    return build_admin_call(app_id, "close", order_id, params=copy.copy(params))
+
+
+def _gone(item) -> bool:
+    """True once the order's app (compact) or box no longer exists on chain."""
+    from backend.smartcontracts.deploy_escrow import algod_client
+    from backend.smartcontracts.escrow_boxes import box_key
+
+    order_id, app_id, kind = item
+    try:
+        if kind == "compact":
+            algod_client.application_info(app_id)
+        else:
+            algod_client.application_box_by_name(app_id, box_key(order_id))
+    except AlgodHTTPError as e:
+        if getattr(e, "code", None) == 404:
+            return True
+        raise
+    return False
+
+
+def _submit(items):
+    """
+    Send one atomic group for `items` and wait for it. Raises only if algod
+    rejects the submission. Returns (txid, state, round, fees, error); state
+    is "confirmed", "failed" (dropped from the pool) or "pending".
+    """
+    from backend.smartcontracts.deploy_escrow import algod_client, creator_private_key
+    from backend.smartcontracts.params import suggested_params
+    from backend.smartcontracts.confirmations import wait_for_confirmation, confirmation_state
+
+    params = suggested_params(algod_client)
+    params.flat_fee = True
+    params.fee = max(params.min_fee or 1000, 1000)
+    txns = [_build(item, params) for item in items]
+    fees = [txn.fee for txn in txns]
+    if len(txns) > 1:
+        transaction.assign_group_id(txns)
+
+    _limiter.wait()
+    if _stop.is_set():
+        raise RuntimeError("sweeper stopping")
+    signed = [txn.sign(creator_private_key) for txn in txns]
+    txid = signed[0].get_txid()
+    try:
+        algod_client.send_transactions(signed)
+    except AlgodHTTPError:
+        raise
+    except Exception as e:
+        # no answer from algod: the group may be in the pool, don't resend
+        return txid, "pending", None, fees, str(e)
+    try:
+        info = wait_for_confirmation(algod_client, txid, 4)
+        return txid, "confirmed", info.get("confirmed-round"), fees, None
+    except Exception as e:
+        state, info = confirmation_state(algod_client, txid)
+        if state == "confirmed":
+            return txid, "confirmed", info.get("confirmed-round"), fees, None
+        if state == "rejected":
+            return txid, "failed", None, fees, info["pool-error"]
+        return txid, "pending", None, fees, str(e)
+
+
+def _sweep_group(items):
+    """[(item, txid, state, round, fee, error)] for one group; rejected groups are split up."""
+    try:
+        txid, state, round_num, fees, error = _submit(items)
+    except Exception as e:
+        txid, state, round_num, fees, error = None, "failed", None, [0] * len(items), str(e)
+    if state == "failed" and len(items) > 1 and not _stop.is_set():
+        # nothing in the group was applied: isolate the bad txn(s)
+        print(f"⚠️  Sweep group of {len(items)} rejected ({error}), retrying one by one")
+        results = []
+        for item in items:
+            results += _sweep_group([item])
+        return results
+    return [(item, txid, state, round_num, fee, error) for item, fee in zip(items, fees)]
+
+
+def _record(db, results):
+    for (order_id, app_id, kind), txid, state, round_num, fee, error in results:
+        row = db.get(AppSweep, order_id)
+        if row is None:
+            row = AppSweep(order_id=order_id, app_id=app_id, escrow_kind=kind, attempts=0)
+            db.add(row)
+        row.attempts += 1
+        row.tx_id = txid
+        row.fee_micro = fee if txid else 0
+        if state == "confirmed":
+            row.status = "DONE"
+            row.confirmed_round = round_num
+            row.reclaimed_micro = reclaimable(kind)
+            row.last_error = None
+        else:
+            # PENDING: settled from the chain on the next pass
+            row.status = "PENDING" if state == "pending" else "FAILED"
+            row.last_error = (error or "")[:2000]
+        row.updated_at = datetime.utcnow()
+    db.commit()
+
+
+def settle_pending(db) -> dict:
+    """Resolve PENDING sweeps from the chain (never by resending)."""
+    from backend.smartcontracts.deploy_escrow import algod_client
+    from backend.smartcontracts.confirmations import confirmation_state
+
+    settled = {"swept": 0, "failed": 0, "reclaimed_micro": 0}
+    for row in db.query(AppSweep).filter(AppSweep.status == "PENDING").all():
+        item = (row.order_id, row.app_id, row.escrow_kind)
+        state, info = confirmation_state(algod_client, row.tx_id) if row.tx_id else ("unknown", {"error": ""})
+        if state == "unknown" and "error" not in info:
+            continue  # still in the pool
+        if state == "confirmed" or (state == "unknown" and _gone(item)):
+            row.status = "DONE"
+            row.confirmed_round = info.get("confirmed-round")
+            row.reclaimed_micro = reclaimable(row.escrow_kind)
+            row.last_error = None
+            settled["swept"] += 1
+            settled["reclaimed_micro"] += row.reclaimed_micro
+        else:
+            row.status = "FAILED"
+            row.last_error = info.get("pool-error") or "sweep txn was not confirmed"
+            settled["failed"] += 1
+        row.updated_at = datetime.utcnow()
+    db.commit()
+    return settled
+
+
+def sweep_once(limit: int = SWEEP_BATCH, dry_run: bool = False) -> dict:
+    """One pass over finished orders. Returns counts and microAlgos reclaimed."""
+    from backend.smartcontracts.deploy_escrow import MAX_GROUP_SIZE
+
+    db = SessionLocal(info={"actor": "app_sweeper"})
+    try:
+        summary = {"candidates": 0, "swept": 0, "failed": 0, "pending": 0, "reclaimed_micro": 0, "fee_micro": 0}
+        if not dry_run:
+            for key, value in settle_pending(db).items():
+                summary[key] += value
+        items = [tuple(row) for row in candidates(db, limit)]
+        summary["candidates"] = len(items)
+        if dry_run or not items:
+            summary["reclaimable_micro"] = sum(reclaimable(kind) for _, _, kind in items)
+            return summary
+
+        groups = [items[i:i + MAX_GROUP_SIZE] for i in range(0, len(items), MAX_GROUP_SIZE)]
+        with ThreadPoolExecutor(max_workers=max(1, SWEEP_CONCURRENCY), thread_name_prefix="app-sweep") as pool:
+            for results in pool.map(_sweep_group, groups):
+                _record(db, results)
+                for (_, _, kind), txid, state, _, fee, _ in results:
+                    if txid:
+                        summary["fee_micro"] += fee
+                    if state == "confirmed":
+                        summary["swept"] += 1
+                        summary["reclaimed_micro"] += reclaimable(kind)
+                    else:
+                        summary[state] += 1
+        return summary
+    finally:
+        db.close()
+
+
+def stats(db) -> dict:
+    """Totals over app_sweeps per status."""
+    rows = (
+        db.query(AppSweep.status, func.count(), func.sum(AppSweep.reclaimed_micro), func.sum(AppSweep.fee_micro))
+        .group_by(AppSweep.status)
+        .all()
+    )
+    return {
+        status: {"orders": count, "reclaimed_micro": reclaimed or 0, "fee_micro": fee or 0}
+        for status, count, reclaimed, fee in rows
+    }
+
+
+# ==========================================================
+# 🏃 Sweeper thread
+# ==========================================================
+_stop = threading.Event()
+_thread = None
+
+
+def _run():
+    while not _stop.is_set():
+        try:
+            summary = sweep_once()
+            if summary["swept"] or summary["failed"] or summary["pending"]:
+                print(f"🧹 Swept {summary['swept']} escrow(s), {summary['failed']} failed, "
+                      f"{summary['pending']} awaiting confirmation, "
+                      f"reclaimed {summary['reclaimed_micro']} µAlgo for {summary['fee_micro']} µAlgo in fees")
+        except Exception:
+            traceback.print_exc()
+        _stop.wait(SWEEP_INTERVAL)
+
+
+def start_sweeper():
+    global _thread
+    if not SWEEPER_ENABLED or _thread is not None:
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="app-sweeper", daemon=True)
+    _thread.start()
+
+
+def stop_sweeper(timeout: float = 5):
+    global _thread
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout)
+        _thread = None
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] not in ([], ["--dry-run"]):
+        print("usage: python -m backend.workers.app_sweeper [--dry-run]")
+        raise SystemExit(1)
+    print(sweep_once(dry_run=sys.argv[1:] == ["--dry-run"]))
@@ -0,0 +1,277 @@
+# backend/workers/chain_indexer.py
+"""
+Chain-driven order status via checkpointed block ingestion.
+
+One background thread follows new rounds, fetches each block once and makes
+a single linear pass over its transactions, looking them up in an in-memory
+index of open orders:
+
+    app_id         -> order id      (per-order and listing escrow apps)
+    (app_id, box)  -> order id      (box escrow: order id is the box key)
+    escrow_address -> order id      (payments into per-order escrows)
+
+App calls advance the matching order:
+    fund    INIT               -> FUNDED     (buyer + funding txid recorded)
+    deliver FUNDED             -> DELIVERED
+    confirm DELIVERED          -> COMPLETED
+    release FUNDED/DELIVERED/RELEASING -> RELEASED
+    refund  FUNDED/DELIVERED   -> REFUNDED
+
+Order updates and the round checkpoint are committed together, so after a
+restart ingestion resumes at checkpoint + 1 without double-applying
+anything. backfill(start, end) replays a round range on demand.
+
+    python -m backend.workers.chain_indexer backfill <from_round> <to_round>
+"""
+import os
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+
+import msgpack
+from algosdk import encoding, transaction
+from algosdk.logic import get_application_address
+
+from backend.db import SessionLocal, Order, ChainCheckpoint, annotate_order
+from backend.helpers import listing_apps
+
+CHAIN_INDEXER_ENABLED = os.getenv("CHAIN_INDEXER", "1") == "1"
+CHECKPOINT_NAME = "order_indexer"
+INDEX_REFRESH_SECONDS = float(os.getenv("CHAIN_INDEX_REFRESH", "5"))
+
+# RELEASING: claimed by /admin/release, whose confirmation wait may have timed out
+OPEN_STATUSES = ("DEPLOYING", "INIT", "FUNDED", "DELIVERED", "RELEASING")
+
+TRANSITIONS = {
+    b"fund": (("INIT",), "FUNDED"),
+    b"deliver": (("FUNDED",), "DELIVERED"),
+    b"confirm": (("DELIVERED",), "COMPLETED"),
+    b"release": (("FUNDED", "DELIVERED", "RELEASING"), "RELEASED"),
+    b"refund": (("FUNDED", "DELIVERED"), "REFUNDED"),
+}
+
+
+class OrderIndex:
+    """In-memory lookup of open orders by app id / box / escrow address."""
+
+    def __init__(self):
+        self.by_app = {}
+        self.by_box = {}
+        self.by_address = {}
+        self.box_apps = set()
+        self.addresses = set()  # every address a funding payment can go to
+        self.loaded_at = 0.0
+        self._dirty = True
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    def refresh(self, db, force=False):
+        if not force and not self._dirty and time.monotonic() - self.loaded_at < INDEX_REFRESH_SECONDS:
+            return
+        rows = (
+            db.query(Order.id, Order.app_id, Order.escrow_address, Order.escrow_kind)
+            .filter(Order.status.in_(OPEN_STATUSES), Order.app_id.isnot(None))
+            .all()
+        )
+        by_app, by_box, by_address = {}, {}, {}
+        for order_id, app_id, address, kind in rows:
+            if kind == "box":
+                by_box[(app_id, order_id.to_bytes(8, "big"))] = order_id
+                continue
+            by_app[app_id] = order_id
+            if address:
+                by_address[address] = order_id
+        self.by_app, self.by_box, self.by_address = by_app, by_box, by_address
+        self.box_apps = {app_id for app_id, _ in by_box}
+        self.addresses = set(by_address) | {get_application_address(a) for a in self.box_apps}
+        self.loaded_at = time.monotonic()
+        self._dirty = False
+
+    def order_for_call(self, app_id, args):
+        if app_id in self.box_apps:
+            return self.by_box.get((app_id, args[1])) if len(args) > 1 else None
+        return self.by_app.get(app_id)
+
+
+index = OrderIndex()
+
+
+# ==========================================================
+# 🧱 Block decoding
+# ==========================================================
+def _fetch_block(client, round_num):
+    raw = client.block_info(round_num, response_format="msgpack")
+    return msgpack.unpackb(raw, raw=False, strict_map_key=False)["block"]
+
+
+def _txid(stxn, block):
+    """Recompute a txid from its in-block form (genesis fields are stripped)."""
+    try:
+        txn = dict(stxn["txn"])
+        if stxn.get("hgi"):
+            txn["gen"] = block.get("gen")
+        txn["gh"] = block.get("gh")
+        return transaction.Transaction.undictify(txn).get_txid()
+    except Exception:
+        return None
+
+
+def _scan_block(block):
+    """
+    One pass over a block. Returns [(order_id, method, sender, txid)] for
+    app calls that touch indexed orders.
+    """
+    hits = []
+    payments_by_group = {}
+    calls = []
+    for stxn in block.get("txns") or []:
+        txn = stxn.get("txn", {})
+        kind = txn.get("type")
+        if kind == "pay" and txn.get("grp") and txn.get("rcv"):
+            if encoding.encode_address(txn["rcv"]) in index.addresses:
+                payments_by_group.setdefault(txn["grp"], stxn)
+        elif kind == "appl":
+            app_id = txn.get("apid")
+            args = txn.get("apaa") or []
+            if app_id and args and args[0] in TRANSITIONS:
+                calls.append((stxn, app_id, args))
+
+    for stxn, app_id, args in calls:
+        order_id = index.order_for_call(app_id, args)
+        if order_id is None:
+            continue
+        txn = stxn["txn"]
+        # funding is reported by the payment txid (first txn of the group)
+        source = payments_by_group.get(txn.get("grp")) if args[0] == b"fund" and txn.get("grp") else None
+        hits.append((order_id, args[0], encoding.encode_address(txn["snd"]), _txid(source or stxn, block)))
+    return hits
+
+
+def _apply(db, hits, round_num):
+    orders = {o.id: o for o in db.query(Order).filter(Order.id.in_({h[0] for h in hits})).all()}
+    changed = 0
+    for order_id, method, sender, txid in hits:
+        order = orders.get(order_id)
+        allowed, new_status = TRANSITIONS[method]
+        if order is None or order.status not in allowed:
+            continue
+        order.status = new_status
+        order.updated_at = datetime.utcnow()
+        if txid:
+            order.tx_id = txid
+        annotate_order(db, order, round=round_num, note=f"{method.decode()} by {sender}")
+        if method == b"fund" and not order.buyer:
+            order.buyer = sender
+        if new_status in ("RELEASED", "REFUNDED", "COMPLETED"):
+            listing_apps.release_listing_app(db, order)
+        changed += 1
+        print(f"⛓️  Order {order_id}: {method.decode()} -> {new_status} (round {round_num})")
+    if changed:
+        index.mark_dirty()
+    return changed
+
+
+def process_round(client, db, round_num, checkpoint=True):
+    index.refresh(db)
+    hits = _scan_block(_fetch_block(client, round_num)) if (index.by_app or index.by_box) else []
+    changed = _apply(db, hits, round_num) if hits else 0
+    if checkpoint:
+        _save_checkpoint(db, round_num)
+    db.commit()
+    return changed
+
+
+# ==========================================================
+# 📍 Checkpoints
+# ==========================================================
+def get_checkpoint(db):
+    row = db.query(ChainCheckpoint).filter(ChainCheckpoint.name == CHECKPOINT_NAME).first()
+    return row.round if row else None
+
+
+def _save_checkpoint(db, round_num):
+    row = db.query(ChainCheckpoint).filter(ChainCheckpoint.name == CHECKPOINT_NAME).first()
+    if row is None:
+        db.add(ChainCheckpoint(name=CHECKPOINT_NAME, round=round_num))
+    elif round_num > row.round:
+        row.round = round_num
+
+
+def backfill(client, start_round: int, end_round: int):
+    """Replay [start_round, end_round]; transitions are idempotent by status."""
+    db = SessionLocal(info={"actor": "chain"})
+    try:
+        index.refresh(db, force=True)
+        changed = 0
+        for r in range(start_round, end_round + 1):
+            changed += process_round(client, db, r, checkpoint=False)
+        return changed
+    finally:
+        db.close()
+
+
+# ==========================================================
+# 🏃 Follower thread
+# ==========================================================
+_stop = threading.Event()
+_thread = None
+
+
+def _run(client):
+    from backend.smartcontracts import params as params_provider
+
+    last = None
+    while not _stop.is_set():
+        db = SessionLocal(info={"actor": "chain"})
+        try:
+            if last is None:
+                last = get_checkpoint(db)
+                if last is None:
+                    # first run: start from the current round
+                    last = client.status()["last-round"] - 1
+                print(f"⛓️  Chain indexer resuming after round {last}")
+
+            status = client.status_after_block(last)
+            new_round = status["last-round"]
+            params_provider.note_round(client, new_round)
+            for r in range(last + 1, new_round + 1):
+                if _stop.is_set():
+                    break
+                process_round(client, db, r)
+                last = r
+        except Exception:
+            db.rollback()
+            traceback.print_exc()
+            last = None
+            _stop.wait(2)
+        finally:
+            db.close()
+
+
+def start_indexer(client):
+    global _thread
+    if not CHAIN_INDEXER_ENABLED or _thread is not None:
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, args=(client,), name="chain-indexer", daemon=True)
+    _thread.start()
+
+
+def stop_indexer(timeout: float = 5):
+    global _thread
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout)
+        _thread = None
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] != "backfill":
+        print("usage: python -m backend.workers.chain_indexer backfill <from_round> <to_round>")
+        raise SystemExit(1)
+    from backend.smartcontracts.algod_pool import get_algod_client
+    n = backfill(get_algod_client(), int(sys.argv[2]), int(sys.argv[3]))
+    print(f"✅ Backfill done, {n} order(s) updated")
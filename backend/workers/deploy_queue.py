@@ -0,0 +1,289 @@
+# backend/workers/deploy_queue.py
+"""
+Durable background deployment queue.
+
+create_order inserts the Order in DEPLOYING state together with a DeployJob
+row (same transaction) and returns immediately. Worker threads started from
+main.on_startup claim PENDING jobs, run the handler registered for the job
+kind and fill in app_id / escrow_address on the order.
+
+Failed jobs are retried with exponential backoff plus jitter up to
+job.max_attempts. The submitted tx id is stored before waiting for
+confirmation, so a job left RUNNING by a crash is confirmed on restart
+instead of being deployed a second time.
+"""
+import os
+import random
+import threading
+import traceback
+from datetime import datetime, timedelta
+
+from algosdk.error import AlgodHTTPError
+from algosdk.logic import get_application_address
+
+from backend import metrics
+from backend.db import SessionLocal, Order, DeployJob
+from backend.smartcontracts.confirmations import wait_for_confirmation
+
+WORKER_COUNT = int(os.getenv("DEPLOY_WORKERS", "2"))
+MAX_ATTEMPTS = int(os.getenv("DEPLOY_MAX_ATTEMPTS", "5"))
+BACKOFF_BASE = float(os.getenv("DEPLOY_BACKOFF_BASE", "2"))   # seconds
+BACKOFF_MAX = float(os.getenv("DEPLOY_BACKOFF_MAX", "120"))   # seconds
+POLL_INTERVAL = float(os.getenv("DEPLOY_POLL_INTERVAL", "1"))  # seconds
+
+_handlers = {}
+_wakeup = threading.Event()
+_stop = threading.Event()
+_threads = []
+
+
+def job_handler(kind: str, on_failure=None):
+    """
+    Register a function(db, job, order) that performs one job kind.
+    on_failure(db, job, order) runs once when the job fails permanently.
+    """
+    def decorator(fn):
+        _handlers[kind] = (fn, on_failure)
+        return fn
+    return decorator
+
+
+# ==========================================================
+# 📥 Producer side
+# ==========================================================
+def enqueue(db, order_id: int, kind: str = "deploy_escrow") -> DeployJob:
+    """
+    Add a job to the caller's session. The caller commits (together with
+    the order row) and then calls notify().
+    """
+    job = DeployJob(
+        order_id=order_id,
+        kind=kind,
+        status="PENDING",
+        attempts=0,
+        max_attempts=MAX_ATTEMPTS,
+        next_attempt_at=datetime.utcnow(),
+    )
+    db.add(job)
+    return job
+
+
+def notify():
+    """Wake idle workers so a fresh job doesn't wait for the next poll."""
+    _wakeup.set()
+
+
+def serialize_job(job: DeployJob):
+    return {
+        "id": job.id,
+        "order_id": job.order_id,
+        "kind": job.kind,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "next_attempt_at": job.next_attempt_at,
+        "tx_id": job.tx_id,
+        "last_error": job.last_error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+    }
+
+
+# ==========================================================
+# 🔧 Job handlers
+# ==========================================================
+def _tx_dropped(algod_client, tx_id: str) -> bool:
+    """True if algod no longer knows the tx or rejected it from the pool."""
+    try:
+        info = algod_client.pending_transaction_info(tx_id)
+    except AlgodHTTPError as e:
+        # NOTE: confirmed txns also fall out of the pending pool eventually;
+        # recovery after a very long outage may redeploy in that case.
+        return getattr(e, "code", None) == 404
+    return bool(info.get("pool-error"))
+
+
+def submit_and_confirm(db, job, submit, wait_rounds: int = 4):
+    """
+    Send the job's transaction via submit() at most once per live tx
+    (the tx id is persisted before waiting) and return the confirmed txn info.
+    """
+    from backend.smartcontracts.deploy_escrow import algod_client
+
+    if not job.tx_id:
+        job.tx_id = submit()
+        db.commit()
+
+    try:
+        return wait_for_confirmation(algod_client, job.tx_id, wait_rounds)
+    except Exception:
+        # submit a fresh txn on the next attempt only if this one is gone
+        if _tx_dropped(algod_client, job.tx_id):
+            job.tx_id = None
+            db.commit()
+        raise
+
+
+@job_handler("deploy_escrow")
+def _deploy_escrow(db, job, order):
+    from backend.smartcontracts.deploy_escrow import submit_escrow_app
+
+    confirmed = submit_and_confirm(db, job, lambda: submit_escrow_app(order.seller, order.amount))
+    app_id = confirmed["application-index"]
+
+    order.app_id = app_id
+    order.escrow_address = get_application_address(app_id)
+    order.status = "INIT"
+    order.updated_at = datetime.utcnow()
+
+
+@job_handler("deploy_compact")
+def _deploy_compact(db, job, order):
+    from backend.smartcontracts.deploy_compact import submit_compact_app
+
+    confirmed = submit_and_confirm(db, job, lambda: submit_compact_app(order.seller, order.amount))
+    app_id = confirmed["application-index"]
+
+    order.app_id = app_id
+    order.escrow_address = get_application_address(app_id)
+    order.status = "INIT"
+    order.updated_at = datetime.utcnow()
+
+
+@job_handler("open_box")
+def _open_box(db, job, order):
+    from backend.smartcontracts.deploy_boxes import submit_open
+
+    submit_and_confirm(db, job, lambda: submit_open(order.app_id, order.id, order.seller, order.amount))
+    order.status = "INIT"
+    order.updated_at = datetime.utcnow()
+
+
+# ==========================================================
+# 🏃 Workers
+# ==========================================================
+def _backoff(attempts: int) -> timedelta:
+    delay = min(BACKOFF_BASE * (2 ** max(attempts - 1, 0)), BACKOFF_MAX)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def _claim(db):
+    """Atomically move the next due PENDING job to RUNNING."""
+    now = datetime.utcnow()
+    while True:
+        job = (
+            db.query(DeployJob)
+            .filter(DeployJob.status == "PENDING", DeployJob.next_attempt_at <= now)
+            .order_by(DeployJob.next_attempt_at, DeployJob.id)
+            .first()
+        )
+        if job is None:
+            return None
+        claimed = (
+            db.query(DeployJob)
+            .filter(DeployJob.id == job.id, DeployJob.status == "PENDING")
+            .update(
+                {"status": "RUNNING", "attempts": DeployJob.attempts + 1, "updated_at": now},
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        if claimed:
+            db.refresh(job)
+            return job
+        # another worker won the race, try the next one
+
+
+def _order_changed():
+    # the order now has an escrow on chain: let the chain indexer pick it up
+    from backend.workers import chain_indexer
+    chain_indexer.index.mark_dirty()
+
+
+def _run_job(db, job):
+    order = db.query(Order).filter(Order.id == job.order_id).first()
+    handler, on_failure = _handlers.get(job.kind, (None, None))
+    if order is None or handler is None:
+        job.status = "FAILED"
+        job.last_error = "Order not found" if order is None else f"Unknown job kind: {job.kind}"
+        db.commit()
+        return
+
+    try:
+        with metrics.phase(f"job {job.kind}"):
+            handler(db, job, order)
+        job.status = "DONE"
+        job.last_error = None
+        db.commit()
+        _order_changed()
+        print(f"✅ Job {job.id} ({job.kind}) done for order {order.id}")
+    except Exception as e:
+        db.rollback()
+        traceback.print_exc()
+        job.last_error = str(e)
+        if job.attempts >= job.max_attempts:
+            job.status = "FAILED"
+            if order.status == "DEPLOYING":
+                order.status = "DEPLOY_FAILED"
+                order.updated_at = datetime.utcnow()
+            if on_failure is not None:
+                on_failure(db, job, order)
+            print(f"❌ Job {job.id} ({job.kind}) failed permanently: {e}")
+        else:
+            job.status = "PENDING"
+            job.next_attempt_at = datetime.utcnow() + _backoff(job.attempts)
+            print(f"🔁 Job {job.id} ({job.kind}) retry {job.attempts}/{job.max_attempts} at {job.next_attempt_at}")
+        db.commit()
+
+
+def _worker_loop():
+    while not _stop.is_set():
+        db = SessionLocal(info={"actor": "deploy_queue"})
+        try:
+            job = _claim(db)
+            if job is not None:
+                _run_job(db, job)
+                continue
+        except Exception:
+            traceback.print_exc()
+        finally:
+            db.close()
+        _wakeup.wait(POLL_INTERVAL)
+        _wakeup.clear()
+
+
+def recover_jobs() -> int:
+    """Requeue jobs that were RUNNING when the process stopped."""
+    db = SessionLocal()
+    try:
+        count = (
+            db.query(DeployJob)
+            .filter(DeployJob.status == "RUNNING")
+            .update({"status": "PENDING", "next_attempt_at": datetime.utcnow()}, synchronize_session=False)
+        )
+        db.commit()
+        return count
+    finally:
+        db.close()
+
+
+def start_workers(count: int = WORKER_COUNT):
+    if _threads:
+        return
+    recovered = recover_jobs()
+    if recovered:
+        print(f"♻️  Recovered {recovered} in-flight deploy job(s)")
+    _stop.clear()
+    for i in range(count):
+        t = threading.Thread(target=_worker_loop, name=f"deploy-worker-{i}", daemon=True)
+        t.start()
+        _threads.append(t)
+    print(f"🧵 Started {count} deploy worker(s)")
+
+
+def stop_workers(timeout: float = 5):
+    _stop.set()
+    _wakeup.set()
+    for t in _threads:
+        t.join(timeout)
+    _threads.clear()
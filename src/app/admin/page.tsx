@@ -29,6 +29,7 @@ import {
 } from '@/components/ui/dialog';
 import { Input } from '@/components/ui/input';
 import { Label } from '@/components/ui/label';
+import { fetchAllOrders } from '@/lib/orders';
 
 // -------------------------------
 // Order Type (matches backend)
@@ -39,7 +40,7 @@ interface Order {
   amount: number;
   seller: string;
   buyer: string | null;
-  status: 'INIT' | 'FUNDED' | 'RELEASED' | 'CANCELLED';
+  status: 'INIT' | 'FUNDED' | 'RELEASING' | 'RELEASED' | 'CANCELLED';
   app_id: number;
   escrow_address: string;
   // Buyer details
@@ -66,11 +67,7 @@ export default function AdminPage() {
   const fetchOrders = async () => {
     try {
       setLoading(true);
-      const res = await fetch(`${API_BASE}/api/escrow/status`);
-      if (!res.ok) throw new Error('Failed to fetch orders');
-
-      const data = await res.json();
-      const allOrders: Order[] = data.orders || [];
+      const allOrders = await fetchAllOrders<Order>(API_BASE, { status: 'FUNDED', include: 'buyer' });
 
       // Filter FUNDED orders only
       const funded = allOrders.filter((o) => o.status === 'FUNDED');
@@ -26,7 +26,7 @@ export default function BuyPage() {
       try {
         setLoading(true);
         const [statusRes, prepareRes] = await Promise.all([
-          fetch(`${API_BASE}/api/escrow/status`),
+          fetch(`${API_BASE}/api/escrow/status?order_id=${orderId}`),
           fetch(`${API_BASE}/api/escrow/prepare_fund/${orderId}`),
         ]);
         if (!statusRes.ok || !prepareRes.ok) throw new Error("Failed to load");
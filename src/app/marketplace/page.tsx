@@ -14,6 +14,7 @@ import { Input } from '@/components/ui/input';
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select';
 import { Skeleton } from '@/components/ui/skeleton';
 import { Loader2, Search, Filter } from 'lucide-react';
+import { fetchAllOrders } from '@/lib/orders';
 
 // Define a clear type for the order data
 interface EscrowOrder {
@@ -22,7 +23,7 @@ interface EscrowOrder {
   product_description: string;
   amount: number;
   seller: string;
-  status: 'INIT' | 'FUNDED' | 'RELEASED' | 'CANCELLED';
+  status: 'INIT' | 'FUNDED' | 'RELEASING' | 'RELEASED' | 'CANCELLED';
 }
 
 export default function MarketplacePage() {
@@ -40,11 +41,12 @@ export default function MarketplacePage() {
   const fetchOrders = async () => {
     try {
       setLoading(true);
-      const res = await fetch(`${API_BASE}/api/escrow/status`);
-      if (!res.ok) throw new Error('Failed to fetch marketplace orders');
-      
-      const data = await res.json();
-      setOrders(data.orders || []);
+      // filter on the server so pages are spent on matching orders only
+      const all = await fetchAllOrders<EscrowOrder>(API_BASE, {
+        include: 'description',
+        status: statusFilter === 'all' ? undefined : statusFilter,
+      });
+      setOrders(all);
     } catch (err: any) {
       toast.error(err.message || 'Error loading marketplace data');
     } finally {
@@ -54,7 +56,7 @@ export default function MarketplacePage() {
 
   useEffect(() => {
     fetchOrders();
-  }, []);
+  }, [statusFilter]);
 
   const filteredOrders = orders.filter(order => {
     const matchesSearch =
@@ -8,6 +8,7 @@ import { Badge } from '@/components/ui/badge';
 import { Loader2 } from 'lucide-react';
 import Link from 'next/link';
 import { Button } from '@/components/ui/button';
+import { fetchAllOrders } from '@/lib/orders';
 
 // Define the Order type
 interface Order {
@@ -16,7 +17,7 @@ interface Order {
   amount: number;
   seller: string;
   buyer: string | null;
-  status: 'INIT' | 'FUNDED' | 'RELEASED' | 'CANCELLED';
+  status: 'INIT' | 'FUNDED' | 'RELEASING' | 'RELEASED' | 'CANCELLED';
   tx_id: string | null;
   app_id: number;
   escrow_address: string;
@@ -33,11 +34,7 @@ export default function MyOrdersPage() {
   const fetchOrders = async (currentAddress: string) => {
     try {
       setLoading(true);
-      const res = await fetch(`${API_BASE}/api/escrow/status`);
-      if (!res.ok) throw new Error('Failed to fetch orders');
-      
-      const data = await res.json();
-      const allOrders: Order[] = data.orders || [];
+      const allOrders = await fetchAllOrders<Order>(API_BASE, { wallet: currentAddress });
 
       // Filter to find orders where the user is the seller OR the buyer
       const userOrders = allOrders.filter(
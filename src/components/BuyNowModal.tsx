@@ -1,5 +1,4 @@
 // src/lib/escrow/fundFlow.ts
-import algosdk from "algosdk";
 
 /**
  * Fund an escrow smart contract using AlgoSigner
@@ -15,58 +14,26 @@ export async function BuyNowModal(
 ) {
   console.log("🧠 Preparing escrow funding for order:", orderId);
 
-  // === 1️⃣ Fetch setup data from backend ===
-  const prepareRes = await fetch(`${apiBase}/api/escrow/prepare_fund/${orderId}`);
+  // === 1️⃣ Fetch the unsigned, grouped txns from the backend ===
+  // (payment → escrow + "fund" app call, built server-side with cached params)
+  const prepareRes = await fetch(
+    `${apiBase}/api/escrow/prepare_fund/${orderId}?txns=1&buyer=${connectedAddress}`
+  );
   const prepareJson = await prepareRes.json();
 
   if (!prepareRes.ok)
     throw new Error(prepareJson.detail || "Failed to get funding info");
 
-  const { app_id, escrow_address, amount_micro, algod_params } = prepareJson;
+  const { app_id, escrow_address, amount_micro, fund_group } = prepareJson;
 
   console.log("Fetched funding data:", {
     app_id,
     escrow_address,
     amount_micro,
-    algod_params,
+    group_id: fund_group.group_id,
+    last_valid: fund_group.last_valid,
   });
 
-  // === 2️⃣ Normalize SuggestedParams ===
-  // Use algod_params from backend instead of querying algodClient directly
-  const rawParams = algod_params;
-
-  const suggestedParams = {
-    fee: Number(rawParams.fee),
-    firstRound: Number(rawParams.firstRound || rawParams["first-round"]),
-    lastRound: Number(rawParams.lastRound || rawParams["last-round"]),
-    genesisHash: rawParams.genesisHash || rawParams["genesis-hash"],
-    genesisID: rawParams.genesisID || rawParams["genesis-id"],
-    flatFee: true
-};
-
-
-  console.log("Using suggested params:", suggestedParams);
-
-  // === 3️⃣ Build grouped transactions ===
-  const paymentTxn = algosdk.makePaymentTxnWithSuggestedParamsFromObject({
-    from: connectedAddress,
-    to: escrow_address,
-    amount: amount_micro,
-    suggestedParams
-} as any);
-
-  const appCallTxn = algosdk.makeApplicationNoOpTxnFromObject({
-    from: connectedAddress,
-    appIndex: app_id,
-    appArgs: [new Uint8Array(Buffer.from("fund"))],
-    suggestedParams,
-  } as any);
-
-  const txns = [paymentTxn, appCallTxn];
-  algosdk.assignGroupID(txns);
-
-  console.log("📦 Grouped transactions built:", txns);
-
   // === 4️⃣ Connect & sign with AlgoSigner ===
   const AlgoSigner = (window as any).AlgoSigner;
   if (!AlgoSigner) {
@@ -75,9 +42,8 @@ export async function BuyNowModal(
 
   await AlgoSigner.connect();
 
-  const base64Txns = txns.map((txn) => ({
-    txn: Buffer.from(algosdk.encodeUnsignedTransaction(txn)).toString("base64"),
-  }));
+  // already base64 msgpack with the group id set
+  const base64Txns = fund_group.txns.map((txn: string) => ({ txn }));
 
   console.log("🔏 Prepared base64 txns:", base64Txns);
 
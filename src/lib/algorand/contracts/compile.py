@@ -1,5 +1,9 @@
 """
 Compile PyTeal smart contracts to TEAL
+
+TEAL generation goes through the backend program registry, so the emitted
+files share content hashes with the artifacts the deploy paths use. When
+ALGOD_ADDRESS is set the bytecode is compiled (or reused) and persisted too.
 """
 
 import sys
@@ -8,40 +12,48 @@ from pathlib import Path
 from pyteal import *
 from escrow import approval_program, clear_state_program
 
+# repo root, so the backend package is importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from backend.smartcontracts import program_registry
+
+TEAL_VERSION = 8
+
 
 def compile_contract():
     """Compile both approval and clear state programs"""
-    
+
     # Create contracts directory if it doesn't exist
     output_dir = Path(__file__).parent / "teal"
     output_dir.mkdir(exist_ok=True)
-    
+
     # Compile approval program
-    approval_teal = compileTeal(
-        approval_program(), 
-        Mode.Application, 
-        version=8
-    )
-    
+    approval_teal = program_registry.teal_for(approval_program, TEAL_VERSION)
+
     # Compile clear state program
-    clear_teal = compileTeal(
-        clear_state_program(), 
-        Mode.Application, 
-        version=8
-    )
-    
+    clear_teal = program_registry.teal_for(clear_state_program, TEAL_VERSION)
+
     # Write to files
     with open(output_dir / "escrow_approval.teal", "w") as f:
         f.write(approval_teal)
-    
+
     with open(output_dir / "escrow_clear.teal", "w") as f:
         f.write(clear_teal)
-    
+
     print("✅ Smart contracts compiled successfully!")
     print(f"📁 Output directory: {output_dir}")
     print(f"   - escrow_approval.teal ({len(approval_teal)} bytes)")
     print(f"   - escrow_clear.teal ({len(clear_teal)} bytes)")
 
+    # Optional: assemble to bytecode and persist in the registry's artifact dir
+    if os.getenv("ALGOD_ADDRESS"):
+        from backend.smartcontracts.algod_pool import get_algod_client
+        client = get_algod_client()
+        for name, teal in (("approval", approval_teal), ("clear", clear_teal)):
+            program = program_registry.compile_teal(client, teal, TEAL_VERSION)
+            digest = program_registry.program_hash(teal, TEAL_VERSION)
+            print(f"   - {name}: {len(program)} bytes bytecode ({digest[:12]})")
+        print(f"📦 Artifacts: {program_registry.ARTIFACT_DIR}")
+
 
 if __name__ == "__main__":
     compile_contract()
@@ -0,0 +1,32 @@
+// src/lib/orders.ts
+
+/**
+ * Fetch every order matching `params` from /api/escrow/status.
+ * The endpoint is keyset-paginated (at most ORDER_PAGE_MAX rows per page),
+ * so this follows `next_cursor` until the last page.
+ */
+export async function fetchAllOrders<T = any>(
+  apiBase: string,
+  params: Record<string, string | undefined> = {},
+  pageSize = 200
+): Promise<T[]> {
+  const orders: T[] = [];
+  let cursor: string | null = null;
+
+  do {
+    const query = new URLSearchParams({ limit: String(pageSize) });
+    for (const [key, value] of Object.entries(params)) {
+      if (value) query.set(key, value);
+    }
+    if (cursor) query.set("cursor", cursor);
+
+    const res = await fetch(`${apiBase}/api/escrow/status?${query.toString()}`);
+    if (!res.ok) throw new Error("Failed to fetch orders");
+
+    const data = await res.json();
+    orders.push(...(data.orders || []));
+    cursor = data.next_cursor || null;
+  } while (cursor);
+
+  return orders;
+}